@@ -0,0 +1,56 @@
+"""
+Benchmark: multi-line shop orders through purchase_items/sell_items vs
+one purchase_item/sell_item call per unit.
+
+Usage: python benchmarks/bench_batch_shop.py [orders]
+"""
+
+import sys
+import time
+
+import synthetic  # noqa: F401  (puts the project root on sys.path)
+
+import game_data
+import inventory_system
+
+ORDER = {"health_potion": 6, "super_health_potion": 4, "iron_sword": 1, "leather_armor": 1}
+
+
+def make_character():
+    return {"inventory": inventory_system.Inventory(), "gold": 10**9}
+
+
+def per_unit(char, items):
+    for item_id, quantity in ORDER.items():
+        for _ in range(quantity):
+            inventory_system.purchase_item(char, item_id, items[item_id])
+    for item_id, quantity in ORDER.items():
+        for _ in range(quantity):
+            inventory_system.sell_item(char, item_id, items[item_id])
+
+
+def batched(char, items):
+    inventory_system.purchase_items(char, ORDER, items)
+    inventory_system.sell_items(char, ORDER, items)
+
+
+def main():
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    items = game_data.load_items("data/items.txt", compact=True)
+    lines = sum(ORDER.values())
+
+    print(f"{orders} buy+sell orders of {lines} units in {len(ORDER)} lines")
+    results = {}
+    for label, run in (("per-unit calls", per_unit), ("batch calls", batched)):
+        char = make_character()
+        start = time.perf_counter()
+        for _ in range(orders):
+            run(char, items)
+        elapsed = time.perf_counter() - start
+        results[label] = elapsed
+        print(f"  {label:15s}: {orders / elapsed:10,.0f} orders/s")
+    print(f"  speed-up       : {results['per-unit calls'] / results['batch calls']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
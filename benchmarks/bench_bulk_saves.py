@@ -0,0 +1,43 @@
+"""
+Benchmark: bulk save/load throughput at different thread pool sizes.
+
+Usage: python benchmarks/bench_bulk_saves.py [character_count]
+"""
+
+import sys
+import tempfile
+import time
+
+import synthetic  # noqa: F401  (puts the project root on sys.path)
+
+import character_manager
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    characters = [character_manager.create_character(f"hero_{n}", "Rogue")
+                  for n in range(count)]
+    names = [char["name"] for char in characters]
+
+    print(f"{count} characters")
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        for char in characters:
+            character_manager.save_character(char, tmp)
+        for name in names:
+            character_manager.load_character(name, tmp)
+        serial = time.perf_counter() - start
+        print(f"  one by one  : {2 * count / serial:9.0f} saves+loads/s")
+
+        for workers in (1, 2, 4, 8, 16):
+            start = time.perf_counter()
+            character_manager.save_characters(characters, tmp, max_workers=workers)
+            saved = time.perf_counter()
+            character_manager.load_characters(names, tmp, max_workers=workers)
+            loaded = time.perf_counter()
+            print(f"  workers={workers:<3}: save {count / (saved - start):9.0f}/s, "
+                  f"load {count / (loaded - saved):9.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
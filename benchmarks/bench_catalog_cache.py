@@ -0,0 +1,47 @@
+"""
+Benchmark: cold vs warm catalog loads with the sidecar cache.
+
+Usage: python benchmarks/bench_catalog_cache.py [record_count]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from functools import partial
+
+from synthetic import write_quest_file, write_item_file
+
+import game_data
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def bench(label, loader, path):
+    game_data.clear_cache(path)
+    records, plain = timed(loader, path)
+    _, cold = timed(loader, path, use_cache=True)
+    _, warm = timed(loader, path, use_cache=True)
+    print(f"{label}: {len(records)} records")
+    print(f"  no cache : {plain:.3f}s")
+    print(f"  cold     : {cold:.3f}s (parse + write cache)")
+    print(f"  warm     : {warm:.3f}s ({plain / warm:.1f}x faster than parsing)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp:
+        quests = write_quest_file(os.path.join(tmp, "quests.txt"), count)
+        items = write_item_file(os.path.join(tmp, "items.txt"), count)
+        bench("load_quests", game_data.load_quests, quests)
+        bench("load_items", game_data.load_items, items)
+        bench("load_quests compact", partial(game_data.load_quests, compact=True), quests)
+        bench("load_items compact", partial(game_data.load_items, compact=True), items)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark: closed-form gain_experience vs the original per-level loop.
+
+Usage: python benchmarks/bench_gain_experience.py
+"""
+
+import timeit
+
+import synthetic  # noqa: F401  (puts the project root on sys.path)
+
+import character_manager
+
+
+def loop_gain_experience(character, xp_amount):
+    character["experience"] += xp_amount
+    leveled_up = False
+    while character["experience"] >= character["level"] * 100:
+        character["experience"] -= character["level"] * 100
+        character["level"] += 1
+        character["max_health"] += 10
+        character["strength"] += 2
+        character["magic"] += 2
+        character["health"] = character["max_health"]
+        leveled_up = True
+    return leveled_up
+
+
+def time_grant(func, xp, number):
+    def run():
+        func(character_manager.create_character("Bench", "Warrior"), xp)
+    return timeit.timeit(run, number=number) / number
+
+
+def main():
+    print("XP grant        levels   loop         closed form")
+    for exponent in range(2, 10):
+        xp = 10 ** exponent
+        char = character_manager.create_character("Bench", "Warrior")
+        character_manager.gain_experience(char, xp)
+        number = 2000 if exponent < 7 else 50
+        loop = time_grant(loop_gain_experience, xp, number)
+        closed = time_grant(character_manager.gain_experience, xp, number)
+        print(f"10^{exponent:<12} {char['level'] - 1:>7}   {loop * 1e6:9.1f} us  "
+              f"{closed * 1e6:9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
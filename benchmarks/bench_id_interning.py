@@ -0,0 +1,70 @@
+"""
+Benchmark: memory held by loaded characters with and without the shared
+id pool.
+
+Saves `count` characters that carry catalog ids in their inventories and
+quest lists, loads them back with character_manager.load_character (which
+interns through game_data's pool), and compares against the same
+characters holding a private copy of every id string, which is what the
+plain value.split(",") loader produced.
+
+Usage: python benchmarks/bench_id_interning.py [character_count]
+"""
+
+import sys
+import tempfile
+import tracemalloc
+
+import synthetic  # noqa: F401  (puts the project root on sys.path)
+
+import character_manager
+import game_data
+
+ITEMS = ["health_potion", "iron_sword", "leather_armor", "strength_elixir"]
+QUESTS = ["first_steps", "goblin_hunter", "equipment_upgrade", "orc_menace"]
+LIST_FIELDS = ("inventory", "active_quests", "completed_quests")
+
+
+def make_character(n):
+    char = character_manager.create_character(f"hero_{n}", "Warrior")
+    char["inventory"] = ITEMS * 3
+    char["active_quests"] = QUESTS[:2]
+    char["completed_quests"] = QUESTS
+    return char
+
+
+def measure(build):
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def id_lists(characters, copy_id):
+    return [[[copy_id(value) for value in char[field]] for field in LIST_FIELDS]
+            for char in characters]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in range(count):
+            character_manager.save_character(make_character(n), tmp)
+
+        names = [f"hero_{n}" for n in range(count)]
+        loaded = [character_manager.load_character(name, tmp) for name in names]
+
+    # Same id lists twice: once sharing the pooled strings, once with a
+    # private copy of every id as the old value.split(",") loader made.
+    _, pooled = measure(lambda: id_lists(loaded, lambda value: value))
+    _, private = measure(lambda: id_lists(loaded, lambda value: value.encode().decode()))
+
+    print(f"{count} loaded characters, {game_data.id_pool_size()} pooled ids")
+    print(f"  id lists, pooled ids  : {pooled / 2**20:8.1f} MiB")
+    print(f"  id lists, private ids : {private / 2**20:8.1f} MiB")
+    print(f"  saved by interning    : {(private - pooled) / count:8.0f} bytes/character")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark: Inventory (counts) vs a plain list for membership, count and
+remove/append at bank and guild-storage sizes.
+
+Usage: python benchmarks/bench_inventory.py [max_size]
+"""
+
+import sys
+import time
+
+import synthetic  # noqa: F401  (puts the project root on sys.path)
+
+from inventory_system import Inventory
+
+DISTINCT = 500
+OPERATIONS = 2_000
+
+
+def fill(container, size):
+    for n in range(size):
+        container.append(f"item_{n % DISTINCT}")
+    return container
+
+
+def run(container):
+    # probe ids added last, where list scans are slowest
+    distinct = min(DISTINCT, len(container))
+    probes = [f"item_{distinct - 1 - n % 10}" for n in range(OPERATIONS)]
+    start = time.perf_counter()
+    for item_id in probes:
+        item_id in container
+        container.count(item_id)
+        container.remove(item_id)
+        container.append(item_id)
+    return (time.perf_counter() - start) / OPERATIONS * 1e6
+
+
+def main():
+    max_size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    sizes = [s for s in (100, 1_000, 10_000, 100_000, 1_000_000) if s <= max_size]
+
+    print(f"in + count + remove + append, {DISTINCT} distinct ids, µs per round")
+    print(f"  {'size':>9}  {'list':>10}  {'Inventory':>10}  speed-up")
+    for size in sizes:
+        as_list = run(fill([], size))
+        as_inventory = run(fill(Inventory(), size))
+        print(f"  {size:9,}  {as_list:10.2f}  {as_inventory:10.2f}  {as_list / as_inventory:7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
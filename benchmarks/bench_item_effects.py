@@ -0,0 +1,46 @@
+"""
+Benchmark: use_item/equip_weapon with a compiled ItemEffects table vs
+passing the item record with its "stat:value" effect string.
+
+Usage: python benchmarks/bench_item_effects.py [calls]
+"""
+
+import sys
+import time
+
+import synthetic  # noqa: F401  (puts the project root on sys.path)
+
+import character_manager
+import inventory_system
+
+POTION = {"item_id": "potion", "type": "consumable", "effect": "health:5"}
+SWORD = {"item_id": "sword", "type": "weapon", "effect": "strength:1,magic:1"}
+
+
+def run(calls, potion_data, sword_data):
+    char = character_manager.create_character("Bench", "Warrior")
+    char["inventory"] = inventory_system.Inventory()
+    start = time.perf_counter()
+    for _ in range(calls):
+        char["inventory"].append("potion")
+        inventory_system.use_item(char, "potion", potion_data)
+        char["inventory"].append("sword")
+        inventory_system.equip_weapon(char, "sword", sword_data)
+        del char["equipped_weapon"]
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    effects = inventory_system.compile_item_effects({"potion": POTION, "sword": SWORD})
+
+    per_call = run(calls, POTION, SWORD)
+    compiled = run(calls, effects, effects)
+
+    print(f"{calls} use_item + equip_weapon rounds, µs per round")
+    print(f"  effect string parsed per call: {per_call:6.2f}")
+    print(f"  compiled ItemEffects table   : {compiled:6.2f} ({per_call / compiled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: LoadoutSolver on a large synthetic catalog — build, first
+solve, and repeated budgets answered from the memoized table.
+
+Usage: python benchmarks/bench_loadout_solver.py [item_count]
+"""
+
+import random
+import sys
+import time
+
+import synthetic  # noqa: F401  (puts the project root on sys.path)
+
+import inventory_system
+import loadout_solver
+
+
+def make_catalog(count, seed=7):
+    rng = random.Random(seed)
+    items = {}
+    for n in range(count):
+        item_type = rng.choice(["weapon", "armor", "consumable"])
+        stats = rng.sample(inventory_system.EFFECT_STATS[item_type], k=rng.randint(1, 2))
+        items[f"item_{n}"] = {
+            "item_id": f"item_{n}",
+            "type": item_type,
+            "cost": rng.randrange(5, 3000, 5),
+            "effect": {stat: rng.randint(1, 60) for stat in stats},
+        }
+    return items
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    items = make_catalog(count)
+    budgets = list(range(500, 20_001, 500))
+
+    start = time.perf_counter()
+    solver = loadout_solver.LoadoutSolver(items)
+    built = time.perf_counter()
+    solver.solve(max(budgets))
+    first = time.perf_counter()
+    for gold in budgets:
+        solver.solve(gold)
+    sweep = time.perf_counter()
+    for gold in budgets:
+        solver.solve(gold)
+    cached = time.perf_counter()
+
+    kept = len(solver.weapons) + len(solver.armors) + len(solver.consumables)
+    print(f"{count} items, {kept} left after pruning, gold unit {solver.unit}")
+    print(f"  build + prune           : {(built - start) * 1000:8.1f} ms")
+    print(f"  first solve (20k gold)  : {(first - built) * 1000:8.1f} ms")
+    print(f"  {str(len(budgets)) + ' new budgets':24s}: {(sweep - first) * 1000:8.1f} ms "
+          f"({(sweep - first) / len(budgets) * 1e6:.0f} µs each)")
+    print(f"  {str(len(budgets)) + ' repeated budgets':24s}: {(cached - sweep) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Benchmark: quest level-range queries, full scan vs QuestLevelIndex.
+
+Usage: python benchmarks/bench_quest_level_index.py [quest_count]
+"""
+
+import sys
+import timeit
+
+from synthetic import quest_block
+
+import game_data
+import quest_handler
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    quests = {}
+    for n in range(count):
+        quest = game_data.parse_quest_block(quest_block(n).splitlines())
+        quests[quest["quest_id"]] = quest
+
+    build = timeit.timeit(lambda: quest_handler.build_quest_level_index(quests), number=1)
+    index = quest_handler.build_quest_level_index(quests)
+    print(f"{count} quests, index built in {build * 1000:.1f} ms")
+
+    for low, high in [(10, 10), (1, 5), (20, 40)]:
+        matches = len(quest_handler.get_quests_by_level(quests, low, high, index))
+        scan = timeit.timeit(
+            lambda: quest_handler.get_quests_by_level(quests, low, high), number=10) / 10
+        indexed = timeit.timeit(
+            lambda: quest_handler.get_quests_by_level(quests, low, high, index), number=10) / 10
+        print(f"  levels {low}..{high}: {matches} matches, scan {scan * 1000:.2f} ms, "
+              f"index {indexed * 1000:.3f} ms ({scan / indexed:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark: per-record memory of dict records vs slotted Quest/Item records.
+
+Usage: python benchmarks/bench_record_memory.py [record_count]
+"""
+
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from synthetic import write_quest_file, write_item_file
+
+import game_data
+
+
+def measure(loader, path, compact):
+    tracemalloc.start()
+    records = loader(path, compact=compact)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(records), current
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp:
+        quests = write_quest_file(os.path.join(tmp, "quests.txt"), count)
+        items = write_item_file(os.path.join(tmp, "items.txt"), count)
+
+        for label, loader, path in (("quests", game_data.load_quests, quests),
+                                    ("items", game_data.load_items, items)):
+            n, as_dicts = measure(loader, path, compact=False)
+            _, as_slots = measure(loader, path, compact=True)
+            print(f"{label}: {n} records (catalog dict and field values included)")
+            print(f"  dict records    : {as_dicts / n:7.1f} bytes/record")
+            print(f"  slotted records : {as_slots / n:7.1f} bytes/record "
+                  f"({100 * (1 - as_slots / as_dicts):.0f}% smaller)")
+            record = next(iter(loader(path).values()))
+            compact = next(iter(loader(path, compact=True).values()))
+            print(f"  container only  : dict {sys.getsizeof(record)} bytes, "
+                  f"{type(compact).__name__} {sys.getsizeof(compact)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: schema-dispatched parser vs the original if/elif parser.
+
+The original parse_item_block matched each line against a chain of key
+comparisons and validate_item_data then walked the record again; it is
+copied here as the baseline. The schema parser also interns item ids
+through the shared id pool, so a baseline that interns too is shown.
+
+Usage: python benchmarks/bench_record_parser.py [record_count]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from synthetic import write_item_file
+
+import game_data
+
+
+def legacy_parse_item_block(lines):
+    item = {}
+
+    for line in lines:
+        if ": " not in line:
+            raise game_data.InvalidDataFormatError("Bad item line format.")
+        key, value = line.split(": ", 1)
+
+        if key == "ITEM_ID":
+            item["item_id"] = value
+        elif key == "NAME":
+            item["name"] = value
+        elif key == "TYPE":
+            item["type"] = value
+        elif key == "EFFECT":
+            stat, num = value.split(":")
+            item["effect"] = {stat: int(num)}
+        elif key == "COST":
+            item["cost"] = int(value)
+        elif key == "DESCRIPTION":
+            item["description"] = value
+
+    return item
+
+
+def legacy_parse(lines):
+    item = legacy_parse_item_block(lines)
+    game_data.validate_item_data(item)
+    return item
+
+
+def legacy_parse_interned(lines):
+    item = legacy_parse(lines)
+    item["item_id"] = game_data.intern_id(item["item_id"])
+    return item
+
+
+def time_parser(path, parser):
+    start = time.perf_counter()
+    count = 0
+    for block in game_data._iter_blocks(path, "item"):
+        parser(block)
+        count += 1
+    return count, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_item_file(os.path.join(tmp, "items.txt"), count)
+
+        _, read_only = time_parser(path, lambda block: None)
+        n, legacy = time_parser(path, legacy_parse)
+        _, interned = time_parser(path, legacy_parse_interned)
+        _, schema = time_parser(path, game_data.parse_item_block)
+
+        print(f"{n} item records")
+        print(f"  read blocks only       : {read_only:.3f}s")
+        print(f"  if/elif + validate     : {legacy:.3f}s "
+              f"(parse {legacy - read_only:.3f}s)")
+        print(f"  if/elif + interning    : {interned:.3f}s "
+              f"(parse {interned - read_only:.3f}s)")
+        print(f"  schema, single pass    : {schema:.3f}s "
+              f"(parse {schema - read_only:.3f}s)")
+        print(f"  parse speedup          : "
+              f"{(legacy - read_only) / (schema - read_only):.2f}x "
+              f"({(interned - read_only) / (schema - read_only):.2f}x vs interning baseline)")
+
+
+if __name__ == "__main__":
+    main()
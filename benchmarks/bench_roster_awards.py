@@ -0,0 +1,54 @@
+"""
+Benchmark: batch XP/gold award with NumPy columns vs a per-character loop.
+
+Usage: python benchmarks/bench_roster_awards.py [character_count]
+"""
+
+import sys
+import time
+
+import synthetic  # noqa: F401  (puts the project root on sys.path)
+
+import character_manager
+import roster
+
+
+def make_characters(count):
+    characters = []
+    for n in range(count):
+        char = character_manager.create_character(f"hero_{n}", "Warrior")
+        char["level"] = 1 + n % 40
+        characters.append(char)
+    return characters
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    xp, gold = 2_500, 40
+
+    characters = make_characters(count)
+    start = time.perf_counter()
+    for char in characters:
+        character_manager.gain_experience(char, xp)
+        character_manager.add_gold(char, gold)
+    loop = time.perf_counter() - start
+
+    characters = make_characters(count)
+    start = time.perf_counter()
+    arrays = roster.RosterArrays(characters)
+    built = time.perf_counter()
+    arrays.award(xp, gold)
+    awarded = time.perf_counter()
+    arrays.write_back()
+    written = time.perf_counter()
+
+    print(f"{count} characters, +{xp} XP +{gold} gold")
+    print(f"  per-character loop : {loop * 1000:8.1f} ms")
+    print(f"  RosterArrays       : {(written - start) * 1000:8.1f} ms total "
+          f"(build {(built - start) * 1000:.1f}, award {(awarded - built) * 1000:.1f}, "
+          f"write back {(written - awarded) * 1000:.1f})")
+    print(f"  award only         : {loop / (awarded - built):8.0f}x faster than the loop")
+
+
+if __name__ == "__main__":
+    main()
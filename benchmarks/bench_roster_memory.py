@@ -0,0 +1,67 @@
+"""
+Benchmark: resident memory of a struct-of-arrays Roster vs character dicts.
+
+Usage: python benchmarks/bench_roster_memory.py [character_count]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+import synthetic  # noqa: F401  (puts the project root on sys.path)
+
+import character_manager
+import roster
+
+CLASSES = ("Warrior", "Mage", "Rogue", "Cleric")
+ITEMS = ("health_potion", "iron_sword", "leather_armor", "mana_potion")
+
+
+def make_character(n):
+    char = character_manager.create_character(f"hero_{n}", CLASSES[n % 4])
+    char["level"] = 1 + n % 40
+    char["inventory"] = list(ITEMS[:n % 5])
+    char["completed_quests"] = ["first_steps"] if n % 2 else []
+    return char
+
+
+def measure(build, count):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    population = build(count)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return population, size, elapsed
+
+
+def as_dicts(count):
+    return [make_character(n) for n in range(count)]
+
+
+def as_roster(count):
+    resident = roster.Roster()
+    for n in range(count):
+        resident.add(make_character(n))
+    return resident
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    dicts, dict_bytes, dict_time = measure(as_dicts, count)
+    del dicts
+    resident, roster_bytes, roster_time = measure(as_roster, count)
+
+    print(f"{count} resident characters")
+    print(f"  dicts  : {dict_bytes / 2**20:8.1f} MiB  ({dict_bytes / count:6.0f} B/char, "
+          f"built in {dict_time:.1f} s)")
+    print(f"  Roster : {roster_bytes / 2**20:8.1f} MiB  ({roster_bytes / count:6.0f} B/char, "
+          f"built in {roster_time:.1f} s)")
+    print(f"  Roster uses {dict_bytes / roster_bytes:.1f}x less memory")
+
+
+if __name__ == "__main__":
+    main()
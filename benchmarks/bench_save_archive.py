@@ -0,0 +1,51 @@
+"""
+Benchmark: exporting a save directory to one archive and importing it back,
+per codec, against copying the save files one by one.
+
+Usage: python benchmarks/bench_save_archive.py [character_count]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import synthetic  # noqa: F401  (puts the project root on sys.path)
+
+import character_manager
+import save_archive
+
+ITEMS = ("health_potion", "iron_sword", "leather_armor", "mana_potion")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+    with tempfile.TemporaryDirectory() as work:
+        source = os.path.join(work, "saves")
+        for n in range(count):
+            char = character_manager.create_character(f"hero_{n}", "Cleric")
+            char["level"] = 1 + n % 40
+            char["gold"] = n * 7 % 5000
+            char["inventory"] = list(ITEMS[:n % 5])
+            character_manager.save_character(char, source)
+
+        start = time.perf_counter()
+        shutil.copytree(source, os.path.join(work, "copy"))
+        copy_time = time.perf_counter() - start
+
+        print(f"{count} characters")
+        print(f"  copy save files   : {count / copy_time:10,.0f} characters/s")
+        for codec in sorted(save_archive.CODECS):
+            archive = os.path.join(work, f"saves.{codec}")
+            exported = save_archive.export_saves(archive, source, codec=codec)
+            imported = save_archive.import_saves(archive, os.path.join(work, codec))
+            print(f"  {codec:5s} export      : {count / exported['seconds']:10,.0f} characters/s, "
+                  f"{exported['save_bytes']:,} -> {exported['archive_bytes']:,} bytes "
+                  f"(ratio {exported['ratio']:.1f}x)")
+            print(f"  {codec:5s} import      : {count / imported['seconds']:10,.0f} characters/s")
+
+
+if __name__ == "__main__":
+    main()
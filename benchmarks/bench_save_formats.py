@@ -0,0 +1,61 @@
+"""
+Benchmark: text vs binary save round trips and on-disk size.
+
+Usage: python benchmarks/bench_save_formats.py [character_count]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import synthetic  # noqa: F401  (puts the project root on sys.path)
+
+import character_manager
+
+
+def make_character(n):
+    char = character_manager.create_character(f"hero_{n}", "Mage")
+    char["level"] = 1 + n % 50
+    char["gold"] = n * 7
+    char["inventory"] = ["health_potion", "iron_sword", "leather_armor"] * 2
+    char["completed_quests"] = ["first_steps", "goblin_hunter"]
+    return char
+
+
+def round_trip(characters, save_format):
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        for char in characters:
+            character_manager.save_character(char, tmp, save_format=save_format)
+        saved = time.perf_counter()
+        for char in characters:
+            character_manager.load_character(char["name"], tmp)
+        loaded = time.perf_counter()
+        size = sum(entry.stat().st_size for entry in os.scandir(tmp))
+    return saved - start, loaded - saved, size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    characters = [make_character(n) for n in range(count)]
+
+    encode_text = time.perf_counter()
+    for char in characters:
+        character_manager.decode_character(character_manager.encode_character(char, "text"))
+    encode_binary = time.perf_counter()
+    for char in characters:
+        character_manager.decode_character(character_manager.encode_character(char, "binary"))
+    done = time.perf_counter()
+
+    print(f"{count} characters")
+    print(f"  in-memory encode+decode: text {encode_binary - encode_text:.3f}s, "
+          f"binary {done - encode_binary:.3f}s")
+    for save_format in ("text", "binary"):
+        save, load, size = round_trip(characters, save_format)
+        print(f"  {save_format:<6} save {save:.3f}s  load {load:.3f}s  "
+              f"{size / count:.0f} bytes/character ({size / 2**20:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
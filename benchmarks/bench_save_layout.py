@@ -0,0 +1,58 @@
+"""
+Benchmark: creating, listing and loading saves in flat vs sharded layouts,
+plus migrating a flat directory.
+
+Usage: python benchmarks/bench_save_layout.py [character_count]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+import synthetic  # noqa: F401  (puts the project root on sys.path)
+
+import character_manager
+
+
+def run(layout, characters, directory):
+    character_manager.SAVE_LAYOUT = layout
+    start = time.perf_counter()
+    for char in characters:
+        character_manager.save_character(char, directory)
+    saved = time.perf_counter()
+    names = character_manager.list_saved_characters(directory)
+    listed = time.perf_counter()
+    for name in random.sample(names, min(1000, len(names))):
+        character_manager.load_character(name, directory)
+    loaded = time.perf_counter()
+    return saved - start, listed - saved, loaded - listed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    characters = [character_manager.create_character(f"hero_{n}", "Rogue")
+                  for n in range(count)]
+
+    print(f"{count} saves")
+    for layout in ("flat", "sharded"):
+        with tempfile.TemporaryDirectory() as directory:
+            save, listing, load = run(layout, characters, directory)
+            print(f"  {layout:8s}: save {save:6.2f} s  list {listing * 1000:8.1f} ms  "
+                  f"1000 loads {load * 1000:7.1f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        character_manager.SAVE_LAYOUT = "flat"
+        for char in characters:
+            character_manager.save_character(char, directory)
+        start = time.perf_counter()
+        moved = character_manager.migrate_save_layout(directory, "sharded")
+        elapsed = time.perf_counter() - start
+        print(f"  migrate flat -> sharded: {moved} saves in {elapsed:.2f} s "
+              f"({moved / elapsed:,.0f} saves/s)")
+        assert len(os.listdir(directory)) <= 16 ** character_manager.SHARD_WIDTH
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark: listing saves with class and level from the manifest vs
+opening every save file.
+
+Usage: python benchmarks/bench_save_manifest.py [character_count]
+"""
+
+import sys
+import tempfile
+import time
+
+import synthetic  # noqa: F401  (puts the project root on sys.path)
+
+import character_manager
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+    with tempfile.TemporaryDirectory() as directory:
+        for n in range(count):
+            char = character_manager.create_character(f"hero_{n}", "Mage")
+            char["level"] = 1 + n % 40
+            character_manager.save_character(char, directory)
+
+        start = time.perf_counter()
+        names = character_manager.list_saved_characters(directory)
+        for name in names:
+            char = character_manager.load_character(name, directory)
+            (char["class"], char["level"])
+        scan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        summaries = character_manager.list_character_summaries(directory)
+        manifest = time.perf_counter() - start
+
+        start = time.perf_counter()
+        page = character_manager.list_character_summaries(
+            directory, sort_by="level", reverse=True, character_class="Mage", limit=20)
+        paged = time.perf_counter() - start
+
+        start = time.perf_counter()
+        stale = character_manager.check_manifest(directory)
+        checked = time.perf_counter() - start
+
+        assert len(summaries) == count and len(page) == 20 and not stale
+        print(f"{count} saves")
+        print(f"  open every save      : {scan * 1000:9.1f} ms")
+        print(f"  manifest, full list  : {manifest * 1000:9.1f} ms ({scan / manifest:.0f}x faster)")
+        print(f"  manifest, top-20 page: {paged * 1000:9.1f} ms")
+        print(f"  consistency check    : {checked * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Benchmark: parallel shard loading at different worker counts.
+
+Usage: python benchmarks/bench_sharded_loading.py [shards] [records_per_shard]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from synthetic import write_quest_file
+
+import game_data
+
+
+def main():
+    shards = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    per_shard = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    cpus = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in range(shards):
+            write_quest_file(os.path.join(tmp, f"quests_{n:04d}.txt"),
+                             per_shard, start=n * per_shard)
+
+        print(f"{shards} shards x {per_shard} quests, {cpus} CPUs")
+        baseline = None
+        workers = 1
+        while workers <= max(cpus, 4):
+            start = time.perf_counter()
+            quests = game_data.load_quest_shards(tmp, workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"  workers={workers:<3} {elapsed:.3f}s  "
+                  f"speedup {baseline / elapsed:.2f}x  ({len(quests)} quests)")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
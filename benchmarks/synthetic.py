@@ -0,0 +1,66 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Synthetic Data Helpers for Benchmarks
+
+Writes large quest and item catalogs in the same format as data/*.txt so
+the benchmark scripts can time the loaders at realistic sizes.
+"""
+
+import os
+import sys
+
+# Benchmarks import the game modules from the project root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+ITEM_TYPES = ["weapon", "armor", "consumable"]
+ITEM_STATS = {
+    "weapon": ["strength", "magic"],
+    "armor": ["max_health", "magic"],
+    "consumable": ["health", "strength", "magic", "max_health"],
+}
+
+
+def quest_block(n):
+    prerequisite = "NONE" if n % 10 == 0 else f"quest_{n - 1}"
+    return (
+        f"QUEST_ID: quest_{n}\n"
+        f"TITLE: Quest {n}\n"
+        f"DESCRIPTION: Synthetic quest number {n}\n"
+        f"REWARD_XP: {50 + n % 500}\n"
+        f"REWARD_GOLD: {25 + n % 250}\n"
+        f"REQUIRED_LEVEL: {1 + n % 50}\n"
+        f"PREREQUISITE: {prerequisite}\n"
+    )
+
+
+def item_block(n):
+    item_type = ITEM_TYPES[n % 3]
+    stats = ITEM_STATS[item_type]
+    stat = stats[n % len(stats)]
+    return (
+        f"ITEM_ID: item_{n}\n"
+        f"NAME: Item {n}\n"
+        f"TYPE: {item_type}\n"
+        f"EFFECT: {stat}:{1 + n % 40}\n"
+        f"COST: {5 * (1 + n % 200)}\n"
+        f"DESCRIPTION: Synthetic item number {n}\n"
+    )
+
+
+def write_catalog(path, count, block=quest_block, start=0):
+    """Write `count` blocks to `path` and return the path."""
+    with open(path, "w") as f:
+        for n in range(start, start + count):
+            f.write(block(n))
+            f.write("\n")
+    return path
+
+
+def write_quest_file(path, count, start=0):
+    return write_catalog(path, count, quest_block, start)
+
+
+def write_item_file(path, count, start=0):
+    return write_catalog(path, count, item_block, start)
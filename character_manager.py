@@ -10,7 +10,18 @@ This module handles character creation, loading, and saving.
 """
 
 import os
+import math
+import json
+import hashlib
+import sqlite3
+import struct
+import threading
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+import game_data
+from inventory_system import Inventory
 from custom_exceptions import (
+    GameError,
     InvalidCharacterClassError,
     CharacterNotFoundError,
     SaveFileCorruptedError,
@@ -47,102 +58,1020 @@ def create_character(name, character_class):
         "magic": base["magic"],
         "experience": 0,
         "gold": 100,
-        "inventory": [],
+        "inventory": Inventory(),
         "active_quests": [],
         "completed_quests": []
     }
 
+# ============================================================================
+# SAVE FORMATS
+# ============================================================================
+
+# Format used by save_character when none is given: "text" or "binary".
+# Both formats use the same <name>_save.txt file name; load_character tells
+# them apart by the binary header, so existing text saves keep loading.
+SAVE_FORMAT = "text"
+
+STAT_FIELDS = ("level", "health", "max_health", "strength", "magic",
+               "experience", "gold")
+LIST_FIELDS = ("inventory", "active_quests", "completed_quests")
+
+# Equipment state, saved only when the character has it. The stat fields
+# are saved as their effective values, so the modifiers behind them
+# (inventory_system.add_modifier) are saved too; loading a character and
+# equipping again then replaces a bonus instead of stacking it.
+EQUIPMENT_FIELDS = ("equipped_weapon", "equipped_armor", "modifiers")
+
+# Binary layout (little-endian):
+#   magic, version byte
+#   name and class: u16 byte length + UTF-8
+#   the seven stats as signed 64-bit integers
+#   each id list: u32 byte length + comma-joined UTF-8 ids
+#   equipment (version 2): u32 byte length + the text save lines of
+#   EQUIPMENT_FIELDS; version 1 saves end after the id lists
+BINARY_MAGIC = b"QCSAVE"
+BINARY_VERSION = 2
+_BINARY_HEADER = struct.Struct("<6sB")
+_STATS_STRUCT = struct.Struct("<7q")
+_SHORT_LEN = struct.Struct("<H")
+_LONG_LEN = struct.Struct("<I")
+
+
+def format_character_text(character):
+    """Return the text save for a character as one string."""
+    return (
+        f"NAME: {character['name']}\n"
+        f"CLASS: {character['class']}\n"
+        f"LEVEL: {character['level']}\n"
+        f"HEALTH: {character['health']}\n"
+        f"MAX_HEALTH: {character['max_health']}\n"
+        f"STRENGTH: {character['strength']}\n"
+        f"MAGIC: {character['magic']}\n"
+        f"EXPERIENCE: {character['experience']}\n"
+        f"GOLD: {character['gold']}\n"
+        f"INVENTORY: {','.join(character['inventory'])}\n"
+        f"ACTIVE_QUESTS: {','.join(character['active_quests'])}\n"
+        f"COMPLETED_QUESTS: {','.join(character['completed_quests'])}\n"
+    ) + format_equipment_text(character)
+
+
+def format_equipment_text(character):
+    """Return the save lines for whatever equipment state a character has."""
+    return "".join(format_save_line(field, character[field])
+                   for field in EQUIPMENT_FIELDS if character.get(field))
+
+
+def format_modifiers(modifiers):
+    """Return modifiers as "source=stat:amount,...;source=..." text."""
+    return ";".join(source + "=" + ",".join(f"{stat}:{amount}" for stat, amount in deltas.items())
+                    for source, deltas in modifiers.items())
+
+
+def parse_modifiers(value):
+    """Parse format_modifiers text back into {source: {stat: amount}}."""
+    modifiers = {}
+    for part in value.split(";") if value else ():
+        source, deltas = part.split("=", 1)
+        modifiers[source] = game_data.parse_effect(deltas)
+    return modifiers
+
+
+def format_save_line(field, value):
+    """Return one "KEY: value" save line for a character field."""
+    if field in LIST_FIELDS:
+        value = ",".join(value)
+    elif field == "modifiers":
+        value = format_modifiers(value or {})
+    elif value is None:
+        value = ""
+    return f"{field.upper()}: {value}\n"
+
+
+def parse_save_line(line):
+    """Return (field, value) for one "KEY: value" save line."""
+    line = line.strip()
+    if ": " not in line:
+        # allow empty lists like "INVENTORY:" to be treated as empty
+        if line.endswith(":"):
+            key = line[:-1]
+            value = ""
+        else:
+            raise InvalidSaveDataError("Invalid file format")
+    else:
+        key, value = line.split(": ", 1)
+
+    if key in ["LEVEL", "HEALTH", "MAX_HEALTH", "STRENGTH", "MAGIC",
+               "EXPERIENCE", "GOLD"]:
+        return key.lower(), int(value)
+    elif key == "INVENTORY":
+        return "inventory", Inventory(game_data.intern_ids(value.split(",")) if value else ())
+    elif key in ["ACTIVE_QUESTS", "COMPLETED_QUESTS"]:
+        return key.lower(), game_data.intern_ids(value.split(",")) if value else []
+    elif key in ["EQUIPPED_WEAPON", "EQUIPPED_ARMOR"]:
+        return key.lower(), game_data.intern_id(value) if value else None
+    elif key == "MODIFIERS":
+        return "modifiers", parse_modifiers(value)
+    else:
+        return key.lower(), value
+
+
+def parse_character_text(lines):
+    """Build a character from text save lines. Raises InvalidSaveDataError."""
+    character = {}
+
+    try:
+        for line in lines:
+            field, value = parse_save_line(line)
+            character[field] = value
+
+        validate_character_data(character)
+        return character
+
+    except Exception:
+        raise InvalidSaveDataError("Save data is corrupted")
+
+
+def pack_character(character):
+    """Return the versioned binary save for a character."""
+    name = character["name"].encode()
+    class_name = character["class"].encode()
+    parts = [
+        _BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION),
+        _SHORT_LEN.pack(len(name)), name,
+        _SHORT_LEN.pack(len(class_name)), class_name,
+        _STATS_STRUCT.pack(*[character[field] for field in STAT_FIELDS]),
+    ]
+    for field in LIST_FIELDS:
+        ids = ",".join(character[field]).encode()
+        parts.append(_LONG_LEN.pack(len(ids)))
+        parts.append(ids)
+    equipment = format_equipment_text(character).encode()
+    parts.append(_LONG_LEN.pack(len(equipment)))
+    parts.append(equipment)
+    return b"".join(parts)
+
+
+def unpack_character(data):
+    """Build a character from a binary save. Raises InvalidSaveDataError."""
+    try:
+        magic, version = _BINARY_HEADER.unpack_from(data, 0)
+        if magic != BINARY_MAGIC:
+            raise InvalidSaveDataError("Not a binary save")
+        if version not in (1, BINARY_VERSION):
+            raise InvalidSaveDataError(f"Unsupported save version {version}")
+        offset = _BINARY_HEADER.size
+
+        character = {}
+        for field in ("name", "class"):
+            (size,) = _SHORT_LEN.unpack_from(data, offset)
+            offset += _SHORT_LEN.size
+            character[field] = bytes(data[offset:offset + size]).decode()
+            offset += size
+
+        stats = _STATS_STRUCT.unpack_from(data, offset)
+        offset += _STATS_STRUCT.size
+        character.update(zip(STAT_FIELDS, stats))
+
+        for field in LIST_FIELDS:
+            (size,) = _LONG_LEN.unpack_from(data, offset)
+            offset += _LONG_LEN.size
+            if offset + size > len(data):
+                raise InvalidSaveDataError("Truncated save data")
+            ids = bytes(data[offset:offset + size]).decode()
+            offset += size
+            character[field] = game_data.intern_ids(ids.split(",")) if ids else []
+        character["inventory"] = Inventory(character["inventory"])
+
+        if version >= 2:
+            (size,) = _LONG_LEN.unpack_from(data, offset)
+            offset += _LONG_LEN.size
+            if offset + size > len(data):
+                raise InvalidSaveDataError("Truncated save data")
+            for line in bytes(data[offset:offset + size]).decode().splitlines():
+                field, value = parse_save_line(line)
+                character[field] = value
+            offset += size
+
+        if offset != len(data):
+            raise InvalidSaveDataError("Trailing bytes in save data")
+
+    except InvalidSaveDataError:
+        raise
+    except Exception:
+        raise InvalidSaveDataError("Save data is corrupted")
+
+    validate_character_data(character)
+    return character
+
+
+def encode_character(character, save_format=None):
+    """Serialize a character in the given (or configured) save format."""
+    save_format = save_format or SAVE_FORMAT
+    if save_format == "binary":
+        return pack_character(character)
+    if save_format == "text":
+        return format_character_text(character).encode()
+    raise ValueError("Unknown save format: " + str(save_format))
+
+
+def decode_character(data):
+    """Deserialize a save in either format, detected from its header."""
+    if data[:len(BINARY_MAGIC)] == BINARY_MAGIC:
+        return unpack_character(data)
+    try:
+        text = bytes(data).decode()
+    except UnicodeDecodeError:
+        raise InvalidSaveDataError("Save data is corrupted")
+    return parse_character_text(text.splitlines())
+
 # ============================================================================
 # SAVE / LOAD
 # ============================================================================
 
-def save_character(character, save_directory="data/save_games"):
-    os.makedirs(save_directory, exist_ok=True)
+# Where save_character and friends keep characters when no backend is given:
+# "files" writes one <name>_save.txt per character, "sqlite" keeps every
+# character in one indexed saves.db inside the save directory.
+SAVE_BACKEND = "files"
+SQLITE_FILENAME = "saves.db"
+
+# How the files backend lays out save files: "flat" keeps every save
+# directly in the save directory, "sharded" nests them under hash-prefix
+# directories (ab/<name>_save.txt with one level) so no single directory
+# grows huge. Raise SHARD_LEVELS for tens of millions of saves. Loading,
+# deleting and listing find saves in either layout.
+SAVE_LAYOUT = "flat"
+SHARD_LEVELS = 1
+SHARD_WIDTH = 2
+SAVE_SUFFIX = "_save.txt"
+
+
+def _backend(backend):
+    backend = backend or SAVE_BACKEND
+    if backend not in ("files", "sqlite"):
+        raise ValueError("Unknown save backend: " + str(backend))
+    return backend
+
+
+def _layout(layout):
+    layout = layout or SAVE_LAYOUT
+    if layout not in ("flat", "sharded"):
+        raise ValueError("Unknown save layout: " + str(layout))
+    return layout
+
 
-    filename = os.path.join(save_directory, f"{character['name']}_save.txt")
+def _shard_dirs(character_name):
+    digest = hashlib.sha1(character_name.encode("utf-8")).hexdigest()
+    return [digest[i * SHARD_WIDTH:(i + 1) * SHARD_WIDTH] for i in range(SHARD_LEVELS)]
+
+
+def _save_path(character_name, save_directory, layout=None):
+    if _layout(layout) == "sharded":
+        save_directory = os.path.join(save_directory, *_shard_dirs(character_name))
+    return os.path.join(save_directory, character_name + SAVE_SUFFIX)
+
+
+def _find_save(character_name, save_directory):
+    """Path of an existing save in either layout (configured one first), or None."""
+    first = _layout(None)
+    for layout in (first, "sharded" if first == "flat" else "flat"):
+        filename = _save_path(character_name, save_directory, layout)
+        if os.path.exists(filename):
+            return filename
+    return None
+
+
+def _is_shard_dir(name):
+    return len(name) == SHARD_WIDTH and all(ch in "0123456789abcdef" for ch in name)
+
+
+def _iter_save_files(save_directory, depth=0):
+    """Yield (name, path) for every save file in both layouts."""
+    with os.scandir(save_directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(SAVE_SUFFIX) and entry.is_file():
+                yield entry.name[:-len(SAVE_SUFFIX)], entry.path
+            elif depth < SHARD_LEVELS and _is_shard_dir(entry.name) and entry.is_dir():
+                yield from _iter_save_files(entry.path, depth + 1)
+
+
+def _write_save_file(filename, data):
+    # Write beside the save and swap it in, so a failed write leaves the
+    # previous save intact.
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    temp = filename + ".tmp"
+    with open(temp, "wb") as f:
+        f.write(data)
+    os.replace(temp, filename)
+
+
+def _remove_other_layout(character_name, save_directory, filename):
+    # A save written in the configured layout replaces one in the other
+    for layout in ("flat", "sharded"):
+        other = _save_path(character_name, save_directory, layout)
+        if other != filename and os.path.exists(other):
+            os.remove(other)
+            _discard_journal(other)
+
+
+def save_character(character, save_directory="data/save_games", save_format=None,
+                   backend=None, journal=None):
+    if _backend(backend) == "sqlite":
+        return _sqlite_save(character, save_directory, save_format)
+
+    if journal is None:
+        journal = SAVE_JOURNAL
+    if journal:
+        return _journal_save(character, save_directory, save_format)
+
+    filename = _save_path(character['name'], save_directory)
 
     try:
-        with open(filename, "w") as f:
-            f.write(f"NAME: {character['name']}\n")
-            f.write(f"CLASS: {character['class']}\n")
-            f.write(f"LEVEL: {character['level']}\n")
-            f.write(f"HEALTH: {character['health']}\n")
-            f.write(f"MAX_HEALTH: {character['max_health']}\n")
-            f.write(f"STRENGTH: {character['strength']}\n")
-            f.write(f"MAGIC: {character['magic']}\n")
-            f.write(f"EXPERIENCE: {character['experience']}\n")
-            f.write(f"GOLD: {character['gold']}\n")
-            f.write(f"INVENTORY: {','.join(character['inventory'])}\n")
-            f.write(f"ACTIVE_QUESTS: {','.join(character['active_quests'])}\n")
-            f.write(f"COMPLETED_QUESTS: {','.join(character['completed_quests'])}\n")
+        data = encode_character(character, save_format)
+        _write_save_file(filename, data)
+        # A full save supersedes any journal left by earlier journaled
+        # saves; drop it only once the new snapshot is on disk.
+        _discard_journal(filename)
+        _remove_other_layout(character['name'], save_directory, filename)
+        _manifest_update(character, save_directory, filename)
 
         return True
 
+    except ValueError:
+        raise
     except Exception:
         raise SaveFileCorruptedError("Could not save character file")
 
-def load_character(character_name, save_directory="data/save_games"):
-    filename = os.path.join(save_directory, f"{character_name}_save.txt")
+def load_character(character_name, save_directory="data/save_games", backend=None):
+    if _backend(backend) == "sqlite":
+        return _sqlite_load(character_name, save_directory)
+
+    filename = _find_save(character_name, save_directory)
 
-    if not os.path.exists(filename):
+    if filename is None:
         raise CharacterNotFoundError("Character save file not found")
 
     try:
-        with open(filename, "r") as f:
-            lines = f.readlines()
+        with open(filename, "rb") as f:
+            data = f.read()
     except Exception:
         raise SaveFileCorruptedError("Error reading save file")
 
-    character = {}
+    character = decode_character(data)
+    _replay_journal(character, filename + JOURNAL_SUFFIX)
+    return character
 
-    try:
-        for line in lines:
-            line = line.strip()
-            if ": " not in line:
-    # allow empty lists like "INVENTORY:" to be treated as empty
-                if line.endswith(":"):
-                    key = line[:-1]
-                    value = ""
-                else:
-                    raise InvalidSaveDataError("Invalid file format")
-            else:
-                key, value = line.split(": ", 1)
+def list_saved_characters(save_directory="data/save_games", backend=None,
+                          after=None, limit=None):
+    """
+    Return saved character names in sorted order.
 
+    For paging, pass the last name of the previous page as `after` and a
+    page size as `limit`. The sqlite backend answers a page from its index
+    without touching the rest of the saves.
+    """
+    if _backend(backend) == "sqlite":
+        return _sqlite_list(save_directory, after, limit)
 
-            if key in ["LEVEL", "HEALTH", "MAX_HEALTH", "STRENGTH", "MAGIC",
-                       "EXPERIENCE", "GOLD"]:
-                character[key.lower()] = int(value)
-            elif key in ["INVENTORY", "ACTIVE_QUESTS", "COMPLETED_QUESTS"]:
-                character[key.lower()] = value.split(",") if value else []
-            else:
-                character[key.lower()] = value
+    if not os.path.exists(save_directory):
+        return []
+
+    names = sorted({name for name, _ in _iter_save_files(save_directory)})
+    if after is not None:
+        names = names[bisect_right(names, after):]
+    if limit is not None:
+        names = names[:limit]
+    return names
+
+def delete_character(character_name, save_directory="data/save_games", backend=None):
+    if _backend(backend) == "sqlite":
+        return _sqlite_delete(character_name, save_directory)
+
+    filename = _find_save(character_name, save_directory)
+
+    if filename is None:
+        raise CharacterNotFoundError("Character not found")
+
+    os.remove(filename)
+    _discard_journal(filename)
+    _manifest_remove(character_name, save_directory)
+    return True
+
+
+def migrate_save_layout(save_directory="data/save_games", layout="sharded",
+                        max_workers=None):
+    """
+    Move every save file (and its journal) into the given layout.
+
+    Files are renamed in place over a thread pool, so no save is rewritten.
+    Returns the number of characters moved. Set SAVE_LAYOUT to match
+    afterwards so new saves go to the same place.
+    """
+    layout = _layout(layout)
+    if not os.path.exists(save_directory):
+        return 0
+
+    moves = []
+    for name, path in _iter_save_files(save_directory):
+        target = _save_path(name, save_directory, layout)
+        if os.path.abspath(path) != os.path.abspath(target):
+            moves.append((path, target))
+
+    def move_one(move):
+        source, target = move
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        _journal_state.pop(os.path.abspath(source), None)
+        os.replace(source, target)
+        if os.path.exists(source + JOURNAL_SUFFIX):
+            os.replace(source + JOURNAL_SUFFIX, target + JOURNAL_SUFFIX)
+
+    with ThreadPoolExecutor(max_workers=max_workers or BULK_WORKERS) as pool:
+        list(pool.map(move_one, moves))
+
+    # Drop shard directories that the move left empty
+    top = os.path.abspath(save_directory)
+    for directory in sorted({os.path.dirname(os.path.abspath(s)) for s, _ in moves},
+                            reverse=True):
+        while directory != top:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break
+            directory = os.path.dirname(directory)
+    return len(moves)
+
+# ============================================================================
+# BULK SAVE / LOAD
+# ============================================================================
+
+# Save and load time is mostly file I/O, which releases the GIL, so bulk
+# calls fan out over a bounded thread pool.
+BULK_WORKERS = 8
+
+
+def load_characters(names, save_directory="data/save_games", backend=None,
+                    max_workers=None):
+    """
+    Load many characters at once.
+
+    Returns one {"name", "character", "error"} dict per name, in the order
+    given. A character that fails to load gets the exception
+    load_character would have raised (CharacterNotFoundError,
+    InvalidSaveDataError, ...) in "error" and None in "character".
+    """
+    _backend(backend)
+
+    def load_one(name):
+        try:
+            character = load_character(name, save_directory, backend)
+            return {"name": name, "character": character, "error": None}
+        except GameError as e:
+            return {"name": name, "character": None, "error": e}
+
+    with ThreadPoolExecutor(max_workers=max_workers or BULK_WORKERS) as pool:
+        return list(pool.map(load_one, names))
+
+
+def save_characters(characters, save_directory="data/save_games", save_format=None,
+                    backend=None, max_workers=None):
+    """
+    Save many characters at once.
+
+    Returns one {"name", "saved", "error"} dict per character, in the order
+    given, with the exception save_character would have raised in "error".
+    Each character name should appear only once per call.
+    """
+    _backend(backend)
+
+    def save_one(character):
+        try:
+            save_character(character, save_directory, save_format, backend)
+            return {"name": character["name"], "saved": True, "error": None}
+        except GameError as e:
+            return {"name": character["name"], "saved": False, "error": e}
+
+    with ThreadPoolExecutor(max_workers=max_workers or BULK_WORKERS) as pool:
+        return list(pool.map(save_one, characters))
+
+# ============================================================================
+# SAVE JOURNAL
+# ============================================================================
 
+# With journaling on, the files backend appends only the fields that changed
+# since the last save to <name>_save.txt.journal as "KEY: value" lines, and
+# rewrites the full snapshot once the journal holds
+# JOURNAL_COMPACT_THRESHOLD entries. load_character replays the journal on
+# top of the snapshot.
+SAVE_JOURNAL = False
+JOURNAL_COMPACT_THRESHOLD = 50
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_FIELDS = ("class",) + STAT_FIELDS + LIST_FIELDS
+
+# snapshot path -> [fields as last saved, journal entry count]
+_journal_state = {}
+
+
+def _copy_saved_fields(character):
+    saved = {}
+    for field in JOURNAL_FIELDS:
+        value = character[field]
+        if field == "inventory":
+            value = Inventory(value)
+        elif field in LIST_FIELDS:
+            value = list(value)
+        saved[field] = value
+    for field in EQUIPMENT_FIELDS:
+        value = character.get(field)
+        if field == "modifiers" and value:
+            value = {source: dict(deltas) for source, deltas in value.items()}
+        saved[field] = value or None
+    return saved
+
+
+def _replay_journal(character, journal_file):
+    """Apply journal entries to a loaded snapshot; returns the entry count."""
+    if not os.path.exists(journal_file):
+        return 0
+
+    try:
+        with open(journal_file, "r") as f:
+            text = f.read()
+    except Exception:
+        raise SaveFileCorruptedError("Error reading save journal")
+
+    entries = 0
+    try:
+        for line in text.splitlines(keepends=True):
+            if not line.endswith("\n"):
+                # a torn final write; everything before it is intact
+                break
+            field, value = parse_save_line(line)
+            character[field] = value
+            entries += 1
         validate_character_data(character)
-        return character
+    except Exception:
+        raise InvalidSaveDataError("Save journal is corrupted")
+    return entries
+
+
+def _discard_journal(filename):
+    _journal_state.pop(os.path.abspath(filename), None)
+    journal_file = filename + JOURNAL_SUFFIX
+    if os.path.exists(journal_file):
+        os.remove(journal_file)
+
 
+def _write_snapshot(character, filename, save_format):
+    try:
+        data = encode_character(character, save_format)
+        _write_save_file(filename, data)
+        journal_file = filename + JOURNAL_SUFFIX
+        if os.path.exists(journal_file):
+            os.remove(journal_file)
+    except ValueError:
+        raise
     except Exception:
-        raise InvalidSaveDataError("Save data is corrupted")
+        raise SaveFileCorruptedError("Could not save character file")
+
+
+def _journal_save(character, save_directory, save_format):
+    filename = _save_path(character["name"], save_directory)
+    key = os.path.abspath(filename)
+
+    state = _journal_state.get(key)
+    if state is None and os.path.exists(filename):
+        # First journaled save this session: rebuild what is on disk
+        try:
+            with open(filename, "rb") as f:
+                on_disk = decode_character(f.read())
+            entries = _replay_journal(on_disk, filename + JOURNAL_SUFFIX)
+            state = [_copy_saved_fields(on_disk), entries]
+        except (InvalidSaveDataError, SaveFileCorruptedError):
+            state = None
+
+    if state is None or state[1] >= JOURNAL_COMPACT_THRESHOLD:
+        _write_snapshot(character, filename, save_format)
+        _remove_other_layout(character["name"], save_directory, filename)
+        _manifest_update(character, save_directory, filename)
+        _journal_state[key] = [_copy_saved_fields(character), 0]
+        return True
+
+    saved, entries = state
+    lines = []
+    for field in JOURNAL_FIELDS:
+        if character[field] != saved[field]:
+            lines.append(format_save_line(field, character[field]))
+    for field in EQUIPMENT_FIELDS:
+        if (character.get(field) or None) != saved[field]:
+            lines.append(format_save_line(field, character.get(field)))
+
+    if lines:
+        try:
+            with open(filename + JOURNAL_SUFFIX, "a") as f:
+                f.write("".join(lines))
+        except Exception:
+            raise SaveFileCorruptedError("Could not write save journal")
+        state[0] = _copy_saved_fields(character)
+        state[1] = entries + len(lines)
+        _manifest_update(character, save_directory, filename)
+
+    return True
+
+
+def compact_journal(character_name, save_directory="data/save_games", save_format=None):
+    """Fold a character's journal into a fresh snapshot."""
+    character = load_character(character_name, save_directory, backend="files")
+    filename = _find_save(character_name, save_directory)
+    _write_snapshot(character, filename, save_format)
+    _journal_state[os.path.abspath(filename)] = [_copy_saved_fields(character), 0]
+    _manifest_update(character, save_directory, filename)
+    return True
+
+# ============================================================================
+# SAVE MANIFEST
+# ============================================================================
+
+# The files backend keeps a manifest.jsonl in the save directory with one
+# summary per character (name, class, level, gold, mtime), so menus can
+# list saves without opening them. Saves and deletes append a JSON line;
+# reading folds the lines into the latest entry per name. After a read or
+# an append, the file is rewritten once it holds MANIFEST_COMPACT_FACTOR
+# times more lines than entries. Appends, reads and rewrites all hold
+# _manifest_lock, so a rewrite never drops a line appended meanwhile.
+MANIFEST_FILENAME = "manifest.jsonl"
+MANIFEST_COMPACT_FACTOR = 4
+MANIFEST_FIELDS = ("name", "class", "level", "gold", "mtime")
+MANIFEST_SORT_KEYS = ("name", "class", "level", "gold", "mtime")
+
+_manifest_lock = threading.RLock()
+
+# manifest path -> [inode, bytes read, entries, line count, lines appended
+# since the last read]
+_manifest_cache = {}
+
+
+def _manifest_path(save_directory):
+    return os.path.join(save_directory, MANIFEST_FILENAME)
+
+
+def _save_mtime(filename):
+    """Last change to a save, counting its journal."""
+    mtime = os.stat(filename).st_mtime
+    journal_file = filename + JOURNAL_SUFFIX
+    if os.path.exists(journal_file):
+        mtime = max(mtime, os.stat(journal_file).st_mtime)
+    return mtime
+
+
+def _manifest_entry(character, filename):
+    return {
+        "name": character["name"],
+        "class": character["class"],
+        "level": character["level"],
+        "gold": character["gold"],
+        "mtime": _save_mtime(filename) if filename else None,
+    }
+
+
+def _append_manifest(save_directory, records):
+    text = "".join(json.dumps(record) + "\n" for record in records)
+    path = _manifest_path(save_directory)
+    key = os.path.abspath(path)
+    try:
+        with _manifest_lock:
+            with open(path, "a") as f:
+                f.write(text)
+            # Appends stay append-only; the lines are only read back once
+            # enough have piled up to possibly need compacting.
+            cached = _manifest_cache.setdefault(key, [None, 0, {}, 0, 0])
+            cached[4] += len(records)
+            if cached[3] + cached[4] > MANIFEST_COMPACT_FACTOR * max(len(cached[2]), 16):
+                try:
+                    _sync_manifest(save_directory)
+                except (ValueError, KeyError, AttributeError):
+                    # A damaged manifest is rebuilt by the next read_manifest.
+                    _manifest_cache.pop(key, None)
+    except OSError:
+        raise SaveFileCorruptedError("Could not update save manifest")
+
+
+def _manifest_update(character, save_directory, filename):
+    _append_manifest(save_directory, [_manifest_entry(character, filename)])
+
+
+def _manifest_remove(character_name, save_directory):
+    _append_manifest(save_directory, [{"name": character_name, "deleted": True}])
+
+
+def _write_manifest(save_directory, entries):
+    path = _manifest_path(save_directory)
+    temp = path + ".tmp"
+    with _manifest_lock:
+        with open(temp, "w") as f:
+            for entry in entries.values():
+                f.write(json.dumps(entry) + "\n")
+        os.replace(temp, path)
+        stat = os.stat(path)
+        _manifest_cache[os.path.abspath(path)] = [stat.st_ino, stat.st_size,
+                                                  dict(entries), len(entries), 0]
+
+
+def _sync_manifest(save_directory):
+    """
+    Fold lines appended since the last read into the cached entries and
+    compact the file if it is mostly superseded lines. Returns the
+    entries. The caller holds _manifest_lock.
+    """
+    path = _manifest_path(save_directory)
+    stat = os.stat(path)
+    key = os.path.abspath(path)
+    cached = _manifest_cache.get(key)
+    if cached is None or cached[0] != stat.st_ino or cached[1] > stat.st_size:
+        cached = [stat.st_ino, 0, {}, 0, 0]
+    inode, offset, entries, lines, _ = cached
+
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # a torn or in-progress append
+            record = json.loads(line)
+            offset += len(line)
+            lines += 1
+            if record.get("deleted"):
+                entries.pop(record["name"], None)
+            else:
+                entries[record["name"]] = record
+
+    _manifest_cache[key] = [inode, offset, entries, lines, 0]
+    if lines > MANIFEST_COMPACT_FACTOR * max(len(entries), 16):
+        _write_manifest(save_directory, entries)
+    return entries
+
 
-def list_saved_characters(save_directory="data/save_games"):
+def read_manifest(save_directory="data/save_games"):
+    """
+    Return {name: summary} from the manifest, building it from the save
+    files if there is none yet. Repeated reads only parse lines appended
+    since the last one.
+    """
+    try:
+        with _manifest_lock:
+            return dict(_sync_manifest(save_directory))
+    except FileNotFoundError:
+        return rebuild_manifest(save_directory)
+    except (OSError, ValueError, KeyError, AttributeError):
+        _manifest_cache.pop(os.path.abspath(_manifest_path(save_directory)), None)
+        return rebuild_manifest(save_directory)
+
+
+def rebuild_manifest(save_directory="data/save_games"):
+    """Rewrite the manifest from the save files; unreadable saves are left out."""
+    if not os.path.exists(save_directory):
+        return {}
+    paths = dict(_iter_save_files(save_directory))
+    results = load_characters(sorted(paths), save_directory, backend="files")
+
+    entries = {}
+    for result in results:
+        if result["error"] is None:
+            entry = _manifest_entry(result["character"], _find_save(result["name"], save_directory))
+            entries[entry["name"]] = entry
+    _write_manifest(save_directory, entries)
+    return entries
+
+
+def check_manifest(save_directory="data/save_games", repair=True):
+    """
+    Compare the manifest with the save files on disk.
+
+    Returns the names whose entry is missing, left over or older than the
+    save. With repair on, a stale manifest is rebuilt from the saves.
+    """
     if not os.path.exists(save_directory):
         return []
+    entries = read_manifest(save_directory)
+    paths = dict(_iter_save_files(save_directory))
 
-    files = os.listdir(save_directory)
-    names = []
+    stale = sorted(set(entries) ^ set(paths))
+    for name in set(entries) & set(paths):
+        if entries[name]["mtime"] != _save_mtime(paths[name]):
+            stale.append(name)
 
-    for file in files:
-        if file.endswith("_save.txt"):
-            names.append(file.replace("_save.txt", ""))
+    if stale and repair:
+        rebuild_manifest(save_directory)
+    return sorted(stale)
 
-    return names
 
-def delete_character(character_name, save_directory="data/save_games"):
-    filename = os.path.join(save_directory, f"{character_name}_save.txt")
+def list_character_summaries(save_directory="data/save_games", backend=None,
+                             sort_by="name", reverse=False, character_class=None,
+                             min_level=None, max_level=None, offset=0, limit=None):
+    """
+    Return one {name, class, level, gold, mtime} summary per saved
+    character, filtered, sorted by sort_by (ties by name) and paged with
+    offset/limit.
 
-    if not os.path.exists(filename):
-        raise CharacterNotFoundError("Character not found")
+    The files backend answers from the manifest in one read; the sqlite
+    backend runs one query over its summary columns and only returns the
+    requested page (mtime is None there).
+    """
+    if sort_by not in MANIFEST_SORT_KEYS:
+        raise ValueError("Cannot sort saves by: " + str(sort_by))
 
-    os.remove(filename)
+    if _backend(backend) == "sqlite":
+        return _sqlite_summaries(save_directory, sort_by, reverse, character_class,
+                                 min_level, max_level, offset, limit)
+
+    entries = list(read_manifest(save_directory).values())
+
+    if character_class is not None:
+        entries = [e for e in entries if e["class"] == character_class]
+    if min_level is not None:
+        entries = [e for e in entries if e["level"] >= min_level]
+    if max_level is not None:
+        entries = [e for e in entries if e["level"] <= max_level]
+
+    entries.sort(key=lambda e: e["name"])
+    entries.sort(key=lambda e: (e[sort_by] is None, e[sort_by]), reverse=reverse)
+    entries = entries[offset:]
+    if limit is not None:
+        entries = entries[:limit]
+    return [dict(e) for e in entries]
+
+# ============================================================================
+# SQLITE BACKEND
+# ============================================================================
+
+# sqlite3 connections cannot be shared between threads, so each thread
+# keeps its own connection per database file.
+_sqlite_local = threading.local()
+
+# Each row keeps class, level and gold next to the encoded save, so
+# list_character_summaries can filter, sort and page in SQL without
+# decoding saves. Summary key -> column.
+_SQLITE_SUMMARY_COLUMNS = {"class": "class_name", "level": "level", "gold": "gold"}
+
+
+def _sqlite_connection(save_directory, create):
+    path = os.path.abspath(os.path.join(save_directory, SQLITE_FILENAME))
+    connections = getattr(_sqlite_local, "connections", None)
+    if connections is None:
+        connections = _sqlite_local.connections = {}
+
+    conn = connections.get(path)
+    if conn is not None:
+        if os.path.exists(path):
+            return conn
+        # The database was deleted under us; start over
+        conn.close()
+        del connections[path]
+
+    if not os.path.exists(path):
+        if not create:
+            return None
+        os.makedirs(save_directory, exist_ok=True)
+
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS characters ("
+        "name TEXT PRIMARY KEY, data BLOB NOT NULL, "
+        "class_name TEXT, level INTEGER, gold INTEGER) WITHOUT ROWID"
+    )
+    _sqlite_add_summary_columns(conn)
+    conn.commit()
+    connections[path] = conn
+    return conn
+
+
+def _sqlite_add_summary_columns(conn):
+    """Give a database from before the summary columns its columns, filled in once."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(characters)")}
+    if "level" in columns:
+        return
+    conn.execute("ALTER TABLE characters ADD COLUMN class_name TEXT")
+    conn.execute("ALTER TABLE characters ADD COLUMN level INTEGER")
+    conn.execute("ALTER TABLE characters ADD COLUMN gold INTEGER")
+    for name, data in conn.execute("SELECT name, data FROM characters").fetchall():
+        try:
+            character = decode_character(data)
+        except InvalidSaveDataError:
+            continue  # left without a summary, like an unreadable save file
+        conn.execute(
+            "UPDATE characters SET class_name = ?, level = ?, gold = ? WHERE name = ?",
+            (character["class"], character["level"], character["gold"], name),
+        )
+
+
+def close_sqlite_connections():
+    """Close this thread's cached save database connections."""
+    connections = getattr(_sqlite_local, "connections", {})
+    for conn in connections.values():
+        conn.close()
+    connections.clear()
+
+
+def _sqlite_save(character, save_directory, save_format):
+    try:
+        data = encode_character(character, save_format)
+        conn = _sqlite_connection(save_directory, create=True)
+        with conn:
+            conn.execute(
+                "INSERT INTO characters (name, data, class_name, level, gold) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET data = excluded.data, "
+                "class_name = excluded.class_name, level = excluded.level, "
+                "gold = excluded.gold",
+                (character["name"], data, character["class"],
+                 character["level"], character["gold"]),
+            )
+        return True
+    except ValueError:
+        raise
+    except Exception:
+        raise SaveFileCorruptedError("Could not save character")
+
+
+def _sqlite_load(character_name, save_directory):
+    try:
+        conn = _sqlite_connection(save_directory, create=False)
+        row = None
+        if conn is not None:
+            row = conn.execute(
+                "SELECT data FROM characters WHERE name = ?", (character_name,)
+            ).fetchone()
+    except sqlite3.Error:
+        raise SaveFileCorruptedError("Error reading save database")
+
+    if row is None:
+        raise CharacterNotFoundError("Character save not found")
+    return decode_character(row[0])
+
+
+def _sqlite_list(save_directory, after, limit):
+    conn = _sqlite_connection(save_directory, create=False)
+    if conn is None:
+        return []
+
+    query = "SELECT name FROM characters"
+    params = []
+    if after is not None:
+        query += " WHERE name > ?"
+        params.append(after)
+    query += " ORDER BY name"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    return [row[0] for row in conn.execute(query, params)]
+
+
+def _sqlite_summaries(save_directory, sort_by, reverse, character_class,
+                      min_level, max_level, offset, limit):
+    conn = _sqlite_connection(save_directory, create=False)
+    if conn is None:
+        return []
+
+    query = "SELECT name, class_name, level, gold FROM characters WHERE level IS NOT NULL"
+    params = []
+    if character_class is not None:
+        query += " AND class_name = ?"
+        params.append(character_class)
+    if min_level is not None:
+        query += " AND level >= ?"
+        params.append(min_level)
+    if max_level is not None:
+        query += " AND level <= ?"
+        params.append(max_level)
+
+    # Same order as the manifest path: by sort_by, ties by name ascending.
+    # mtime is None for every row, so it sorts by name alone.
+    direction = " DESC" if reverse else ""
+    if sort_by == "name":
+        query += " ORDER BY name" + direction
+    elif sort_by in _SQLITE_SUMMARY_COLUMNS:
+        query += f" ORDER BY {_SQLITE_SUMMARY_COLUMNS[sort_by]}{direction}, name"
+    else:
+        query += " ORDER BY name"
+    query += " LIMIT ? OFFSET ?"
+    params += [limit if limit is not None else -1, offset]
+
+    try:
+        rows = conn.execute(query, params).fetchall()
+    except sqlite3.Error:
+        raise SaveFileCorruptedError("Error reading save database")
+    return [{"name": name, "class": class_name, "level": level, "gold": gold, "mtime": None}
+            for name, class_name, level, gold in rows]
+
+
+def _sqlite_delete(character_name, save_directory):
+    conn = _sqlite_connection(save_directory, create=False)
+    deleted = 0
+    if conn is not None:
+        with conn:
+            deleted = conn.execute(
+                "DELETE FROM characters WHERE name = ?", (character_name,)
+            ).rowcount
+
+    if deleted == 0:
+        raise CharacterNotFoundError("Character not found")
     return True
 
 # ============================================================================
@@ -155,18 +1084,36 @@ def gain_experience(character, xp_amount):
 
     character["experience"] += xp_amount
 
-    leveled_up = False
+    gained, leftover = levels_gained(character["level"], character["experience"])
+    if gained == 0:
+        return False
+
+    character["experience"] = leftover
+    character["level"] += gained
+    character["max_health"] += 10 * gained
+    character["strength"] += 2 * gained
+    character["magic"] += 2 * gained
+    character["health"] = character["max_health"]
+    return True
 
-    while character["experience"] >= character["level"] * 100:
-        character["experience"] -= character["level"] * 100
-        character["level"] += 1
-        character["max_health"] += 10
-        character["strength"] += 2
-        character["magic"] += 2
-        character["health"] = character["max_health"]
-        leveled_up = True
+def levels_gained(level, experience):
+    """
+    Return (levels gained, leftover experience) for a character at `level`.
 
-    return leveled_up
+    Going from level L to L+1 costs L * 100 XP, so k level-ups cost the
+    arithmetic series 100 * (k*L + k*(k-1)/2). The largest affordable k is
+    the floor of the positive root of k^2 + (2L-1)k - 2*(experience // 100),
+    computed exactly with integer square roots.
+    """
+    if experience < level * 100:
+        return 0, experience
+
+    hundreds = experience // 100
+    b = 2 * level - 1
+    k = (math.isqrt(b * b + 8 * hundreds) - b) // 2
+
+    spent = 100 * (k * level + k * (k - 1) // 2)
+    return k, experience - spent
 
 def add_gold(character, amount):
     new_amount = character["gold"] + amount
@@ -215,9 +1162,12 @@ def validate_character_data(character):
     list_fields = ["inventory", "active_quests", "completed_quests"]
 
     for key in list_fields:
-        if not isinstance(character[key], list):
+        if not isinstance(character[key], (list, Inventory)):
             raise InvalidSaveDataError(f"Invalid list for {key}")
 
+    if not isinstance(character.get("modifiers", {}), dict):
+        raise InvalidSaveDataError("Invalid modifiers")
+
     return True
 
 # ============================================================================
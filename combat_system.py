@@ -130,6 +130,7 @@ class SimpleBattle:
         self.apply_damage(self.character, damage)
 
     def calculate_damage(self, attacker, defender):
+        # strength already includes equipment modifiers (see inventory_system)
         dmg = attacker["strength"] - (defender["strength"] // 4)
         return max(1, dmg)
 
@@ -8,69 +8,415 @@ AI Usage: Used ChatGPT for help writing simple parsing functions.
 """
 
 import os
+import gc
+import glob
+import hashlib
+import marshal
+import mmap
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from custom_exceptions import (
     InvalidDataFormatError,
     MissingDataFileError,
     CorruptedDataError
 )
 
+# Parsed catalogs are cached next to their data file (e.g. quests.txt.cache).
+# The cache is a marshal file of plain values (no pickle, so a planted cache
+# file cannot run code). Bump CACHE_VERSION whenever the parsed record
+# layout changes.
+CACHE_SUFFIX = ".cache"
+CACHE_VERSION = 3
+
 # =====================================================================
-# LOAD QUESTS
+# STREAMING LOADERS
 # =====================================================================
 
-def load_quests(filename="data/quests.txt"):
+def _iter_blocks(filename, label):
+    """
+    Yield each record block of a data file as a list of lines.
+
+    The file is read one line at a time, so only the current block is
+    ever held in memory.
+    """
     if not os.path.exists(filename):
-        raise MissingDataFileError("Quest file not found.")
+        raise MissingDataFileError(label.capitalize() + " file not found.")
 
     try:
-        with open(filename, "r") as f:
-            lines = f.read().splitlines()
-    except:
-        raise CorruptedDataError("Could not read quest file.")
+        f = open(filename, "r")
+    except OSError:
+        raise CorruptedDataError("Could not read " + label + " file.")
+
+    with f:
+        block = []
+        try:
+            for line in f:
+                line = line.rstrip("\n")
+                if line.strip() == "":
+                    if len(block) > 0:
+                        yield block
+                        block = []
+                else:
+                    block.append(line)
+        except (OSError, UnicodeDecodeError):
+            raise CorruptedDataError("Could not read " + label + " file.")
+
+        if len(block) > 0:
+            yield block
+
+
+def block_digest(block):
+    """Content hash of one record block, as CatalogReloader compares them."""
+    return hashlib.sha1("\n".join(block).encode()).digest()
+
+
+def iter_quests(filename="data/quests.txt", compact=False, digests=None):
+    """
+    Yield each parsed and validated quest as soon as its block ends.
+    If digests is a dict, it is filled with {quest_id: block digest}.
+    """
+    for block in _iter_blocks(filename, "quest"):
+        quest = parse_quest_block(block, compact)
+        if digests is not None:
+            digests[quest["quest_id"]] = block_digest(block)
+        yield quest
+
+
+def iter_items(filename="data/items.txt", compact=False, digests=None):
+    """
+    Yield each parsed and validated item as soon as its block ends.
+    If digests is a dict, it is filled with {item_id: block digest}.
+    """
+    for block in _iter_blocks(filename, "item"):
+        item = parse_item_block(block, compact)
+        if digests is not None:
+            digests[item["item_id"]] = block_digest(block)
+        yield item
 
-    quests = {}
-    block = []
-
-    for line in lines + [""]:
-        if line.strip() == "":
-            if len(block) > 0:
-                quest = parse_quest_block(block)
-                validate_quest_data(quest)
-                quests[quest["quest_id"]] = quest
-                block = []
-        else:
-            block.append(line)
+# =====================================================================
+# LOAD QUESTS
+# =====================================================================
+
+def load_quests(filename="data/quests.txt", use_cache=False, compact=False, digests=None):
+    """
+    Load every quest into {quest_id: quest}. Pass a dict as digests to
+    also get the block digests a CatalogReloader starts from.
+    """
+    if use_cache:
+        return _load_cached(filename, "quest", partial(load_quests, compact=compact),
+                            compact, digests)
 
+    quests = {}
+    for quest in iter_quests(filename, compact, digests):
+        quests[quest["quest_id"]] = quest
     return quests
 
 # =====================================================================
 # LOAD ITEMS
 # =====================================================================
 
-def load_items(filename="data/items.txt"):
+def load_items(filename="data/items.txt", use_cache=False, compact=False, digests=None):
+    """
+    Load every item into {item_id: item}. Pass a dict as digests to also
+    get the block digests a CatalogReloader starts from.
+    """
+    if use_cache:
+        return _load_cached(filename, "item", partial(load_items, compact=compact),
+                            compact, digests)
+
+    items = {}
+    for item in iter_items(filename, compact, digests):
+        items[item["item_id"]] = item
+    return items
+
+# =====================================================================
+# CATALOG CACHE
+# =====================================================================
+
+def file_fingerprint(filename):
+    """Return the path, size, mtime and content hash of a data file."""
+    stat = os.stat(filename)
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        while True:
+            chunk = f.read(1 << 20)
+            if not chunk:
+                break
+            digest.update(chunk)
+
+    return {
+        "path": os.path.abspath(filename),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "hash": digest.hexdigest(),
+    }
+
+
+def _read_cache(cache_file, kind, fingerprint):
+    """
+    Return the cached (rows, block digests), or None if the cache is
+    missing or stale.
+    """
+    try:
+        with open(cache_file, "rb") as f:
+            # loads on the whole file: marshal.load reads a file in tiny pieces
+            payload = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        # missing, unreadable, truncated, or written by another Python
+        return None
+
+    if not isinstance(payload, dict):
+        return None
+    if payload.get("version") != CACHE_VERSION or payload.get("kind") != kind:
+        return None
+    if payload.get("fingerprint") != fingerprint:
+        return None
+
+    rows = payload.get("rows")
+    digests = payload.get("digests")
+    if not isinstance(rows, list) or not isinstance(digests, list) or len(rows) != len(digests):
+        return None
+    return rows, digests
+
+
+def _write_cache(cache_file, kind, fingerprint, records, digests):
+    # Records are stored as plain value tuples in schema order, which
+    # marshal loads quickly and which rebuild into either record form.
+    # Each row's block digest is kept alongside for CatalogReloader.
+    fields = _RECORD_CLASSES[kind].__slots__
+    payload = {
+        "version": CACHE_VERSION,
+        "kind": kind,
+        "fingerprint": fingerprint,
+        "rows": [tuple(record[name] for name in fields) for record in records.values()],
+        "digests": [digests[record_id] for record_id in records],
+    }
+    temp_file = cache_file + ".tmp"
+    try:
+        with open(temp_file, "wb") as f:
+            f.write(marshal.dumps(payload))
+        os.replace(temp_file, cache_file)
+    except OSError:
+        # A read-only data directory just means every start is a cold start.
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+
+def _load_cached(filename, kind, loader, compact, digests=None):
     if not os.path.exists(filename):
-        raise MissingDataFileError("Item file not found.")
+        raise MissingDataFileError(kind.capitalize() + " file not found.")
 
     try:
-        with open(filename, "r") as f:
-            lines = f.read().splitlines()
-    except:
-        raise CorruptedDataError("Could not read item file.")
+        fingerprint = file_fingerprint(filename)
+    except OSError:
+        raise CorruptedDataError("Could not read " + kind + " file.")
+
+    cache_file = filename + CACHE_SUFFIX
+    # Loading allocates hundreds of thousands of acyclic containers; the
+    # cycle collector would rescan them over and over for nothing.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        cached = _read_cache(cache_file, kind, fingerprint)
+        if cached is not None:
+            rows, row_digests = cached
+            records = _rebuild_catalog(rows, kind, compact)
+            if digests is not None:
+                digests.update(zip(records, row_digests))
+            return records
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    # Fingerprint first, parse second: if the file changes mid-parse the
+    # cache is written under the old hash and simply misses next time.
+    block_digests = {}
+    records = loader(filename, digests=block_digests)
+    _write_cache(cache_file, kind, fingerprint, records, block_digests)
+    if digests is not None:
+        digests.update(block_digests)
+    return records
+
+
+def clear_cache(filename):
+    """Remove the cache file for a data file, if there is one."""
+    cache_file = filename + CACHE_SUFFIX
+    if os.path.exists(cache_file):
+        os.remove(cache_file)
+        return True
+    return False
 
-    items = {}
-    block = []
-
-    for line in lines + [""]:
-        if line.strip() == "":
-            if len(block) > 0:
-                item = parse_item_block(block)
-                validate_item_data(item)
-                items[item["item_id"]] = item
-                block = []
-        else:
-            block.append(line)
+# =====================================================================
+# SHARDED CATALOGS
+# =====================================================================
 
-    return items
+def find_shards(source):
+    """Return the sorted shard files for a directory or a glob pattern."""
+    if os.path.isdir(source):
+        source = os.path.join(source, "*.txt")
+    return sorted(path for path in glob.glob(source) if os.path.isfile(path))
+
+
+def _load_shards(source, loader, label, workers, use_cache, compact):
+    paths = find_shards(source)
+    if len(paths) == 0:
+        raise MissingDataFileError("No " + label + " files found in " + source)
+
+    load_one = partial(loader, use_cache=use_cache, compact=compact)
+    merged = {}
+    owners = {}
+
+    def merge(path, shard):
+        for record_id, record in _intern_catalog(shard, label).items():
+            if record_id in merged:
+                raise InvalidDataFormatError(
+                    f"Duplicate {label} id '{record_id}' in "
+                    f"{owners[record_id]} and {path}"
+                )
+            merged[record_id] = record
+            owners[record_id] = path
+
+    if workers == 1 or len(paths) == 1:
+        for path in paths:
+            merge(path, load_one(path))
+        return merged
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(paths) // ((workers or os.cpu_count() or 1) * 4))
+        for path, shard in zip(paths, pool.map(load_one, paths, chunksize=chunksize)):
+            merge(path, shard)
+
+    return merged
+
+
+def load_quest_shards(source, workers=None, use_cache=False, compact=False):
+    """
+    Load and merge every quest shard in a directory or glob pattern.
+
+    Shards are parsed in parallel by a process pool (workers=None uses one
+    process per CPU, workers=1 parses in this process). A quest_id defined
+    in more than one shard raises InvalidDataFormatError.
+    """
+    return _load_shards(source, load_quests, "quest", workers, use_cache, compact)
+
+
+def load_item_shards(source, workers=None, use_cache=False, compact=False):
+    """Item version of load_quest_shards."""
+    return _load_shards(source, load_items, "item", workers, use_cache, compact)
+
+# =====================================================================
+# LAZY CATALOG
+# =====================================================================
+
+class LazyCatalog(Mapping):
+    """
+    Read-only mapping over a memory-mapped data file.
+
+    A single scan records where each record block starts and ends. A
+    record is only parsed the first time it is looked up, then cached, so
+    a session pays for the records it touches rather than the whole file.
+    """
+
+    def __init__(self, filename, id_key, parser, label):
+        if not os.path.exists(filename):
+            raise MissingDataFileError(label.capitalize() + " file not found.")
+
+        self.filename = filename
+        self._parser = parser
+        self._label = label
+        self._records = {}
+        self._offsets = {}
+        self._map = None
+
+        try:
+            with open(filename, "rb") as f:
+                if os.fstat(f.fileno()).st_size > 0:
+                    self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            raise CorruptedDataError("Could not read " + label + " file.")
+
+        if self._map is not None:
+            self._scan((id_key + ": ").encode())
+
+    def _scan(self, id_prefix):
+        data = self._map
+        start = None
+        record_id = None
+        pos = 0
+        size = len(data)
+
+        while pos < size:
+            end = data.find(b"\n", pos)
+            if end == -1:
+                end = size
+            line = data[pos:end]
+
+            if line.strip() == b"":
+                if start is not None:
+                    self._add_offset(record_id, start, pos)
+                    start = None
+                    record_id = None
+            else:
+                if start is None:
+                    start = pos
+                if record_id is None and line.startswith(id_prefix):
+                    record_id = intern_id(line[len(id_prefix):].rstrip(b"\r").decode())
+            pos = end + 1
+
+        if start is not None:
+            self._add_offset(record_id, start, size)
+
+    def _add_offset(self, record_id, start, end):
+        if record_id is None:
+            # Let the parser report exactly what is wrong with the block
+            self._decode(start, end)
+            raise InvalidDataFormatError("Missing " + self._label + " id.")
+        self._offsets[record_id] = (start, end)
+
+    def _decode(self, start, end):
+        try:
+            text = self._map[start:end].decode()
+        except UnicodeDecodeError:
+            raise CorruptedDataError("Could not read " + self._label + " file.")
+        return self._parser(text.splitlines())
+
+    def __getitem__(self, record_id):
+        record = self._records.get(record_id)
+        if record is None:
+            start, end = self._offsets[record_id]
+            record = self._decode(start, end)
+            self._records[record_id] = record
+        return record
+
+    def __contains__(self, record_id):
+        return record_id in self._offsets
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def loaded_count(self):
+        """Number of records decoded so far."""
+        return len(self._records)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+def load_lazy_quests(filename="data/quests.txt", compact=False):
+    return LazyCatalog(filename, "QUEST_ID",
+                       partial(parse_quest_block, compact=compact), "quest")
+
+
+def load_lazy_items(filename="data/items.txt", compact=False):
+    return LazyCatalog(filename, "ITEM_ID",
+                       partial(parse_item_block, compact=compact), "item")
 
 # =====================================================================
 # VALIDATION
@@ -97,68 +443,465 @@ def validate_item_data(i):
         if r not in i:
             raise InvalidDataFormatError("Missing item field: " + r)
 
-    if i["type"] not in ["weapon", "armor", "consumable"]:
+    if i["type"] not in ITEM_TYPES:
         raise InvalidDataFormatError("Invalid item type.")
 
     return True
 
 # =====================================================================
-# PARSE QUEST
+# IDENTIFIER POOL
 # =====================================================================
 
-def parse_quest_block(lines):
-    quest = {}
+# One shared copy of every quest and item id. Catalogs, saves and
+# inventories all intern through it, so an id string exists once no matter
+# how many characters carry it, and list membership checks hit the
+# identity fast path.
+_id_pool = {}
+
+
+def intern_id(value):
+    """Return the pooled copy of an item or quest id."""
+    return _id_pool.setdefault(value, value)
+
+
+def intern_ids(values):
+    """Intern every id in an iterable and return them as a list."""
+    pool = _id_pool
+    return [pool.setdefault(value, value) for value in values]
+
+
+def id_pool_size():
+    return len(_id_pool)
+
+
+def _intern_catalog(records, label):
+    """Re-intern ids of records that came back from a pickle or a worker."""
+    id_field = label + "_id"
+    interned = {}
+    for record in records.values():
+        record_id = intern_id(record[id_field])
+        record[id_field] = record_id
+        if "prerequisite" in record:
+            record["prerequisite"] = intern_id(record["prerequisite"])
+        interned[record_id] = record
+    return interned
+
+def _rebuild_catalog(rows, label, compact):
+    """Turn cached value tuples back into a catalog, interning ids as it goes."""
+    record_class = _RECORD_CLASSES[label]
+    fields = record_class.__slots__
+    build = record_class.from_values if compact else None
+    pool = _id_pool
+    prerequisite = fields.index("prerequisite") if "prerequisite" in fields else None
+
+    catalog = {}
+    for row in rows:
+        # The id is the first field of every schema.
+        record_id = pool.setdefault(row[0], row[0])
+        if prerequisite is not None:
+            row = list(row)
+            row[0] = record_id
+            row[prerequisite] = pool.setdefault(row[prerequisite], row[prerequisite])
+        elif record_id is not row[0]:
+            row = (record_id,) + row[1:]
+        catalog[record_id] = build(row) if build else dict(zip(fields, row))
+    return catalog
+
+# =====================================================================
+# RECORD SCHEMAS
+# =====================================================================
+
+ITEM_TYPES = ("weapon", "armor", "consumable")
+
+
+def parse_effect(value):
+    """
+    Parse an item effect into {stat: value}. An effect is "stat:value" or
+    several of them joined by commas, e.g. "strength:5,magic:3".
+    """
+    if "," not in value:
+        # the common single-stat effect
+        stat, num = value.split(":")
+        stat = stat.strip()
+        if not stat:
+            raise ValueError("Effect has no stat name")
+        return {stat: int(num)}
+
+    effect = {}
+    for part in value.split(","):
+        stat, num = part.split(":")
+        stat = stat.strip()
+        if not stat:
+            raise ValueError("Effect has no stat name")
+        effect[stat] = effect.get(stat, 0) + int(num)
+    return effect
+
+
+def _parse_item_type(value):
+    if value not in ITEM_TYPES:
+        raise InvalidDataFormatError("Invalid item type.")
+    return value
+
+
+# Source key -> (field name, converter). A converter of None keeps the raw
+# string. Every field in a schema is required.
+QUEST_SCHEMA = {
+    "QUEST_ID": ("quest_id", intern_id),
+    "TITLE": ("title", None),
+    "DESCRIPTION": ("description", None),
+    "REWARD_XP": ("reward_xp", int),
+    "REWARD_GOLD": ("reward_gold", int),
+    "REQUIRED_LEVEL": ("required_level", int),
+    "PREREQUISITE": ("prerequisite", intern_id),
+}
+
+ITEM_SCHEMA = {
+    "ITEM_ID": ("item_id", intern_id),
+    "NAME": ("name", None),
+    "TYPE": ("type", _parse_item_type),
+    "EFFECT": ("effect", parse_effect),
+    "COST": ("cost", int),
+    "DESCRIPTION": ("description", None),
+}
+
+
+def parse_record(lines, schema, label):
+    """
+    Parse one block of "KEY: value" lines against a schema.
+
+    Keys are dispatched through the schema dict, values are converted and
+    required fields are checked in the same pass, so the result needs no
+    separate validation. Unknown keys are ignored.
+    """
+    record = {}
+    get = schema.get
+    pool = _id_pool
 
     for line in lines:
-        if ": " not in line:
-            raise InvalidDataFormatError("Bad quest line format.")
-        key, value = line.split(": ", 1)
-
-        if key == "QUEST_ID":
-            quest["quest_id"] = value
-        elif key == "TITLE":
-            quest["title"] = value
-        elif key == "DESCRIPTION":
-            quest["description"] = value
-        elif key == "REWARD_XP":
-            quest["reward_xp"] = int(value)
-        elif key == "REWARD_GOLD":
-            quest["reward_gold"] = int(value)
-        elif key == "REQUIRED_LEVEL":
-            quest["required_level"] = int(value)
-        elif key == "PREREQUISITE":
-            quest["prerequisite"] = value
+        key, sep, value = line.partition(": ")
+        if not sep:
+            raise InvalidDataFormatError("Bad " + label + " line format.")
+
+        field = get(key)
+        if field is None:
+            continue
+
+        name, convert = field
+        if convert is None:
+            record[name] = value
+        elif convert is intern_id:
+            # intern_id inlined: this runs once per record
+            record[name] = pool.setdefault(value, value)
+        else:
+            try:
+                record[name] = convert(value)
+            except ValueError:
+                raise InvalidDataFormatError(f"Invalid {label} {name}: {value}")
+
+    if len(record) != len(schema):
+        for name, _ in schema.values():
+            if name not in record:
+                raise InvalidDataFormatError("Missing " + label + " field: " + name)
+
+    return record
+
+# =====================================================================
+# PARSE QUEST
+# =====================================================================
 
+def parse_quest_block(lines, compact=False):
+    quest = parse_record(lines, QUEST_SCHEMA, "quest")
+    if compact:
+        return Quest(**quest)
     return quest
 
 # =====================================================================
 # PARSE ITEM
 # =====================================================================
 
-def parse_item_block(lines):
-    item = {}
+def parse_item_block(lines, compact=False):
+    item = parse_record(lines, ITEM_SCHEMA, "item")
+    if compact:
+        return Item(**item)
+    return item
 
-    for line in lines:
-        if ": " not in line:
-            raise InvalidDataFormatError("Bad item line format.")
-        key, value = line.split(": ", 1)
-
-        if key == "ITEM_ID":
-            item["item_id"] = value
-        elif key == "NAME":
-            item["name"] = value
-        elif key == "TYPE":
-            item["type"] = value
-        elif key == "EFFECT":
-            # example: "strength:5"
-            stat, num = value.split(":")
-            item["effect"] = {stat: int(num)}
-        elif key == "COST":
-            item["cost"] = int(value)
-        elif key == "DESCRIPTION":
-            item["description"] = value
+# =====================================================================
+# COMPACT RECORDS
+# =====================================================================
 
-    return item
+class Record(Mapping):
+    """
+    Base for slotted catalog records.
+
+    Records keep their fields in __slots__ instead of a per-record dict,
+    which is several times smaller, but still read like the dicts the rest
+    of the game expects: record["cost"], record.get("name"), "type" in
+    record, dict(record) and == against a dict all work.
+    """
+
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.from_values = classmethod(_values_constructor(cls.__slots__))
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields[name])
+
+    def __reduce__(self):
+        # Pickle as (class, field values) rather than the generic slot-state
+        # dict, which is several times slower to load.
+        return (_rebuild_record, (type(self), self.astuple()))
+
+    def astuple(self):
+        """Field values in __slots__ order."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def to_dict(self):
+        return dict(self)
+
+
+def _values_constructor(fields):
+    """
+    Build from_values(cls, values) for a record class: one tuple-unpacking
+    assignment into the slots, generated once per class (the way
+    dataclasses builds __init__), since a setattr loop costs twice as much.
+    """
+    targets = "".join("self." + name + ", " for name in fields)
+    source = ("def from_values(cls, values):\n"
+              "    self = new(cls)\n"
+              f"    ({targets}) = values\n"
+              "    return self\n")
+    namespace = {"new": object.__new__}
+    exec(source, namespace)
+    return namespace["from_values"]
+
+
+def _rebuild_record(cls, values):
+    return cls.from_values(values)
+
+
+class Quest(Record):
+    __slots__ = tuple(name for name, _ in QUEST_SCHEMA.values())
+
+
+class Item(Record):
+    __slots__ = tuple(name for name, _ in ITEM_SCHEMA.values())
+
+
+_RECORD_CLASSES = {"quest": Quest, "item": Item}
+
+# =====================================================================
+# ITEM INDEX
+# =====================================================================
+
+class ItemIndex:
+    """
+    Secondary indexes over a loaded item catalog for shop queries.
+
+    Items are kept sorted by cost (overall and per type), so price-range
+    questions like "weapons I can afford" are answered with bisect instead
+    of a scan. Build it once after loading and again after a reload.
+    """
+
+    def __init__(self, items):
+        self.items = items
+        ranked = sorted(items.values(), key=lambda item: (item["cost"], item["item_id"]))
+
+        self._costs = [item["cost"] for item in ranked]
+        self._ids = [item["item_id"] for item in ranked]
+        self._type_costs = {item_type: [] for item_type in ITEM_TYPES}
+        self._type_ids = {item_type: [] for item_type in ITEM_TYPES}
+        for item in ranked:
+            self._type_costs[item["type"]].append(item["cost"])
+            self._type_ids[item["type"]].append(item["item_id"])
+
+        # (stat, item_type) -> costs and running best item, built on first use
+        self._best = {}
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _columns(self, item_type):
+        if item_type is None:
+            return self._costs, self._ids
+        if item_type not in self._type_ids:
+            raise InvalidDataFormatError("Invalid item type.")
+        return self._type_costs[item_type], self._type_ids[item_type]
+
+    def ids_by_type(self, item_type):
+        """Item ids of one type, cheapest first."""
+        return list(self._columns(item_type)[1])
+
+    def in_cost_range(self, min_cost, max_cost, item_type=None):
+        """Items costing min_cost..max_cost (inclusive), cheapest first."""
+        costs, ids = self._columns(item_type)
+        lo = bisect_left(costs, min_cost)
+        hi = bisect_right(costs, max_cost)
+        return [self.items[item_id] for item_id in ids[lo:hi]]
+
+    def affordable(self, gold, item_type=None):
+        return self.in_cost_range(0, gold, item_type)
+
+    def best_value(self, stat, gold=None, item_type=None):
+        """
+        The item with the most effect on `stat` per gold, optionally limited
+        to items costing at most `gold`. Returns None if nothing qualifies.
+        """
+        key = (stat, item_type)
+        if key not in self._best:
+            self._best[key] = self._build_best(stat, item_type)
+        costs, best_ids = self._best[key]
+
+        if gold is None:
+            count = len(costs)
+        else:
+            count = bisect_right(costs, gold)
+        if count == 0:
+            return None
+        return self.items[best_ids[count - 1]]
+
+    def _build_best(self, stat, item_type):
+        # Walk items cheapest first keeping the best ratio seen so far; the
+        # answer for a budget is then the entry at the last affordable cost.
+        costs = []
+        best_ids = []
+        best_id = None
+        best_ratio = 0
+        for cost, item_id in zip(*self._columns(item_type)):
+            amount = self.items[item_id]["effect"].get(stat, 0)
+            if amount > 0:
+                ratio = amount / cost if cost > 0 else float("inf")
+                if ratio > best_ratio:
+                    best_ratio = ratio
+                    best_id = item_id
+            if best_id is not None:
+                costs.append(cost)
+                best_ids.append(best_id)
+        return costs, best_ids
+
+
+def build_item_index(items):
+    return ItemIndex(items)
+
+# =====================================================================
+# HOT RELOAD
+# =====================================================================
+
+def _block_id(lines, id_key):
+    prefix = id_key + ": "
+    for line in lines:
+        if line.startswith(prefix):
+            return line[len(prefix):]
+    return None
+
+
+class CatalogReloader:
+    """
+    Keeps a loaded catalog dict in sync with its data file.
+
+    check() is cheap when nothing changed (one stat call). When the file
+    did change, every block is hashed but only blocks whose hash differs
+    are parsed, and the adds, updates and deletes are applied to the live
+    catalog in place.
+
+    Pass the digests filled in by load_quests/load_items (digests=...)
+    so the reloader starts without reading the file; without them it
+    hashes every block once up front.
+    """
+
+    RECORD_TYPES = {
+        "quest": ("QUEST_ID", parse_quest_block),
+        "item": ("ITEM_ID", parse_item_block),
+    }
+
+    def __init__(self, filename, catalog, kind, compact=False, digests=None):
+        if kind not in self.RECORD_TYPES:
+            raise ValueError("Unknown catalog kind: " + kind)
+
+        self.filename = filename
+        self.catalog = catalog
+        self.kind = kind
+        self._id_key, parser = self.RECORD_TYPES[kind]
+        self._parser = partial(parser, compact=compact)
+        self._stamp = self._file_stamp()
+        if digests is None:
+            digests = {record_id: digest for record_id, digest, _ in self._scan()}
+        self._hashes = digests
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            raise MissingDataFileError(self.kind.capitalize() + " file not found.")
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def _scan(self):
+        for block in _iter_blocks(self.filename, self.kind):
+            record_id = _block_id(block, self._id_key)
+            if record_id is None:
+                raise InvalidDataFormatError("Missing " + self.kind + " id.")
+            record_id = intern_id(record_id)
+            digest = block_digest(block)
+            yield record_id, digest, block
+
+    def check(self):
+        """
+        Apply any edits to the live catalog.
+
+        Returns None if the file is unchanged, otherwise a change-set dict
+        with "added", "updated" and "removed" id lists. A bad block raises
+        before anything is applied, leaving the catalog untouched.
+        """
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return None
+        # Remember the stamp even if a block turns out bad, so a broken edit
+        # is reported once rather than on every check.
+        self._stamp = stamp
+
+        hashes = {}
+        changed = {}
+        for record_id, digest, block in self._scan():
+            hashes[record_id] = digest
+            if self._hashes.get(record_id) != digest:
+                changed[record_id] = self._parser(block)
+
+        changes = {"added": [], "updated": [], "removed": []}
+        for record_id, record in changed.items():
+            if record_id in self._hashes:
+                changes["updated"].append(record_id)
+            else:
+                changes["added"].append(record_id)
+            self.catalog[record_id] = record
+
+        for record_id in self._hashes:
+            if record_id not in hashes:
+                changes["removed"].append(record_id)
+                self.catalog.pop(record_id, None)
+
+        self._hashes = hashes
+        return changes
 
 # ============================================================================
 # TESTING
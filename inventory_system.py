@@ -15,10 +15,104 @@ from custom_exceptions import (
     InsufficientResourcesError,
     InvalidItemTypeError
 )
+from itertools import chain, repeat
+from game_data import intern_id, parse_effect
 
 # Maximum inventory size
 MAX_INVENTORY_SIZE = 20
 
+# ============================================================================
+# INVENTORY CONTAINER
+# ============================================================================
+
+class Inventory:
+    """
+    A multiset of item ids with the list operations the game uses.
+
+    Each distinct id keeps a count, so `in`, count(), remove() and
+    append() are O(1) whatever the inventory size. Iteration yields every
+    copy, grouped by id in the order each id was first added. Equality
+    with a list ignores order. Size limits stay with the functions below
+    (MAX_INVENTORY_SIZE), so the same type also serves bank and guild
+    storage.
+    """
+
+    __slots__ = ("_counts", "_size")
+
+    def __init__(self, items=()):
+        self._counts = {}
+        self._size = 0
+        self.extend(items)
+
+    def append(self, item_id):
+        self._counts[item_id] = self._counts.get(item_id, 0) + 1
+        self._size += 1
+
+    def add(self, item_id, quantity=1):
+        if quantity < 0:
+            raise ValueError("Quantity cannot be negative")
+        if quantity:
+            self._counts[item_id] = self._counts.get(item_id, 0) + quantity
+            self._size += quantity
+
+    def extend(self, items):
+        if isinstance(items, Inventory):
+            for item_id, quantity in items._counts.items():
+                self.add(item_id, quantity)
+        else:
+            for item_id in items:
+                self.append(item_id)
+
+    def remove(self, item_id, quantity=1):
+        """Remove copies of an item; ValueError (like list.remove) if too few."""
+        held = self._counts.get(item_id, 0)
+        if held < quantity or quantity < 1:
+            raise ValueError(f"{item_id!r} not in inventory")
+        if held == quantity:
+            del self._counts[item_id]
+        else:
+            self._counts[item_id] = held - quantity
+        self._size -= quantity
+
+    def count(self, item_id):
+        return self._counts.get(item_id, 0)
+
+    def counts(self):
+        """Return {item_id: quantity} in first-added order."""
+        return dict(self._counts)
+
+    def clear(self):
+        self._counts.clear()
+        self._size = 0
+
+    def copy(self):
+        return Inventory(self)
+
+    def __contains__(self, item_id):
+        return item_id in self._counts
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return chain.from_iterable(repeat(item_id, quantity)
+                                   for item_id, quantity in self._counts.items())
+
+    def __getitem__(self, index):
+        return list(self)[index]
+
+    def __eq__(self, other):
+        if isinstance(other, Inventory):
+            return self._counts == other._counts
+        if isinstance(other, (list, tuple)):
+            return self._size == len(other) and self._counts == Inventory(other)._counts
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Inventory({list(self)!r})"
+
 # ============================================================================
 # INVENTORY MANAGEMENT
 # ============================================================================
@@ -32,7 +126,7 @@ def add_item_to_inventory(character, item_id):
     if len(character["inventory"]) >= MAX_INVENTORY_SIZE:
         raise InventoryFullError("Inventory is full")
 
-    character["inventory"].append(item_id)
+    character["inventory"].append(intern_id(item_id))
     return True
 
 def remove_item_from_inventory(character, item_id):
@@ -56,6 +150,148 @@ def clear_inventory(character):
     character["inventory"].clear()
     return removed
 
+# ============================================================================
+# ITEM EFFECTS
+# ============================================================================
+
+# Stats each item type may change. Anything else in an effect is ignored.
+EFFECT_STATS = {
+    "consumable": ("health", "max_health", "strength", "magic"),
+    "weapon": ("strength", "magic"),
+    "armor": ("max_health", "magic"),
+}
+
+
+class ItemEffect:
+    """
+    An item's effect compiled once into (stat, amount) pairs for its type.
+
+    use_item calls apply() and equip_* install the pairs as a modifier, so
+    neither the effect string nor the catalog record is looked at again.
+    """
+
+    __slots__ = ("item_id", "item_type", "deltas")
+
+    def __init__(self, item_id, item_type, effect):
+        if isinstance(effect, str):
+            effect = parse_effect(effect) if ":" in effect else {}
+        allowed = EFFECT_STATS.get(item_type, ())
+        self.item_id = item_id
+        self.item_type = item_type
+        self.deltas = tuple((stat, int(amount)) for stat, amount in effect.items()
+                            if stat in allowed)
+
+    @classmethod
+    def from_item(cls, item, item_id=None):
+        return cls(item_id or item.get("item_id"), item.get("type"), item.get("effect", ""))
+
+    def apply(self, character):
+        for stat, amount in self.deltas:
+            if stat == "health":
+                character["health"] = min(character.get("max_health", 0),
+                                          character.get("health", 0) + amount)
+            else:
+                character[stat] = character.get(stat, 0) + amount
+
+    def __repr__(self):
+        return f"ItemEffect({self.item_id!r}, {self.item_type!r}, {dict(self.deltas)!r})"
+
+
+class ItemEffects(dict):
+    """
+    {item_id: ItemEffect} for a whole catalog, built when the catalog
+    loads. With eager=False (lazy catalogs) each effect is compiled on its
+    first lookup instead.
+    """
+
+    def __init__(self, items, eager=True):
+        super().__init__()
+        self.items = items
+        if eager:
+            for item_id, item in items.items():
+                self[item_id] = ItemEffect.from_item(item, item_id)
+
+    def __missing__(self, item_id):
+        try:
+            item = self.items[item_id]
+        except KeyError:
+            raise ItemNotFoundError(f"Unknown item: {item_id}")
+        effect = self[item_id] = ItemEffect.from_item(item, item_id)
+        return effect
+
+
+def compile_item_effects(items, eager=True):
+    return ItemEffects(items, eager)
+
+
+def _item_effect(item_id, item_data):
+    """
+    Resolve item_data to the item's ItemEffect. It may be the ItemEffect,
+    an ItemEffects table, the item's own record, or a catalog of records.
+    """
+    if isinstance(item_data, ItemEffect):
+        return item_data
+    if isinstance(item_data, ItemEffects):
+        return item_data[item_id]
+    if "type" in item_data:
+        return ItemEffect.from_item(item_data, item_id)
+    if item_id not in item_data:
+        raise ItemNotFoundError(f"Unknown item: {item_id}")
+    return ItemEffect.from_item(item_data[item_id], item_id)
+
+# ============================================================================
+# STAT MODIFIERS
+# ============================================================================
+
+# Equipment and buffs change stats through named modifiers, kept in
+# character["modifiers"] as {source: {stat: amount}}. The character's
+# stat fields hold the effective values (base plus every modifier), so
+# readers such as combat use them as-is; they are only adjusted when a
+# modifier is added or removed. get_base_stats recovers the base values.
+# Saves keep the modifiers and equipped ids with the effective stats
+# (character_manager.EQUIPMENT_FIELDS).
+MODIFIABLE_STATS = ("max_health", "strength", "magic")
+
+
+def add_modifier(character, source, effect):
+    """
+    Apply {stat: amount} (or (stat, amount) pairs) as the modifier for
+    source, replacing whatever that source applied before.
+    """
+    remove_modifier(character, source)
+    deltas = {stat: amount for stat, amount in dict(effect).items()
+              if stat in MODIFIABLE_STATS and amount}
+    if not deltas:
+        return False
+
+    for stat, amount in deltas.items():
+        character[stat] = character.get(stat, 0) + amount
+    character.setdefault("modifiers", {})[source] = deltas
+    return True
+
+
+def remove_modifier(character, source):
+    """Undo the modifier for source; returns False if there was none."""
+    modifiers = character.get("modifiers")
+    if not modifiers or source not in modifiers:
+        return False
+
+    deltas = modifiers.pop(source)
+    for stat, amount in deltas.items():
+        character[stat] = character.get(stat, 0) - amount
+    if "max_health" in deltas and "health" in character:
+        character["health"] = min(character["health"], character["max_health"])
+    return True
+
+
+def get_base_stats(character):
+    """Return the modifiable stats without any modifiers applied."""
+    base = {stat: character.get(stat, 0) for stat in MODIFIABLE_STATS}
+    for deltas in character.get("modifiers", {}).values():
+        for stat, amount in deltas.items():
+            base[stat] -= amount
+    return base
+
 # ============================================================================
 # ITEM USAGE
 # ============================================================================
@@ -64,26 +300,13 @@ def use_item(character, item_id, item_data):
     if item_id not in character.get("inventory", []):
         raise ItemNotFoundError("Item not found")
 
-    # item_data is the data for the specific item
-    item = item_data
+    effect = _item_effect(item_id, item_data)
 
     # only consumables can be used
-    if item.get("type") != "consumable":
+    if effect.item_type != "consumable":
         raise InvalidItemTypeError("Item is not consumable")
 
-    # parse effect like "health:20" or "strength:3"
-    eff = item.get("effect", "")
-    if ":" in eff:
-        stat, val = eff.split(":", 1)
-        val = int(val)
-        if stat == "health":
-            character["health"] = min(character.get("max_health", 0), character.get("health", 0) + val)
-        elif stat == "max_health":
-            character["max_health"] = character.get("max_health", 0) + val
-        elif stat == "strength":
-            character["strength"] = character.get("strength", 0) + val
-        elif stat == "magic":
-            character["magic"] = character.get("magic", 0) + val
+    effect.apply(character)
 
     # remove consumable from inventory
     character["inventory"].remove(item_id)
@@ -96,25 +319,16 @@ def equip_weapon(character, item_id, item_data):
     if item_id not in inv:
         raise ItemNotFoundError("Weapon not in inventory")
 
-    item = item_data  # item_data is the item's info
-    if item.get("type") != "weapon":
+    effect = _item_effect(item_id, item_data)
+    if effect.item_type != "weapon":
         raise InvalidItemTypeError("Item is not a weapon")
 
-    # Unequip old weapon if present
+    # Unequip old weapon if present; its bonus is replaced below
     old = character.get("equipped_weapon")
     if old:
         inv.append(old)
-        # NOTE: if you gave stat bonus for old, you'd remove it here
-
-    # Apply weapon effect e.g., "strength:5"
-    eff = item.get("effect", "")
-    if ":" in eff:
-        stat, val = eff.split(":", 1)
-        val = int(val)
-        if stat == "strength":
-            character["strength"] = character.get("strength", 0) + val
-        elif stat == "magic":
-            character["magic"] = character.get("magic", 0) + val
+
+    add_modifier(character, "weapon", effect.deltas)
 
     character["equipped_weapon"] = item_id
     inv.remove(item_id)
@@ -126,25 +340,15 @@ def equip_armor(character, item_id, item_data):
     if item_id not in inv:
         raise ItemNotFoundError("Armor not in inventory")
 
-    item = item_data
-    if item.get("type") != "armor":
+    effect = _item_effect(item_id, item_data)
+    if effect.item_type != "armor":
         raise InvalidItemTypeError("Item is not armor")
 
     old = character.get("equipped_armor")
     if old:
         inv.append(old)
-        # remove old bonuses here if your system tracked them
-
-    eff = item.get("effect", "")
-    if ":" in eff:
-        stat, val = eff.split(":", 1)
-        val = int(val)
-        if stat == "max_health":
-            character["max_health"] = character.get("max_health", 0) + val
-            # ensure current health not above new max (or you can leave it)
-            character["health"] = min(character.get("health", 0), character["max_health"])
-        elif stat == "magic":
-            character["magic"] = character.get("magic", 0) + val
+
+    add_modifier(character, "armor", effect.deltas)
 
     character["equipped_armor"] = item_id
     inv.remove(item_id)
@@ -167,7 +371,7 @@ def purchase_item(character, item_id, item_data):
         raise InventoryFullError("Inventory is full")
 
     character["gold"] = character.get("gold", 0) - cost
-    character.setdefault("inventory", []).append(item_id)
+    character.setdefault("inventory", []).append(intern_id(item_id))
     return True
 
 
@@ -185,6 +389,113 @@ def sell_item(character, item_id, item_data):
 
 
 
+# ============================================================================
+# BATCH SHOP TRANSACTIONS
+# ============================================================================
+
+def _order_quantities(order):
+    """
+    Normalize an order to {item_id: quantity}. An order is a mapping of
+    id -> quantity, or an iterable of ids and/or (id, quantity) pairs.
+    """
+    pairs = order.items() if hasattr(order, "items") else order
+    quantities = {}
+    for entry in pairs:
+        item_id, quantity = (entry, 1) if isinstance(entry, str) else entry
+        if not isinstance(quantity, int) or quantity < 1:
+            raise ValueError(f"Invalid quantity for {item_id}: {quantity!r}")
+        item_id = intern_id(item_id)
+        quantities[item_id] = quantities.get(item_id, 0) + quantity
+    return quantities
+
+
+def _price_order(quantities, catalog, divisor=1):
+    total = 0
+    for item_id, quantity in quantities.items():
+        if item_id not in catalog:
+            raise ItemNotFoundError(f"Unknown item: {item_id}")
+        total += int(catalog[item_id].get("cost", 0)) // divisor * quantity
+    return total
+
+
+def _add_items(inv, item_id, quantity):
+    if isinstance(inv, Inventory):
+        inv.add(item_id, quantity)
+    else:
+        inv.extend([item_id] * quantity)
+
+
+def _remove_items(inv, item_id, quantity):
+    if isinstance(inv, Inventory):
+        inv.remove(item_id, quantity)
+    else:
+        for _ in range(quantity):
+            inv.remove(item_id)
+
+
+def _apply_order(character, inv, quantities, gold_change, add):
+    """Move items and gold together; on any failure undo what was done."""
+    gold = character.get("gold", 0)
+    done = []
+    try:
+        for item_id, quantity in quantities.items():
+            if add:
+                _add_items(inv, item_id, quantity)
+            else:
+                _remove_items(inv, item_id, quantity)
+            done.append((item_id, quantity))
+        character["gold"] = gold + gold_change
+    except BaseException:
+        for item_id, quantity in done:
+            if add:
+                _remove_items(inv, item_id, quantity)
+            else:
+                _add_items(inv, item_id, quantity)
+        character["gold"] = gold
+        raise
+
+
+def purchase_items(character, order, catalog):
+    """
+    Buy a whole basket at once, or nothing.
+
+    The order is checked in one pass against the catalog, then gold and
+    inventory space are checked once for the total. Returns the gold spent.
+    Raises ItemNotFoundError, InsufficientResourcesError, InventoryFullError
+    or ValueError (bad quantity) without changing the character.
+    """
+    quantities = _order_quantities(order)
+    total_cost = _price_order(quantities, catalog)
+    inv = character.setdefault("inventory", [])
+
+    if character.get("gold", 0) < total_cost:
+        raise InsufficientResourcesError("Not enough gold")
+    if len(inv) + sum(quantities.values()) > MAX_INVENTORY_SIZE:
+        raise InventoryFullError("Inventory is full")
+
+    _apply_order(character, inv, quantities, -total_cost, add=True)
+    return total_cost
+
+
+def sell_items(character, order, catalog):
+    """
+    Sell a whole basket at half cost each, or nothing.
+
+    Returns the gold received. Raises ItemNotFoundError if any item is
+    unknown or not held in the ordered quantity, or ValueError for a bad
+    quantity, without changing the character.
+    """
+    quantities = _order_quantities(order)
+    total_price = _price_order(quantities, catalog, divisor=2)
+    inv = character.setdefault("inventory", [])
+
+    for item_id, quantity in quantities.items():
+        if inv.count(item_id) < quantity:
+            raise ItemNotFoundError(f"Not enough {item_id} in inventory")
+
+    _apply_order(character, inv, quantities, total_price, add=False)
+    return total_price
+
 # ============================================================================
 # TESTING
 # ============================================================================
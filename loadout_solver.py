@@ -0,0 +1,189 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Loadout Solver Module
+
+Answers "what is the best gear I can buy with N gold?": at most one
+weapon, at most one armor and any number of consumables, within a gold
+budget and the free inventory slots (every bought item takes a slot).
+
+Each item is scored as the weighted sum of the stats its effect changes
+(inventory_system.EFFECT_STATS). Consumables are a knapsack over (slots,
+gold) solved by dynamic programming; weapon and armor are tried pairwise
+on top of it. Before solving, items another item beats on both cost and
+value are pruned, and gold is counted in units of the gcd of the
+remaining costs. The consumable table is kept and only grown, so repeated
+budgets are answered from it.
+"""
+
+from functools import lru_cache
+from math import gcd
+
+import inventory_system
+from inventory_system import ItemEffect, MAX_INVENTORY_SIZE
+
+# Default value of one point of each stat
+DEFAULT_WEIGHTS = {
+    "strength": 3.0,
+    "magic": 3.0,
+    "max_health": 1.0,
+    "health": 0.5,
+}
+
+
+def item_value(item, weights=None, item_id=None):
+    """Weighted stat value of an item for its type."""
+    weights = weights or DEFAULT_WEIGHTS
+    effect = ItemEffect.from_item(item, item_id)
+    return sum(weights.get(stat, 0) * amount for stat, amount in effect.deltas)
+
+
+def pareto_front(candidates):
+    """
+    Drop dominated (cost, value, item_id) candidates: keep, in cost order,
+    only those worth more than everything cheaper or equally priced.
+    """
+    front = []
+    best = 0
+    for cost, value, item_id in sorted(candidates, key=lambda c: (c[0], -c[1], c[2])):
+        if value > best:
+            front.append((cost, value, item_id))
+            best = value
+    return front
+
+
+class LoadoutSolver:
+    """
+    Best purchases from one item catalog for a given stat weighting.
+
+    Build it once per catalog (rebuild after a catalog reload) and call
+    solve(gold, slots) as often as needed.
+    """
+
+    def __init__(self, items, weights=None):
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        by_type = {item_type: [] for item_type in inventory_system.EFFECT_STATS}
+        for item_id, item in items.items():
+            item_type = item.get("type")
+            if item_type in by_type:
+                cost = int(item.get("cost", 0))
+                by_type[item_type].append((cost, item_value(item, self.weights, item_id), item_id))
+
+        self.weapons = pareto_front(by_type["weapon"])
+        self.armors = pareto_front(by_type["armor"])
+        self.consumables = pareto_front(by_type["consumable"])
+
+        costs = [cost for group in (self.weapons, self.armors, self.consumables)
+                 for cost, _, _ in group]
+        self.unit = 0
+        for cost in costs:
+            self.unit = gcd(self.unit, cost)
+        self.unit = self.unit or 1
+
+        # best[s][g]: best consumable value with at most s items and g gold
+        # units; pick[s][g]: index of the consumable added at layer s, or -1
+        self._costs = {item_id: cost for group in (self.weapons, self.armors, self.consumables)
+                       for cost, _, item_id in group}
+        self._best = [[0.0]]
+        self._pick = [[-1]]
+        self._solved = lru_cache(maxsize=1024)(self._solve)
+
+    # ---- consumable table ----------------------------------------------
+
+    def _grow(self, slots, units):
+        """Extend the consumable table to cover slots x units."""
+        have_slots = len(self._best) - 1
+        have_units = len(self._best[0]) - 1
+        if slots <= have_slots and units <= have_units:
+            return
+        slots = max(slots, have_slots)
+        units = max(units, have_units)
+
+        best = [[0.0] * (units + 1)]
+        pick = [[-1] * (units + 1)]
+        items = [(cost // self.unit, value) for cost, value, _ in self.consumables]
+        for _ in range(slots):
+            prev = best[-1]
+            row = prev[:]
+            row_pick = [-1] * (units + 1)
+            for index, (cost, value) in enumerate(items):
+                for g in range(cost, units + 1):
+                    candidate = prev[g - cost] + value
+                    if candidate > row[g]:
+                        row[g] = candidate
+                        row_pick[g] = index
+            best.append(row)
+            pick.append(row_pick)
+        self._best = best
+        self._pick = pick
+
+    def _consumables_for(self, slots, units):
+        counts = {}
+        while slots > 0:
+            index = self._pick[slots][units]
+            if index >= 0:
+                cost, _, item_id = self.consumables[index]
+                counts[item_id] = counts.get(item_id, 0) + 1
+                units -= cost // self.unit
+            slots -= 1
+        return counts
+
+    # ---- solving ---------------------------------------------------------
+
+    def solve(self, gold, slots=MAX_INVENTORY_SIZE):
+        """
+        Best purchase for a budget: {"weapon", "armor", "consumables"
+        ({id: count}), "order" ({id: count} for purchase_items), "cost",
+        "value", "slots"}. Repeated budgets come from a cache.
+        """
+        gold = max(0, int(gold))
+        slots = max(0, min(int(slots), MAX_INVENTORY_SIZE))
+        result = dict(self._solved(gold, slots))
+        result["consumables"] = dict(result["consumables"])
+        result["order"] = dict(result["order"])
+        return result
+
+    def _solve(self, gold, slots):
+        units = gold // self.unit
+        self._grow(slots, units)
+
+        best = None
+        for weapon in [None] + self.weapons:
+            for armor in [None] + self.armors:
+                gear = [g for g in (weapon, armor) if g is not None]
+                gear_units = sum(cost for cost, _, _ in gear) // self.unit
+                gear_slots = len(gear)
+                if gear_units > units or gear_slots > slots:
+                    continue
+                value = (sum(value for _, value, _ in gear)
+                         + self._best[slots - gear_slots][units - gear_units])
+                if best is None or value > best[0]:
+                    best = (value, weapon, armor, gear_slots, gear_units)
+
+        value, weapon, armor, gear_slots, gear_units = best
+        consumables = self._consumables_for(slots - gear_slots, units - gear_units)
+
+        order = dict(consumables)
+        for gear in (weapon, armor):
+            if gear is not None:
+                order[gear[2]] = order.get(gear[2], 0) + 1
+        return {
+            "weapon": weapon[2] if weapon else None,
+            "armor": armor[2] if armor else None,
+            "consumables": consumables,
+            "order": order,
+            "cost": sum(self._costs[item_id] * n for item_id, n in order.items()),
+            "value": value,
+            "slots": sum(order.values()),
+        }
+
+
+def solve_loadout(character, items, weights=None, solver=None):
+    """
+    Best purchases for a character's gold and free inventory slots.
+
+    The result's "order" can be passed straight to
+    inventory_system.purchase_items.
+    """
+    solver = solver or LoadoutSolver(items, weights)
+    return solver.solve(character.get("gold", 0),
+                        inventory_system.get_inventory_space_remaining(character))
@@ -18,6 +18,7 @@ import inventory_system
 import quest_handler
 import combat_system
 import game_data
+import loadout_solver
 from custom_exceptions import *   # project used this pattern elsewhere
 
 # ---------------------------
@@ -26,8 +27,20 @@ from custom_exceptions import *   # project used this pattern elsewhere
 current_character = None
 all_quests = {}
 all_items = {}
+item_index = None
+item_effects = {}
+loadout = None
+quest_index = None
+data_reloaders = []
 game_running = False
 
+# Set to True to memory-map the data files and decode records on first use
+# instead of parsing every quest and item at startup.
+USE_LAZY_CATALOGS = False
+
+# Saves listed per page in the load menu
+LOAD_PAGE_SIZE = 10
+
 # ---------------------------
 # Helpers for safe calls
 # ---------------------------
@@ -37,10 +50,32 @@ def safe_load_data():
     Try to load quests and items. If files missing or invalid,
     return False so caller can decide what to do.
     """
-    global all_quests, all_items
+    global all_quests, all_items, item_index, item_effects, loadout, quest_index, data_reloaders
+    loadout = None
     try:
-        all_quests = game_data.load_quests()
-        all_items = game_data.load_items()
+        if USE_LAZY_CATALOGS:
+            all_quests = game_data.load_lazy_quests(compact=True)
+            all_items = game_data.load_lazy_items(compact=True)
+            item_effects = inventory_system.compile_item_effects(all_items, eager=False)
+            # Indexing would decode every record, which defeats lazy loading
+            item_index = None
+            quest_index = None
+            data_reloaders = []
+        else:
+            # The block digests let the reloaders start without rereading the files
+            quest_digests = {}
+            item_digests = {}
+            all_quests = game_data.load_quests(use_cache=True, compact=True, digests=quest_digests)
+            all_items = game_data.load_items(use_cache=True, compact=True, digests=item_digests)
+            data_reloaders = [
+                game_data.CatalogReloader("data/quests.txt", all_quests, "quest",
+                                          compact=True, digests=quest_digests),
+                game_data.CatalogReloader("data/items.txt", all_items, "item",
+                                          compact=True, digests=item_digests),
+            ]
+            item_index = game_data.build_item_index(all_items)
+            item_effects = inventory_system.compile_item_effects(all_items)
+            quest_index = quest_handler.build_quest_level_index(all_quests)
         return True
     except (MissingDataFileError, InvalidDataFormatError, CorruptedDataError) as e:
         print("Data load error:", e)
@@ -50,6 +85,33 @@ def safe_load_data():
         print("Unexpected data error:", e)
         return False
 
+def reload_game_data():
+    """
+    Pick up edits to the data files without restarting.
+    Only changed quest/item blocks are re-parsed; the catalogs are
+    updated in place. Returns True if anything changed.
+    """
+    global item_index, item_effects, loadout, quest_index
+    changed = False
+    for reloader in data_reloaders:
+        try:
+            changes = reloader.check()
+        except (MissingDataFileError, InvalidDataFormatError, CorruptedDataError) as e:
+            print("Data reload skipped:", e)
+            continue
+        if changes:
+            changed = True
+            print(f"Reloaded {reloader.kind}s: {len(changes['added'])} added, "
+                  f"{len(changes['updated'])} updated, {len(changes['removed'])} removed")
+            if reloader.kind == "item":
+                item_effects = inventory_system.compile_item_effects(all_items)
+                loadout = None
+                if item_index is not None:
+                    item_index = game_data.build_item_index(all_items)
+            if reloader.kind == "quest":
+                quest_index = quest_handler.build_quest_level_index(all_quests)
+    return changed
+
 # ---------------------------
 # Main menu and new/load
 # ---------------------------
@@ -91,43 +153,55 @@ def new_game():
     # Enter game loop
     game_loop()
 
-def load_game():
-    """List saved characters and let user load one."""
-    global current_character
-    print("\n--- Load Game ---")
-    # Some character_manager versions have list_saved_characters, others do not.
+def list_save_page(offset):
+    """One page of save summaries for the load menu, plus whether more follow."""
+    # The save manifest (or the sqlite summary columns) lists class and
+    # level without opening every save; only the page is fetched.
     try:
-        saves = character_manager.list_saved_characters()
+        saves = character_manager.list_character_summaries(
+            offset=offset, limit=LOAD_PAGE_SIZE + 1)
     except Exception:
-        # Fallback: try to read save directory manually if function missing
         try:
-            saves = character_manager.list_saved_characters()
+            names = character_manager.list_saved_characters()
+            saves = [{"name": name} for name in names[offset:offset + LOAD_PAGE_SIZE + 1]]
         except Exception:
-            # If not available, try to find files in 'data/save_games'
             saves = []
-            try:
-                import os
-                folder = os.path.join("data","save_games")
-                if os.path.exists(folder):
-                    for fn in os.listdir(folder):
-                        if fn.endswith("_save.txt"):
-                            saves.append(fn.replace("_save.txt",""))
-            except Exception:
-                saves = []
-
-    if not saves:
-        print("No saved characters found.")
-        return
+    return saves[:LOAD_PAGE_SIZE], len(saves) > LOAD_PAGE_SIZE
+
+def load_game():
+    """List saved characters a page at a time and let user load one."""
+    global current_character
+    print("\n--- Load Game ---")
+    offset = 0
+    while True:
+        saves, more = list_save_page(offset)
+        if not saves:
+            print("No saved characters found.")
+            return
+
+        for i, save in enumerate(saves, start=1):
+            if "level" in save:
+                print(f"{i}) {save['name']} - Level {save['level']} {save['class']}, {save['gold']} gold")
+            else:
+                print(f"{i}) {save['name']}")
+        if more:
+            print("n) Next page")
+        if offset > 0:
+            print("p) Previous page")
+        pick = input("Select number to load: ").strip().lower()
+        if pick == "n" and more:
+            offset += LOAD_PAGE_SIZE
+        elif pick == "p" and offset > 0:
+            offset -= LOAD_PAGE_SIZE
+        else:
+            break
 
-    for i, name in enumerate(saves, start=1):
-        print(f"{i}) {name}")
-    pick = input("Select number to load: ").strip()
     try:
         idx = int(pick) - 1
         if idx < 0 or idx >= len(saves):
             print("Invalid selection.")
             return
-        chosen = saves[idx]
+        chosen = saves[idx]["name"]
         char = character_manager.load_character(chosen)
         current_character = char
         print(f"Loaded '{chosen}'.")
@@ -136,6 +210,11 @@ def load_game():
         print("Invalid input.")
     except CharacterNotFoundError:
         print("Save file missing.")
+        # The manifest listed a save that is gone; bring it back in line
+        try:
+            character_manager.check_manifest()
+        except Exception:
+            pass
     except SaveFileCorruptedError:
         print("Save file corrupted.")
     except Exception as e:
@@ -156,6 +235,7 @@ def game_loop():
     print(f"\nWelcome, {current_character['name']} (Level {current_character['level']})")
 
     while game_running:
+        reload_game_data()
         choice = game_menu()
         if choice == 1:
             view_character_stats()
@@ -203,6 +283,10 @@ def view_character_stats():
     print(f"Level: {c.get('level')}  XP: {c.get('experience')}")
     print(f"HP: {c.get('health')}/{c.get('max_health')}")
     print(f"Strength: {c.get('strength')}  Magic: {c.get('magic')}")
+    if c.get("modifiers"):
+        base = inventory_system.get_base_stats(c)
+        print(f"  (base HP {base['max_health']}, STR {base['strength']}, MAG {base['magic']}; "
+              f"modifiers: {', '.join(c['modifiers'])})")
     print(f"Gold: {c.get('gold')}")
     print(f"Active quests: {len(c.get('active_quests', []))}")
     print(f"Completed quests: {len(c.get('completed_quests', []))}")
@@ -215,7 +299,7 @@ def view_character_stats():
 
 def view_inventory():
     """List inventory and let player use/equip/drop items."""
-    global current_character, all_items
+    global current_character, all_items, item_effects
     c = current_character
     inv = c.get("inventory", [])
     print("\n--- INVENTORY ---")
@@ -224,9 +308,12 @@ def view_inventory():
         return
 
     # Count items for display
-    counts = {}
-    for iid in inv:
-        counts[iid] = counts.get(iid, 0) + 1
+    if isinstance(inv, inventory_system.Inventory):
+        counts = inv.counts()
+    else:
+        counts = {}
+        for iid in inv:
+            counts[iid] = counts.get(iid, 0) + 1
 
     for i, (iid, qty) in enumerate(counts.items(), start=1):
         name = all_items.get(iid, {}).get("name", iid)
@@ -237,7 +324,7 @@ def view_inventory():
     if choice == "1":
         iid = input("Item id to use: ").strip()
         try:
-            inventory_system.use_item(c, iid, all_items)
+            inventory_system.use_item(c, iid, item_effects)
             print("Used", iid)
         except ItemNotFoundError:
             print("You do not have that item.")
@@ -248,7 +335,7 @@ def view_inventory():
     elif choice == "2":
         iid = input("Weapon id to equip: ").strip()
         try:
-            inventory_system.equip_weapon(c, iid, all_items)
+            inventory_system.equip_weapon(c, iid, item_effects)
             print("Equipped", iid)
         except ItemNotFoundError:
             print("You do not have that weapon.")
@@ -259,7 +346,7 @@ def view_inventory():
     elif choice == "3":
         iid = input("Armor id to equip: ").strip()
         try:
-            inventory_system.equip_armor(c, iid, all_items)
+            inventory_system.equip_armor(c, iid, item_effects)
             print("Equipped", iid)
         except ItemNotFoundError:
             print("You do not have that armor.")
@@ -302,7 +389,7 @@ def quest_menu():
         else:
             quest_handler.display_quest_list(active)
     elif choice == "2":
-        avail = quest_handler.get_available_quests(c, all_quests)
+        avail = quest_handler.get_available_quests(c, all_quests, quest_index)
         if not avail:
             print("No available quests.")
         else:
@@ -378,20 +465,24 @@ def explore():
 
 def shop():
     """Simple shop for buying and selling items from all_items."""
-    global current_character, all_items
+    global current_character, all_items, loadout
     c = current_character
     if not all_items:
         print("No items available in the shop.")
         return
 
     print("\n--- SHOP ---")
-    ids = list(all_items.keys())
-    for i, iid in enumerate(ids, start=1):
-        item = all_items[iid]
-        print(f"{i}) {item.get('name', iid)} - cost: {int(item.get('cost',0))} gold (id:{iid})")
+    if item_index is not None:
+        for item_type in game_data.ITEM_TYPES:
+            print(f"[{item_type}]")
+            display_shop_items(item_index.in_cost_range(0, float("inf"), item_type))
+    else:
+        display_shop_items(all_items.values())
 
-    print(f"You have {c.get('gold',0)} gold.")
-    print("1) Buy 2) Sell 3) Back")
+    gold = c.get('gold', 0)
+    print(f"You have {gold} gold.")
+    print("1) Buy 2) Sell 3) Show what I can afford 4) Best value for a stat "
+          "5) Best loadout for my gold 6) Back")
     choice = input("Choice: ").strip()
     if choice == "1":
         iid = input("Enter item id to buy: ").strip()
@@ -399,7 +490,7 @@ def shop():
             print("Invalid id.")
             return
         try:
-            inventory_system.purchase_item(c, iid, all_items)
+            inventory_system.purchase_item(c, iid, all_items[iid])
             print("Purchased", iid)
         except InsufficientResourcesError:
             print("Not enough gold.")
@@ -413,15 +504,58 @@ def shop():
             print("Invalid id.")
             return
         try:
-            amount = inventory_system.sell_item(c, iid, all_items)
+            amount = inventory_system.sell_item(c, iid, all_items[iid])
             print("Sold", iid, "for", amount, "gold.")
         except ItemNotFoundError:
             print("You do not have that item.")
         except Exception as e:
             print("Could not sell:", e)
+    elif choice == "3":
+        if item_index is not None:
+            affordable = item_index.affordable(gold)
+        else:
+            affordable = [item for item in all_items.values() if item.get('cost', 0) <= gold]
+        if not affordable:
+            print("You cannot afford anything.")
+        else:
+            display_shop_items(affordable)
+    elif choice == "4":
+        if item_index is None:
+            print("Item index not available.")
+            return
+        stat = input("Stat (health, max_health, strength, magic): ").strip().lower()
+        best = item_index.best_value(stat, gold)
+        if best is None:
+            print("Nothing affordable improves that stat.")
+        else:
+            amount = best['effect'].get(stat, 0)
+            print(f"Best value: {best['name']} (id:{best['item_id']}) - "
+                  f"{stat} +{amount} for {best['cost']} gold")
+    elif choice == "5":
+        # The solver keeps its tables between visits; rebuilt after a reload
+        if loadout is None:
+            loadout = loadout_solver.LoadoutSolver(all_items)
+        result = loadout_solver.solve_loadout(c, all_items, solver=loadout)
+        if not result['order']:
+            print("Nothing worth buying with your gold and space.")
+            return
+        for iid, qty in result['order'].items():
+            print(f"- {all_items[iid].get('name', iid)} x{qty}")
+        print(f"Total: {result['cost']} gold")
+        if input("Buy all of it? (y/n): ").strip().lower() == "y":
+            try:
+                inventory_system.purchase_items(c, result['order'], all_items)
+                print("Purchased.")
+            except Exception as e:
+                print("Could not purchase:", e)
     else:
         return
 
+def display_shop_items(items):
+    for item in items:
+        iid = item.get('item_id')
+        print(f"- {item.get('name', iid)} - cost: {int(item.get('cost',0))} gold (id:{iid})")
+
 # ---------------------------
 # Save/load and death handling
 # ---------------------------
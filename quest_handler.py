@@ -18,6 +18,7 @@ from custom_exceptions import (
 )
 
 import character_manager
+from bisect import bisect_left, bisect_right
 
 
 # ============================================================================
@@ -90,10 +91,17 @@ def get_completed_quests(character, quest_data_dict):
     return [quest_data_dict[q] for q in character["completed_quests"] if q in quest_data_dict]
 
 
-def get_available_quests(character, quest_data_dict):
+def get_available_quests(character, quest_data_dict, level_index=None):
     available = []
 
-    for qid, data in quest_data_dict.items():
+    if level_index is not None:
+        # only quests at or below the character's level need checking
+        candidates = level_index.query(float("-inf"), character["level"])
+    else:
+        candidates = quest_data_dict.values()
+
+    for data in candidates:
+        qid = data["quest_id"]
         # skip completed
         if qid in character["completed_quests"]:
             continue
@@ -191,7 +199,10 @@ def get_total_quest_rewards_earned(character, quest_data_dict):
     return {"total_xp": total_xp, "total_gold": total_gold}
 
 
-def get_quests_by_level(quest_data_dict, min_level, max_level):
+def get_quests_by_level(quest_data_dict, min_level, max_level, level_index=None):
+    if level_index is not None:
+        return level_index.query(min_level, max_level)
+
     return [
         quest
         for quest in quest_data_dict.values()
@@ -199,6 +210,34 @@ def get_quests_by_level(quest_data_dict, min_level, max_level):
     ]
 
 
+# ============================================================================
+# LEVEL INDEX
+# ============================================================================
+
+class QuestLevelIndex:
+    """
+    Quests sorted by required_level, so a min_level..max_level query is two
+    bisects plus a slice (O(log n + k)) instead of a scan of every quest.
+    Rebuild it whenever the quest catalog is loaded or reloaded.
+    """
+
+    def __init__(self, quest_data_dict):
+        self._quests = sorted(quest_data_dict.values(), key=lambda q: q["required_level"])
+        self._levels = [q["required_level"] for q in self._quests]
+
+    def __len__(self):
+        return len(self._quests)
+
+    def query(self, min_level, max_level):
+        lo = bisect_left(self._levels, min_level)
+        hi = bisect_right(self._levels, max_level)
+        return self._quests[lo:hi]
+
+
+def build_quest_level_index(quest_data_dict):
+    return QuestLevelIndex(quest_data_dict)
+
+
 # ============================================================================
 # DISPLAY FUNCTIONS
 # ============================================================================
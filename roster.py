@@ -0,0 +1,451 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Roster Module
+
+Batch operations over many characters at once.
+
+Server-side events award XP and gold to tens of thousands of characters.
+RosterArrays copies the numeric stats into NumPy columns so a whole award
+is a handful of vector operations, following the same rules as
+character_manager.gain_experience and add_gold.
+
+Roster goes further and keeps a whole population resident as columns:
+typed arrays for the stats and encoded id lists, handing out lightweight
+views that behave like the usual character dict.
+"""
+
+from array import array
+from collections.abc import MutableMapping, MutableSequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for batch awards
+    np = None
+
+from custom_exceptions import CharacterDeadError, CharacterNotFoundError
+
+# Numeric character fields kept as columns
+STAT_COLUMNS = ("level", "health", "max_health", "strength", "magic",
+                "experience", "gold")
+LIST_COLUMNS = ("inventory", "active_quests", "completed_quests")
+CHARACTER_FIELDS = ("name", "class") + STAT_COLUMNS + LIST_COLUMNS
+
+# ============================================================================
+# VECTOR RULES
+# ============================================================================
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy is required for batch roster awards")
+
+
+def apply_awards(columns, xp=0, gold=0):
+    """
+    Award XP and gold to every row of a set of int64 stat columns in place.
+
+    `columns` maps each name in STAT_COLUMNS to a NumPy array; `xp` and
+    `gold` are scalars or per-row arrays. Everything is checked before
+    anything changes: a dead character receiving XP raises
+    CharacterDeadError and gold going negative raises ValueError, the same
+    errors gain_experience and add_gold raise. Returns a boolean array
+    marking the rows that leveled up.
+    """
+    _require_numpy()
+    size = len(columns["level"])
+    xp = np.broadcast_to(np.asarray(xp, dtype=np.int64), size)
+    gold = np.broadcast_to(np.asarray(gold, dtype=np.int64), size)
+
+    if np.any((columns["health"] <= 0) & (xp != 0)):
+        raise CharacterDeadError("Cannot gain XP while dead")
+
+    new_gold = columns["gold"] + gold
+    if np.any(new_gold < 0):
+        raise ValueError("Gold cannot be negative")
+
+    level = columns["level"]
+    experience = columns["experience"] + xp
+    gained = levels_gained(level, experience)
+
+    columns["gold"][:] = new_gold
+    columns["experience"][:] = experience - 100 * _series_cost(level, gained)
+    columns["level"][:] = level + gained
+    columns["max_health"] += 10 * gained
+    columns["strength"] += 2 * gained
+    columns["magic"] += 2 * gained
+
+    leveled = gained > 0
+    np.copyto(columns["health"], columns["max_health"], where=leveled)
+    return leveled
+
+
+def _series_cost(level, k):
+    # XP (in hundreds) to go from `level` up `k` levels
+    return k * level + k * (k - 1) // 2
+
+
+def levels_gained(level, experience):
+    """Vector form of character_manager.levels_gained (levels only)."""
+    _require_numpy()
+    hundreds = np.maximum(experience, 0) // 100
+    b = 2 * level - 1
+    k = np.floor((np.sqrt((b * b + 8 * hundreds).astype(np.float64)) - b) / 2)
+    k = k.astype(np.int64)
+
+    # The float root can be one off at exact boundaries; nudge it back
+    k -= _series_cost(level, k) > hundreds
+    k += _series_cost(level, k + 1) <= hundreds
+    return np.where(experience < level * 100, 0, k)
+
+# ============================================================================
+# ROSTER ARRAYS
+# ============================================================================
+
+class RosterArrays:
+    """
+    NumPy stat columns for a list of character dicts.
+
+    Build it from the characters, apply any number of awards, then
+    write_back() to copy the stats into the dicts (or read the columns
+    directly).
+    """
+
+    def __init__(self, characters):
+        _require_numpy()
+        self.characters = list(characters)
+        self.columns = {
+            field: np.fromiter((c[field] for c in self.characters),
+                               dtype=np.int64, count=len(self.characters))
+            for field in STAT_COLUMNS
+        }
+
+    def __len__(self):
+        return len(self.characters)
+
+    def award(self, xp=0, gold=0):
+        """Apply a batch award; returns the leveled-up mask."""
+        return apply_awards(self.columns, xp, gold)
+
+    def write_back(self):
+        """Copy the column values back into the character dicts."""
+        values = {field: column.tolist() for field, column in self.columns.items()}
+        for i, character in enumerate(self.characters):
+            for field in STAT_COLUMNS:
+                character[field] = values[field][i]
+        return len(self.characters)
+
+
+def award_roster(characters, xp=0, gold=0):
+    """Award XP and gold to a list of character dicts in one vector pass."""
+    arrays = RosterArrays(characters)
+    leveled = arrays.award(xp, gold)
+    arrays.write_back()
+    return leveled
+
+# ============================================================================
+# STRUCT-OF-ARRAYS ROSTER
+# ============================================================================
+
+# Id lists are stored as bytes of 32-bit codes into the roster's id table
+_CODE_TYPE = "I"
+_EMPTY = b""
+
+
+def _copy_modifiers(modifiers):
+    return {source: dict(deltas) for source, deltas in modifiers.items()}
+
+
+class Roster:
+    """
+    A population of characters stored column by column.
+
+    Stats live in one typed array per field, id lists as packed bytes of
+    integer codes, and anything else a character picks up
+    (equipped_weapon, ...) in a small per-row dict. roster[name] returns a
+    CharacterView that reads and writes these columns and can be passed to
+    quest_handler, inventory_system and combat_system in place of a dict.
+
+    Removed rows are reused by later adds; a view of a removed character
+    stops working, other views are unaffected.
+    """
+
+    def __init__(self, characters=()):
+        self._stats = {field: array("q") for field in STAT_COLUMNS}
+        self._lists = {field: [] for field in LIST_COLUMNS}
+        self._names = []
+        self._classes = []
+        self._extras = {}
+        self._rows = {}
+        self._free = []
+        self._codes = {}
+        self._ids = []
+        for character in characters:
+            self.add(character)
+
+    # ---- population ----------------------------------------------------
+
+    def add(self, character):
+        """Store a character dict (replacing one with the same name)."""
+        name = character["name"]
+        if name in self._rows:
+            self.remove(name)
+
+        row = self._free.pop() if self._free else None
+        if row is None:
+            row = len(self._names)
+            for field in STAT_COLUMNS:
+                self._stats[field].append(character[field])
+            for field in LIST_COLUMNS:
+                self._lists[field].append(self._encode(character[field]))
+            self._names.append(name)
+            self._classes.append(character["class"])
+        else:
+            for field in STAT_COLUMNS:
+                self._stats[field][row] = character[field]
+            for field in LIST_COLUMNS:
+                self._lists[field][row] = self._encode(character[field])
+            self._names[row] = name
+            self._classes[row] = character["class"]
+
+        extras = {k: v for k, v in character.items() if k not in CHARACTER_FIELDS}
+        if extras.get("modifiers"):
+            # equipping through a view must not change the caller's dict
+            extras["modifiers"] = _copy_modifiers(extras["modifiers"])
+        if extras:
+            self._extras[row] = extras
+        self._rows[name] = row
+        return CharacterView(self, row)
+
+    def remove(self, name):
+        row = self._row(name)
+        del self._rows[name]
+        self._names[row] = None
+        self._extras.pop(row, None)
+        for field in LIST_COLUMNS:
+            self._lists[field][row] = _EMPTY
+        self._free.append(row)
+        return True
+
+    def _row(self, name):
+        try:
+            return self._rows[name]
+        except KeyError:
+            raise CharacterNotFoundError(f"Character '{name}' not in roster")
+
+    def __getitem__(self, name):
+        return CharacterView(self, self._row(name))
+
+    def __contains__(self, name):
+        return name in self._rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        for row in self._rows.values():
+            yield CharacterView(self, row)
+
+    def names(self):
+        return list(self._rows)
+
+    def to_dict(self, name):
+        """A plain character dict copy, e.g. for save_character."""
+        return self[name].to_dict()
+
+    # ---- id list encoding ----------------------------------------------
+
+    def _code(self, item_id):
+        code = self._codes.get(item_id)
+        if code is None:
+            code = len(self._ids)
+            self._codes[item_id] = code
+            self._ids.append(item_id)
+        return code
+
+    def _encode(self, ids):
+        if not ids:
+            return _EMPTY
+        return array(_CODE_TYPE, [self._code(i) for i in ids]).tobytes()
+
+    def _decode(self, data):
+        if not data:
+            return []
+        codes = array(_CODE_TYPE)
+        codes.frombytes(data)
+        ids = self._ids
+        return [ids[code] for code in codes]
+
+    # ---- batch operations ----------------------------------------------
+
+    def award(self, xp=0, gold=0):
+        """
+        Award XP and gold to every character with apply_awards. Returns the
+        leveled-up mask in row order; removed rows are never awarded.
+
+        The award runs on NumPy copies of the stat arrays and the results
+        replace the columns afterwards. Views straight onto the arrays would
+        pin their buffers for as long as a raised error's traceback lives,
+        and the roster could not grow in the meantime.
+        """
+        _require_numpy()
+        live = np.array([name is not None for name in self._names], dtype=bool)
+        columns = {field: np.array(self._stats[field], dtype=np.int64)
+                   for field in STAT_COLUMNS}
+        if live.all():
+            leveled = apply_awards(columns, xp, gold)
+        else:
+            picked = {field: column[live] for field, column in columns.items()}
+            xp = np.broadcast_to(np.asarray(xp, dtype=np.int64), len(live))[live]
+            gold = np.broadcast_to(np.asarray(gold, dtype=np.int64), len(live))[live]
+            leveled_live = apply_awards(picked, xp, gold)
+            for field, column in columns.items():
+                column[live] = picked[field]
+            leveled = np.zeros(len(live), dtype=bool)
+            leveled[live] = leveled_live
+
+        for field, column in columns.items():
+            values = array("q")
+            values.frombytes(column.tobytes())
+            self._stats[field] = values
+        return leveled
+
+
+class CharacterView(MutableMapping):
+    """Dict-like access to one roster row."""
+
+    __slots__ = ("_roster", "_row")
+
+    def __init__(self, roster, row):
+        self._roster = roster
+        self._row = row
+
+    def _check(self):
+        if self._roster._names[self._row] is None:
+            raise CharacterNotFoundError("Character was removed from the roster")
+
+    def __getitem__(self, key):
+        self._check()
+        roster = self._roster
+        if key in roster._stats:
+            return roster._stats[key][self._row]
+        if key in roster._lists:
+            return IdListView(roster, key, self._row)
+        if key == "name":
+            return roster._names[self._row]
+        if key == "class":
+            return roster._classes[self._row]
+        return roster._extras.get(self._row, {})[key]
+
+    def __setitem__(self, key, value):
+        self._check()
+        roster = self._roster
+        if key in roster._stats:
+            roster._stats[key][self._row] = value
+        elif key in roster._lists:
+            roster._lists[key][self._row] = roster._encode(list(value))
+        elif key == "class":
+            roster._classes[self._row] = value
+        elif key == "name":
+            raise KeyError("A roster character cannot be renamed")
+        else:
+            roster._extras.setdefault(self._row, {})[key] = value
+
+    def __delitem__(self, key):
+        self._check()
+        if key in CHARACTER_FIELDS:
+            raise KeyError(f"Cannot delete required field '{key}'")
+        extras = self._roster._extras.get(self._row, {})
+        del extras[key]
+        if not extras:
+            self._roster._extras.pop(self._row, None)
+
+    def __iter__(self):
+        self._check()
+        yield from CHARACTER_FIELDS
+        yield from self._roster._extras.get(self._row, {})
+
+    def __len__(self):
+        self._check()
+        return len(CHARACTER_FIELDS) + len(self._roster._extras.get(self._row, {}))
+
+    def __repr__(self):
+        return f"CharacterView({self.to_dict()!r})"
+
+    def to_dict(self):
+        character = dict(self)
+        for field in LIST_COLUMNS:
+            character[field] = list(character[field])
+        if character.get("modifiers"):
+            character["modifiers"] = _copy_modifiers(character["modifiers"])
+        return character
+
+
+class IdListView(MutableSequence):
+    """List-like access to one encoded id list of a roster row."""
+
+    __slots__ = ("_roster", "_field", "_row")
+
+    def __init__(self, roster, field, row):
+        self._roster = roster
+        self._field = field
+        self._row = row
+
+    def _data(self):
+        return self._roster._lists[self._field][self._row]
+
+    def _store(self, ids):
+        self._roster._lists[self._field][self._row] = self._roster._encode(ids)
+
+    def __len__(self):
+        return len(self._data()) // array(_CODE_TYPE).itemsize
+
+    def __getitem__(self, index):
+        return self._roster._decode(self._data())[index]
+
+    def __setitem__(self, index, value):
+        ids = self._roster._decode(self._data())
+        ids[index] = value
+        self._store(ids)
+
+    def __delitem__(self, index):
+        ids = self._roster._decode(self._data())
+        del ids[index]
+        self._store(ids)
+
+    def insert(self, index, value):
+        ids = self._roster._decode(self._data())
+        ids.insert(index, value)
+        self._store(ids)
+
+    def append(self, value):
+        code = array(_CODE_TYPE, [self._roster._code(value)]).tobytes()
+        self._roster._lists[self._field][self._row] = self._data() + code
+
+    def __contains__(self, value):
+        code = self._roster._codes.get(value)
+        if code is None:
+            return False
+        codes = array(_CODE_TYPE)
+        codes.frombytes(self._data())
+        return code in codes
+
+    def __iter__(self):
+        return iter(self._roster._decode(self._data()))
+
+    def count(self, value):
+        code = self._roster._codes.get(value)
+        if code is None:
+            return 0
+        codes = array(_CODE_TYPE)
+        codes.frombytes(self._data())
+        return codes.count(code)
+
+    def clear(self):
+        self._roster._lists[self._field][self._row] = _EMPTY
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, IdListView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
@@ -0,0 +1,270 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Archive Module
+
+Export every saved character into one compressed archive and import it
+back into any save backend, without unpacking files to disk.
+
+Archive layout:
+    header   b"QCARCH", version (u8), codec (u8)
+    chunks   u32 length + compressed run of records, each a u32 length
+             followed by a binary save (character_manager.pack_character)
+    index    u32 length + compressed "name<TAB>chunk offset<TAB>position"
+             lines, one per character
+    footer   index offset (u64), character count (u32), b"QCINDX"
+
+Chunks are written and read one at a time, so memory stays bounded by
+CHUNK_CHARACTERS no matter how many characters the archive holds. The
+index lets read_archived_character fetch one character by decompressing
+a single chunk.
+"""
+
+import lzma
+import os
+import struct
+import time
+import zlib
+
+import character_manager
+from custom_exceptions import (
+    CharacterNotFoundError,
+    SaveFileCorruptedError,
+    InvalidSaveDataError
+)
+
+ARCHIVE_MAGIC = b"QCARCH"
+INDEX_MAGIC = b"QCINDX"
+ARCHIVE_VERSION = 1
+CHUNK_CHARACTERS = 256
+
+# codec name -> (id stored in the header, compress, decompress)
+CODECS = {
+    "zlib": (0, lambda data: zlib.compress(data, 6), zlib.decompress),
+    "lzma": (1, lambda data: lzma.compress(data, preset=6), lzma.decompress),
+}
+
+_HEADER = struct.Struct("<6sBB")
+_FOOTER = struct.Struct("<QI6s")
+_LENGTH = struct.Struct("<I")
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def export_saves(archive_file, save_directory="data/save_games", backend=None,
+                 codec="zlib", chunk_characters=None):
+    """
+    Write every readable saved character into archive_file.
+
+    The archive is written beside archive_file and only replaces it once
+    complete, so a failed export leaves any previous archive intact.
+    Saves that cannot be loaded are left out and reported, the way
+    rebuild_manifest skips them.
+
+    Returns a stats dict: characters, skipped (names of unreadable
+    saves), save_bytes (the characters encoded in the configured
+    SAVE_FORMAT, roughly the save files on disk), archive_bytes, ratio
+    and seconds.
+    """
+    if codec not in CODECS:
+        raise ValueError("Unknown archive codec: " + str(codec))
+    codec_id, compress, _ = CODECS[codec]
+    chunk_characters = chunk_characters or CHUNK_CHARACTERS
+
+    start = time.perf_counter()
+    names = character_manager.list_saved_characters(save_directory, backend)
+    index = []
+    skipped = []
+    save_bytes = 0
+    temp_file = archive_file + ".tmp"
+
+    try:
+        with open(temp_file, "wb") as f:
+            f.write(_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, codec_id))
+
+            for first in range(0, len(names), chunk_characters):
+                batch = names[first:first + chunk_characters]
+                results = character_manager.load_characters(batch, save_directory, backend)
+
+                records = []
+                for result in results:
+                    if result["error"] is not None:
+                        skipped.append(result["name"])
+                        continue
+                    character = result["character"]
+                    save_bytes += len(character_manager.encode_character(character))
+                    record = character_manager.pack_character(character)
+                    index.append((character["name"], f.tell(), len(records)))
+                    records.append(_LENGTH.pack(len(record)) + record)
+
+                _write_block(f, compress(b"".join(records)))
+
+            index_offset = f.tell()
+            lines = "".join(f"{name}\t{offset}\t{position}\n"
+                            for name, offset, position in index)
+            _write_block(f, compress(lines.encode()))
+            f.write(_FOOTER.pack(index_offset, len(index), INDEX_MAGIC))
+            archive_bytes = f.tell()
+        os.replace(temp_file, archive_file)
+    except OSError:
+        _remove_temp(temp_file)
+        raise SaveFileCorruptedError("Could not write save archive")
+    except BaseException:
+        _remove_temp(temp_file)
+        raise
+
+    seconds = time.perf_counter() - start
+    return {
+        "characters": len(index),
+        "skipped": skipped,
+        "save_bytes": save_bytes,
+        "archive_bytes": archive_bytes,
+        "ratio": save_bytes / archive_bytes if archive_bytes else 0.0,
+        "seconds": seconds,
+    }
+
+
+def _remove_temp(temp_file):
+    if os.path.exists(temp_file):
+        os.remove(temp_file)
+
+
+def _write_block(f, data):
+    f.write(_LENGTH.pack(len(data)))
+    f.write(data)
+
+# ============================================================================
+# READING
+# ============================================================================
+
+def _open_archive(f):
+    """Check the header and footer; returns (decompress, index offset, count)."""
+    try:
+        magic, version, codec_id = _HEADER.unpack(f.read(_HEADER.size))
+        f.seek(-_FOOTER.size, os.SEEK_END)
+        index_offset, count, index_magic = _FOOTER.unpack(f.read(_FOOTER.size))
+    except (struct.error, OSError):
+        raise InvalidSaveDataError("Save archive is truncated")
+
+    if magic != ARCHIVE_MAGIC or index_magic != INDEX_MAGIC:
+        raise InvalidSaveDataError("Not a save archive")
+    if version != ARCHIVE_VERSION:
+        raise InvalidSaveDataError(f"Unsupported archive version {version}")
+    for known_id, _, decompress in CODECS.values():
+        if known_id == codec_id:
+            return decompress, index_offset, count
+    raise InvalidSaveDataError(f"Unknown archive codec {codec_id}")
+
+
+def _read_block(f, decompress):
+    try:
+        (size,) = _LENGTH.unpack(f.read(_LENGTH.size))
+        data = f.read(size)
+        if len(data) != size:
+            raise InvalidSaveDataError("Save archive is truncated")
+        return decompress(data)
+    except InvalidSaveDataError:
+        raise
+    except Exception:
+        raise InvalidSaveDataError("Save archive is corrupted")
+
+
+def _split_records(chunk):
+    offset = 0
+    while offset < len(chunk):
+        (size,) = _LENGTH.unpack_from(chunk, offset)
+        offset += _LENGTH.size
+        yield chunk[offset:offset + size]
+        offset += size
+
+
+def read_archive_index(archive_file):
+    """Return {name: (chunk offset, position in chunk)} for an archive."""
+    with _open_file(archive_file) as f:
+        decompress, index_offset, count = _open_archive(f)
+        f.seek(index_offset)
+        text = _read_block(f, decompress).decode()
+
+    index = {}
+    for line in text.splitlines():
+        name, offset, position = line.split("\t")
+        index[name] = (int(offset), int(position))
+    if len(index) != count:
+        raise InvalidSaveDataError("Save archive index is corrupted")
+    return index
+
+
+def iter_archive(archive_file):
+    """Yield every archived character, one chunk in memory at a time."""
+    with _open_file(archive_file) as f:
+        decompress, index_offset, _ = _open_archive(f)
+        f.seek(_HEADER.size)
+        while f.tell() < index_offset:
+            for record in _split_records(_read_block(f, decompress)):
+                yield character_manager.unpack_character(record)
+
+
+def read_archived_character(archive_file, character_name, index=None):
+    """Load one character through the index without reading the others."""
+    index = index if index is not None else read_archive_index(archive_file)
+    if character_name not in index:
+        raise CharacterNotFoundError("Character not in save archive")
+    offset, position = index[character_name]
+
+    with _open_file(archive_file) as f:
+        decompress, _, _ = _open_archive(f)
+        f.seek(offset)
+        for n, record in enumerate(_split_records(_read_block(f, decompress))):
+            if n == position:
+                return character_manager.unpack_character(record)
+    raise InvalidSaveDataError("Save archive index is corrupted")
+
+
+def _open_file(archive_file):
+    try:
+        return open(archive_file, "rb")
+    except FileNotFoundError:
+        raise CharacterNotFoundError("Save archive not found")
+    except OSError:
+        raise SaveFileCorruptedError("Error reading save archive")
+
+# ============================================================================
+# IMPORT
+# ============================================================================
+
+def import_saves(archive_file, save_directory="data/save_games", backend=None,
+                 save_format=None, batch_size=None):
+    """
+    Save every archived character into the save backend.
+
+    Characters are written in batches through save_characters, straight
+    from the decompressed chunks. Returns a stats dict: characters,
+    archive_bytes and seconds. The first character that fails to save
+    raises its error.
+    """
+    batch_size = batch_size or CHUNK_CHARACTERS
+    start = time.perf_counter()
+    imported = 0
+
+    def flush(batch):
+        results = character_manager.save_characters(batch, save_directory,
+                                                    save_format, backend)
+        for result in results:
+            if result["error"] is not None:
+                raise result["error"]
+        return len(results)
+
+    batch = []
+    for character in iter_archive(archive_file):
+        batch.append(character)
+        if len(batch) >= batch_size:
+            imported += flush(batch)
+            batch = []
+    if batch:
+        imported += flush(batch)
+
+    return {
+        "characters": imported,
+        "archive_bytes": os.path.getsize(archive_file),
+        "seconds": time.perf_counter() - start,
+    }
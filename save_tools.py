@@ -0,0 +1,84 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Tools
+
+Command-line maintenance for the save directory.
+
+Usage:
+    python save_tools.py migrate [save_directory] [--layout flat|sharded] [--workers N]
+    python save_tools.py export ARCHIVE [save_directory] [--codec zlib|lzma] [--backend B]
+    python save_tools.py import ARCHIVE [save_directory] [--backend B]
+"""
+
+import argparse
+import time
+
+import character_manager
+import save_archive
+
+
+def migrate_command(args):
+    start = time.perf_counter()
+    moved = character_manager.migrate_save_layout(args.save_directory, args.layout,
+                                                  args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Moved {moved} saves to the {args.layout} layout in {elapsed:.2f} s")
+    if character_manager.SAVE_LAYOUT != args.layout:
+        print(f"Set character_manager.SAVE_LAYOUT = \"{args.layout}\" to keep new saves there")
+
+
+def export_command(args):
+    stats = save_archive.export_saves(args.archive, args.save_directory,
+                                      args.backend, args.codec)
+    print(f"Exported {stats['characters']} characters to {args.archive}")
+    print(f"  {_rate(stats):,.0f} characters/s, "
+          f"{stats['save_bytes']:,} -> {stats['archive_bytes']:,} bytes "
+          f"(ratio {stats['ratio']:.1f}x)")
+    if stats["skipped"]:
+        print(f"  skipped {len(stats['skipped'])} unreadable saves: "
+              + ", ".join(stats["skipped"]))
+
+
+def import_command(args):
+    stats = save_archive.import_saves(args.archive, args.save_directory, args.backend)
+    print(f"Imported {stats['characters']} characters from {args.archive}")
+    print(f"  {_rate(stats):,.0f} characters/s")
+
+
+def _rate(stats):
+    return stats["characters"] / stats["seconds"] if stats["seconds"] else 0.0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Quest Chronicles save tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser("migrate", help="move saves into another directory layout")
+    migrate.add_argument("save_directory", nargs="?", default="data/save_games")
+    migrate.add_argument("--layout", choices=("flat", "sharded"), default="sharded")
+    migrate.add_argument("--workers", type=int, default=None)
+    migrate.set_defaults(run=migrate_command)
+
+    export = commands.add_parser("export", help="write all saves to one compressed archive")
+    export.add_argument("archive")
+    export.add_argument("save_directory", nargs="?", default="data/save_games")
+    export.add_argument("--codec", choices=sorted(save_archive.CODECS), default="zlib")
+    export.add_argument("--backend", choices=("files", "sqlite"), default=None)
+    export.set_defaults(run=export_command)
+
+    restore = commands.add_parser("import", help="load an archive into the save backend")
+    restore.add_argument("archive")
+    restore.add_argument("save_directory", nargs="?", default="data/save_games")
+    restore.add_argument("--backend", choices=("files", "sqlite"), default=None)
+    restore.set_defaults(run=import_command)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
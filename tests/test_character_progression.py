@@ -0,0 +1,56 @@
+"""
+Test Character Progression
+Tests that large XP grants level characters exactly like repeated level-ups
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+
+
+def level_up_one_at_a_time(char, xp_amount):
+    """The original per-level loop, used as the reference"""
+    char['experience'] += xp_amount
+    leveled_up = False
+    while char['experience'] >= char['level'] * 100:
+        char['experience'] -= char['level'] * 100
+        char['level'] += 1
+        char['max_health'] += 10
+        char['strength'] += 2
+        char['magic'] += 2
+        char['health'] = char['max_health']
+        leveled_up = True
+    return leveled_up
+
+@pytest.mark.parametrize("start_level, start_xp, grant", [
+    (1, 0, 99), (1, 0, 100), (1, 50, 250), (3, 10, 1234),
+    (7, 0, 10**6), (1, 0, 10**9), (12, 1199, 1),
+])
+def test_gain_experience_matches_level_loop(start_level, start_xp, grant):
+    """Test closed-form leveling against the one-level-at-a-time loop"""
+    char = character_manager.create_character("XPTest", "Warrior")
+    char['level'] = start_level
+    char['experience'] = start_xp
+    char['health'] = 5
+    expected = dict(char)
+
+    result = character_manager.gain_experience(char, grant)
+
+    assert result == level_up_one_at_a_time(expected, grant)
+    assert char == expected
+
+def test_gain_experience_keeps_health_without_level_up():
+    """Test that health is only restored on a level-up"""
+    char = character_manager.create_character("XPTest", "Mage")
+    char['health'] = 10
+
+    assert character_manager.gain_experience(char, 40) is False
+    assert char['health'] == 10
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
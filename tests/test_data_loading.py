@@ -0,0 +1,385 @@
+"""
+Test Data Loading
+Tests for the catalog loaders in game_data
+"""
+
+import pytest
+import sys
+import os
+import pickle
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import game_data
+
+QUEST_TEXT = """QUEST_ID: first
+TITLE: First
+DESCRIPTION: The first quest
+REWARD_XP: 10
+REWARD_GOLD: 5
+REQUIRED_LEVEL: 1
+PREREQUISITE: NONE
+
+QUEST_ID: second
+TITLE: Second
+DESCRIPTION: The second quest
+REWARD_XP: 20
+REWARD_GOLD: 10
+REQUIRED_LEVEL: 3
+PREREQUISITE: first
+"""
+
+ITEM_TEXT = """ITEM_ID: potion
+NAME: Potion
+TYPE: consumable
+EFFECT: health:20
+COST: 25
+DESCRIPTION: Heals
+
+ITEM_ID: sword
+NAME: Sword
+TYPE: weapon
+EFFECT: strength:5
+COST: 100
+DESCRIPTION: Sharp
+"""
+
+
+def write_file(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+# ============================================================================
+# STREAMING LOADER TESTS
+# ============================================================================
+
+def test_iter_quests_yields_records_in_order(tmp_path):
+    """Test that iter_quests yields each parsed quest in file order"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+
+    quests = game_data.iter_quests(path)
+
+    first = next(quests)
+    assert first['quest_id'] == 'first'
+    assert first['reward_xp'] == 10
+    assert [q['quest_id'] for q in quests] == ['second']
+
+def test_iter_items_matches_load_items(tmp_path):
+    """Test that load_items is built from iter_items"""
+    path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+
+    items = game_data.load_items(path)
+
+    assert list(items) == [i['item_id'] for i in game_data.iter_items(path)]
+    assert items['sword']['effect'] == {'strength': 5}
+
+def test_iter_quests_missing_file():
+    """Test that iterating a missing file raises MissingDataFileError"""
+    with pytest.raises(MissingDataFileError):
+        next(game_data.iter_quests("nonexistent_file.txt"))
+
+# ============================================================================
+# CATALOG CACHE TESTS
+# ============================================================================
+
+def test_cached_load_writes_and_reuses_cache(tmp_path):
+    """Test that a warm load returns the cached catalog"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+
+    cold = game_data.load_quests(path, use_cache=True)
+    assert os.path.exists(path + game_data.CACHE_SUFFIX)
+
+    warm = game_data.load_quests(path, use_cache=True)
+    assert warm == cold == game_data.load_quests(path)
+
+def test_cache_invalidated_when_file_changes(tmp_path):
+    """Test that editing the data file forces a re-parse"""
+    path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    game_data.load_items(path, use_cache=True)
+
+    write_file(tmp_path, "items.txt", ITEM_TEXT.replace("COST: 25", "COST: 30"))
+
+    items = game_data.load_items(path, use_cache=True)
+    assert items['potion']['cost'] == 30
+
+class Planted:
+    """Pickles into a call that creates a marker directory."""
+    def __init__(self, marker):
+        self.marker = marker
+
+    def __reduce__(self):
+        return (os.mkdir, (self.marker,))
+
+@pytest.mark.parametrize("content", ["garbage", "pickle"])
+def test_bad_cache_file_is_a_miss(tmp_path, content):
+    """Test that a corrupt or planted cache file is ignored, never executed"""
+    path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    marker = str(tmp_path / "planted")
+    with open(path + game_data.CACHE_SUFFIX, "wb") as f:
+        f.write(b"\x00garbage" if content == "garbage" else pickle.dumps(Planted(marker)))
+
+    items = game_data.load_items(path, use_cache=True)
+
+    assert items == game_data.load_items(path)
+    assert not os.path.exists(marker)
+    assert game_data.load_items(path, use_cache=True) == items
+
+# ============================================================================
+# LAZY CATALOG TESTS
+# ============================================================================
+
+def test_lazy_catalog_decodes_on_first_lookup(tmp_path):
+    """Test that LazyCatalog only parses records that are looked up"""
+    path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+
+    items = game_data.load_lazy_items(path)
+
+    assert len(items) == 2
+    assert 'sword' in items
+    assert items.loaded_count() == 0
+    assert items['sword'] == game_data.load_items(path)['sword']
+    assert items.loaded_count() == 1
+    assert items.get('missing') is None
+    items.close()
+
+def test_lazy_catalog_matches_eager_loader():
+    """Test that LazyCatalog is a drop-in for the loaded dict"""
+    quests = game_data.load_lazy_quests("data/quests.txt")
+
+    assert dict(quests) == game_data.load_quests("data/quests.txt")
+    quests.close()
+
+# ============================================================================
+# SHARDED LOADING TESTS
+# ============================================================================
+
+def test_load_item_shards_merges_directory(tmp_path):
+    """Test that every shard in a directory is merged into one catalog"""
+    shard_a, shard_b = ITEM_TEXT.split("\n\n")
+    write_file(tmp_path, "a.txt", shard_a)
+    write_file(tmp_path, "b.txt", shard_b)
+
+    items = game_data.load_item_shards(str(tmp_path), workers=2)
+
+    assert items == game_data.load_items(write_file(tmp_path, "all.dat", ITEM_TEXT))
+
+def test_load_quest_shards_rejects_duplicate_ids(tmp_path):
+    """Test that a quest_id defined in two shards is reported"""
+    write_file(tmp_path, "a.txt", QUEST_TEXT)
+    write_file(tmp_path, "b.txt", QUEST_TEXT)
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.load_quest_shards(str(tmp_path / "*.txt"), workers=1)
+
+def test_load_shards_with_no_matches(tmp_path):
+    """Test that an empty shard source raises MissingDataFileError"""
+    with pytest.raises(MissingDataFileError):
+        game_data.load_item_shards(str(tmp_path))
+
+# ============================================================================
+# HOT RELOAD TESTS
+# ============================================================================
+
+def test_reloader_applies_block_level_changes(tmp_path):
+    """Test that only added, edited and removed blocks change the catalog"""
+    path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    items = game_data.load_items(path)
+    potion = items['potion']
+    reloader = game_data.CatalogReloader(path, items, "item")
+
+    assert reloader.check() is None
+
+    edited = ITEM_TEXT.replace("COST: 100", "COST: 120").split("\n\n")[1]
+    added = "ITEM_ID: shield\nNAME: Shield\nTYPE: armor\nEFFECT: max_health:10\nCOST: 80\nDESCRIPTION: Sturdy\n"
+    write_file(tmp_path, "items.txt", edited + "\n" + added)
+    os.utime(path, ns=(1, 1))
+
+    changes = reloader.check()
+
+    assert changes == {'added': ['shield'], 'updated': ['sword'], 'removed': ['potion']}
+    assert items['sword']['cost'] == 120
+    assert items['shield']['type'] == 'armor'
+    assert 'potion' not in items
+    assert potion['cost'] == 25
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_reloader_starts_from_load_digests(tmp_path, monkeypatch, use_cache):
+    """Test that load-time digests spare the file scan and limit re-parsing"""
+    path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    if use_cache:
+        game_data.load_items(path, use_cache=True)
+    digests = {}
+    items = game_data.load_items(path, use_cache=use_cache, compact=True, digests=digests)
+
+    def no_scan(*args):
+        raise AssertionError("reloader read the file on creation")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(game_data, "_iter_blocks", no_scan)
+        reloader = game_data.CatalogReloader(path, items, "item", compact=True, digests=digests)
+        assert reloader.check() is None
+
+    parsed = []
+    parser = reloader._parser
+    reloader._parser = lambda block: parsed.append(block) or parser(block)
+
+    write_file(tmp_path, "items.txt", ITEM_TEXT.replace("COST: 100", "COST: 120"))
+    os.utime(path, ns=(1, 1))
+    assert reloader.check() == {'added': [], 'updated': ['sword'], 'removed': []}
+    assert len(parsed) == 1
+    assert items['sword']['cost'] == 120
+
+def test_reloader_leaves_catalog_alone_on_bad_block(tmp_path):
+    """Test that a bad edit raises before any change is applied"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    quests = game_data.load_quests(path)
+    reloader = game_data.CatalogReloader(path, quests, "quest")
+
+    write_file(tmp_path, "quests.txt", QUEST_TEXT.replace("REWARD_XP: 20", "oops"))
+    os.utime(path, ns=(1, 1))
+
+    with pytest.raises(InvalidDataFormatError):
+        reloader.check()
+    assert quests == game_data.load_quests(write_file(tmp_path, "orig.txt", QUEST_TEXT))
+
+# ============================================================================
+# SCHEMA PARSER TESTS
+# ============================================================================
+
+def test_parse_item_block_validates_in_one_pass():
+    """Test that the schema parser rejects missing fields and bad types"""
+    block = ITEM_TEXT.split("\n\n")[0].splitlines()
+
+    assert game_data.parse_item_block(block)['cost'] == 25
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.parse_item_block(block[:-1])
+    with pytest.raises(InvalidDataFormatError):
+        game_data.parse_item_block([l.replace("consumable", "hat") for l in block])
+
+def test_parse_quest_block_bad_number():
+    """Test that a non-numeric value is reported as a format error"""
+    block = QUEST_TEXT.split("\n\n")[0].replace("REWARD_XP: 10", "REWARD_XP: ten")
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.parse_quest_block(block.splitlines())
+
+# ============================================================================
+# COMPACT RECORD TESTS
+# ============================================================================
+
+def test_compact_records_read_like_dicts(tmp_path):
+    """Test that slotted records keep the dict-style access the game uses"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+
+    quests = game_data.load_quests(path, compact=True)
+    quest = quests['second']
+
+    assert isinstance(quest, game_data.Quest)
+    assert quest['required_level'] == 3
+    assert quest.get('prerequisite') == 'first'
+    assert quest.get('missing', 'default') == 'default'
+    assert 'quest_id' in quest
+    assert quests == game_data.load_quests(path)
+
+def test_compact_records_are_cached(tmp_path):
+    """Test that compact and dict loads share one cache without rewriting it"""
+    path = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    cache_file = path + game_data.CACHE_SUFFIX
+
+    game_data.load_items(path, use_cache=True)
+    written = os.stat(cache_file).st_mtime_ns
+    os.utime(cache_file, ns=(1, 1))
+
+    items = game_data.load_items(path, use_cache=True, compact=True)
+    plain = game_data.load_items(path, use_cache=True)
+
+    assert isinstance(items['sword'], game_data.Item)
+    assert type(plain['sword']) is dict
+    assert items == plain
+    assert os.stat(cache_file).st_mtime_ns == 1 != written
+
+def test_compact_records_pickle_as_values(tmp_path):
+    """Test that records pickle compactly and come back equal"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    quest = game_data.load_quests(path, compact=True)['second']
+
+    assert quest.__reduce__()[1] == (game_data.Quest, quest.astuple())
+    copy = pickle.loads(pickle.dumps(quest))
+    assert isinstance(copy, game_data.Quest)
+    assert copy == quest
+    assert game_data.Quest.from_values(quest.astuple()) == quest
+
+def test_warm_compact_cache_matches_parse(tmp_path):
+    """Test that a warm compact load rebuilds the same records"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    game_data.load_quests(path, use_cache=True, compact=True)
+
+    quests = game_data.load_quests(path, use_cache=True, compact=True)
+
+    assert isinstance(quests['second'], game_data.Quest)
+    assert quests == game_data.load_quests(path)
+    assert quests['second']['prerequisite'] is game_data.intern_id("fir" + "st")
+
+# ============================================================================
+# ITEM INDEX TESTS
+# ============================================================================
+
+def test_item_index_cost_range_queries():
+    """Test by-type and cost-range queries against a full scan"""
+    items = game_data.load_items("data/items.txt")
+    index = game_data.build_item_index(items)
+
+    weapons = index.affordable(150, "weapon")
+    expected = [i for i in items.values() if i['type'] == 'weapon' and i['cost'] <= 150]
+
+    assert sorted(w['item_id'] for w in weapons) == sorted(i['item_id'] for i in expected)
+    assert [w['cost'] for w in weapons] == sorted(w['cost'] for w in weapons)
+    assert len(index.ids_by_type('armor')) == sum(1 for i in items.values() if i['type'] == 'armor')
+
+def test_item_index_best_value():
+    """Test best effect-per-gold lookups with and without a budget"""
+    items = {
+        'small': {'item_id': 'small', 'type': 'consumable', 'cost': 10, 'effect': {'health': 20}},
+        'big': {'item_id': 'big', 'type': 'consumable', 'cost': 50, 'effect': {'health': 150}},
+        'sword': {'item_id': 'sword', 'type': 'weapon', 'cost': 5, 'effect': {'strength': 1}},
+    }
+    index = game_data.build_item_index(items)
+
+    assert index.best_value('health')['item_id'] == 'big'
+    assert index.best_value('health', gold=20)['item_id'] == 'small'
+    assert index.best_value('health', gold=5) is None
+    assert index.best_value('magic') is None
+
+# ============================================================================
+# IDENTIFIER POOL TESTS
+# ============================================================================
+
+def test_ids_are_shared_across_catalogs_and_saves(tmp_path):
+    """Test that catalog ids and loaded save ids are the same objects"""
+    import character_manager
+
+    items = game_data.load_items("data/items.txt")
+    char = character_manager.create_character("PoolTest", "Rogue")
+    char['inventory'] = ["iron_sword", "health_potion"]
+    character_manager.save_character(char, str(tmp_path))
+
+    loaded = character_manager.load_character("PoolTest", str(tmp_path))
+    catalog_id = items['iron_sword']['item_id']
+
+    assert loaded['inventory'][0] is catalog_id
+    assert game_data.intern_id("iron" + "_sword") is catalog_id
+
+def test_cached_catalog_ids_are_interned(tmp_path):
+    """Test that ids are pooled on a warm cache load too"""
+    path = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    game_data.load_quests(path, use_cache=True)
+
+    quests = game_data.load_quests(path, use_cache=True)
+
+    assert quests['second']['prerequisite'] is game_data.intern_id("fir" + "st")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
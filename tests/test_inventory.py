@@ -0,0 +1,277 @@
+"""
+Test Inventory
+Tests for the multiset Inventory container in inventory_system
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import inventory_system
+from inventory_system import Inventory
+
+# ============================================================================
+# INVENTORY CONTAINER TESTS
+# ============================================================================
+
+def test_inventory_behaves_like_the_list_it_replaces():
+    """Test membership, counts, removal and list equality"""
+    inv = Inventory(["potion", "sword", "potion"])
+
+    assert len(inv) == 3
+    assert "potion" in inv and "shield" not in inv
+    assert inv.count("potion") == 2
+    assert list(inv) == ["potion", "potion", "sword"]
+    assert inv == ["sword", "potion", "potion"]
+    assert inv != ["sword", "potion"]
+
+    inv.remove("potion")
+    assert inv.counts() == {"potion": 1, "sword": 1}
+    with pytest.raises(ValueError):
+        inv.remove("shield")
+
+    removed = inv[:]
+    inv.clear()
+    assert removed == ["potion", "sword"] and len(inv) == 0 and not inv
+
+def test_inventory_functions_keep_size_limit():
+    """Test that MAX_INVENTORY_SIZE still applies to an Inventory"""
+    char = character_manager.create_character("Packer", "Rogue")
+    assert isinstance(char['inventory'], Inventory)
+
+    for _ in range(inventory_system.MAX_INVENTORY_SIZE):
+        inventory_system.add_item_to_inventory(char, "health_potion")
+
+    with pytest.raises(InventoryFullError):
+        inventory_system.add_item_to_inventory(char, "iron_sword")
+    assert inventory_system.count_item(char, "health_potion") == inventory_system.MAX_INVENTORY_SIZE
+    assert inventory_system.get_inventory_space_remaining(char) == 0
+
+    inventory_system.remove_item_from_inventory(char, "health_potion")
+    assert inventory_system.get_inventory_space_remaining(char) == 1
+
+def test_inventory_round_trips_through_saves(tmp_path):
+    """Test that both save formats write and load an Inventory"""
+    char = character_manager.create_character("Saver", "Cleric")
+    char['inventory'].extend(["health_potion", "iron_sword", "health_potion"])
+
+    for save_format in ("text", "binary"):
+        character_manager.save_character(char, str(tmp_path), save_format=save_format)
+        loaded = character_manager.load_character("Saver", str(tmp_path))
+
+        assert isinstance(loaded['inventory'], Inventory)
+        assert loaded['inventory'].counts() == {"health_potion": 2, "iron_sword": 1}
+
+    character_manager.save_character(char, str(tmp_path), save_format="text")
+    text = (tmp_path / "Saver_save.txt").read_text()
+    assert "INVENTORY: health_potion,health_potion,iron_sword\n" in text
+
+# ============================================================================
+# ITEM EFFECT TESTS
+# ============================================================================
+
+def equip_all(use_data, equip_data, armor_data):
+    char = character_manager.create_character("Effects", "Warrior")
+    char['health'] = 50
+    char['inventory'].extend(["health_potion", "iron_sword", "leather_armor"])
+    inventory_system.use_item(char, "health_potion", use_data)
+    inventory_system.equip_weapon(char, "iron_sword", equip_data)
+    inventory_system.equip_armor(char, "leather_armor", armor_data)
+    return char
+
+def test_compiled_effects_match_string_effects():
+    """Test that compiled catalog effects and per-item data apply the same"""
+    import game_data
+    items = game_data.load_items("data/items.txt", compact=True)
+    effects = inventory_system.compile_item_effects(items)
+
+    compiled = equip_all(effects, effects, effects)
+    per_item = equip_all({'type': 'consumable', 'effect': 'health:20'},
+                         items['iron_sword'], items['leather_armor'])
+
+    assert compiled == per_item
+    assert compiled['health'] == 70
+    assert compiled['equipped_weapon'] == "iron_sword"
+
+def test_multi_stat_effects():
+    """Test that "stat:value,stat:value" effects parse and apply per type"""
+    import game_data
+    block = ["ITEM_ID: runed_blade", "NAME: Runed Blade", "TYPE: weapon",
+             "EFFECT: strength:5,magic:3,health:9", "COST: 300", "DESCRIPTION: Glows"]
+    item = game_data.parse_item_block(block)
+    assert item['effect'] == {'strength': 5, 'magic': 3, 'health': 9}
+
+    effects = inventory_system.compile_item_effects({'runed_blade': item})
+    char = character_manager.create_character("Runed", "Mage")
+    char['inventory'].append("runed_blade")
+    before = dict(char)
+
+    inventory_system.equip_weapon(char, "runed_blade", effects)
+
+    assert char['strength'] == before['strength'] + 5
+    assert char['magic'] == before['magic'] + 3
+    assert char['health'] == before['health']
+    with pytest.raises(InvalidDataFormatError):
+        game_data.parse_item_block([l.replace("magic:3", ":3") for l in block])
+
+    # single-stat effects take a shortcut but parse the same way
+    assert game_data.parse_effect("strength:5") == {'strength': 5}
+    assert game_data.parse_effect(" magic :3") == game_data.parse_effect("magic:3,magic:0")
+    with pytest.raises(ValueError):
+        game_data.parse_effect(":5")
+
+def test_effect_table_rejects_unknown_items():
+    """Test that an id missing from the catalog raises ItemNotFoundError"""
+    effects = inventory_system.compile_item_effects({}, eager=False)
+    char = {'inventory': ['mystery'], 'health': 10, 'max_health': 10}
+
+    with pytest.raises(ItemNotFoundError):
+        inventory_system.use_item(char, "mystery", effects)
+    assert char['inventory'] == ['mystery']
+
+# ============================================================================
+# STAT MODIFIER TESTS
+# ============================================================================
+
+def test_equipping_replaces_the_old_bonus():
+    """Test that swapping weapons does not stack their bonuses"""
+    char = character_manager.create_character("Swapper", "Warrior")
+    base = char['strength']
+    char['inventory'].extend(["iron_sword", "steel_sword"])
+
+    inventory_system.equip_weapon(char, "iron_sword", {'type': 'weapon', 'effect': 'strength:5'})
+    inventory_system.equip_weapon(char, "steel_sword", {'type': 'weapon', 'effect': 'strength:10'})
+
+    assert char['strength'] == base + 10
+    assert char['inventory'].count("iron_sword") == 1
+    assert inventory_system.get_base_stats(char)['strength'] == base
+
+def test_modifiers_stack_and_unwind():
+    """Test buffs alongside armor and health clamping on removal"""
+    char = character_manager.create_character("Buffed", "Cleric")
+    base = inventory_system.get_base_stats(char)
+    char['inventory'].append("chainmail")
+
+    inventory_system.equip_armor(char, "chainmail", {'type': 'armor', 'effect': 'max_health:25'})
+    inventory_system.add_modifier(char, "buff:blessing", {'max_health': 10, 'magic': 4})
+    char['health'] = char['max_health']
+    assert char['max_health'] == base['max_health'] + 35
+
+    inventory_system.remove_modifier(char, "buff:blessing")
+    assert char['health'] == char['max_health'] == base['max_health'] + 25
+    assert char['magic'] == base['magic']
+    assert not inventory_system.remove_modifier(char, "buff:blessing")
+
+    char['strength'] += 2  # a level-up raises the base under the modifiers
+    assert inventory_system.get_base_stats(char) == dict(base, strength=base['strength'] + 2)
+
+SWORD = {'type': 'weapon', 'effect': 'strength:5'}
+
+
+def reload_character(char, directory, how):
+    """Save and load a character through one of the save paths."""
+    if how == "archive":
+        import save_archive
+        character_manager.save_character(char, directory, save_format="binary")
+        archive = os.path.join(directory, "saves.qca")
+        save_archive.export_saves(archive, directory)
+        return save_archive.read_archived_character(archive, char['name'])
+    if how == "roster":
+        import roster
+        return roster.Roster([char])[char['name']]
+    if how == "journal":
+        character_manager.save_character(char, directory, journal=True)
+        with open(os.path.join(directory, char['name'] + "_save.txt.journal")) as f:
+            assert "MODIFIERS: " in f.read()
+        return character_manager.load_character(char['name'], directory)
+    backend = "sqlite" if how == "sqlite" else None
+    save_format = "binary" if how == "binary" else "text"
+    character_manager.save_character(char, directory, save_format, backend)
+    return character_manager.load_character(char['name'], directory, backend)
+
+@pytest.mark.parametrize("how", ["text", "binary", "sqlite", "journal", "archive", "roster"])
+def test_reequipping_after_load_does_not_stack(tmp_path, how):
+    """Test that saves keep modifiers, so equipping again replaces the bonus"""
+    char = character_manager.create_character(f"Geared_{how}", "Warrior")
+    base = inventory_system.get_base_stats(char)
+    if how == "journal":
+        # snapshot first, so the equipment goes into the journal
+        character_manager.save_character(char, str(tmp_path), journal=True)
+    char['inventory'].extend(["iron_sword", "iron_sword"])
+    inventory_system.equip_weapon(char, "iron_sword", SWORD)
+    inventory_system.add_modifier(char, "buff:blessing", {'magic': 4})
+
+    loaded = reload_character(char, str(tmp_path), how)
+
+    assert loaded['equipped_weapon'] == "iron_sword"
+    assert inventory_system.get_base_stats(loaded) == base
+    inventory_system.equip_weapon(loaded, "iron_sword", SWORD)
+    assert loaded['strength'] == base['strength'] + 5
+    assert loaded['magic'] == base['magic'] + 4
+    assert loaded['inventory'].count("iron_sword") == 1
+
+def test_combat_reads_effective_strength():
+    """Test that damage uses the strength cached with equipment applied"""
+    import combat_system
+    char = character_manager.create_character("Fighter", "Warrior")
+    enemy = combat_system.create_enemy("goblin")
+    battle = combat_system.SimpleBattle(char, enemy)
+    unarmed = battle.calculate_damage(char, enemy)
+
+    inventory_system.add_modifier(char, "weapon", {'strength': 7})
+
+    assert battle.calculate_damage(char, enemy) == unarmed + 7
+
+# ============================================================================
+# BATCH SHOP TESTS
+# ============================================================================
+
+SHOP = {
+    'health_potion': {'item_id': 'health_potion', 'type': 'consumable', 'cost': 25},
+    'iron_sword': {'item_id': 'iron_sword', 'type': 'weapon', 'cost': 101},
+}
+
+def test_purchase_and_sell_baskets():
+    """Test that a basket moves items and gold in one call"""
+    char = character_manager.create_character("Trader", "Rogue")
+    char['gold'] = 500
+
+    spent = inventory_system.purchase_items(char, {'health_potion': 3, 'iron_sword': 1}, SHOP)
+    assert spent == 176
+    assert char['gold'] == 324
+    assert char['inventory'].counts() == {'health_potion': 3, 'iron_sword': 1}
+
+    received = inventory_system.sell_items(char, ['iron_sword', ('health_potion', 2)], SHOP)
+    assert received == 50 + 24
+    assert char['gold'] == 398
+    assert char['inventory'] == ['health_potion']
+
+@pytest.mark.parametrize("order, error", [
+    ({'health_potion': 1, 'dragon_egg': 1}, ItemNotFoundError),
+    ({'iron_sword': 10}, InsufficientResourcesError),
+    ({'health_potion': inventory_system.MAX_INVENTORY_SIZE}, InventoryFullError),
+    ({'health_potion': 0}, ValueError),
+])
+def test_failed_purchase_changes_nothing(order, error):
+    """Test that any bad line rejects the whole basket"""
+    char = {'inventory': ['iron_sword'], 'gold': 1000}
+
+    with pytest.raises(error):
+        inventory_system.purchase_items(char, order, SHOP)
+    assert char == {'inventory': ['iron_sword'], 'gold': 1000}
+
+def test_failed_sale_changes_nothing():
+    """Test that selling more than is held rejects the whole basket"""
+    char = {'inventory': Inventory(['health_potion', 'iron_sword']), 'gold': 0}
+
+    with pytest.raises(ItemNotFoundError):
+        inventory_system.sell_items(char, {'iron_sword': 1, 'health_potion': 2}, SHOP)
+    assert char['inventory'].counts() == {'health_potion': 1, 'iron_sword': 1}
+    assert char['gold'] == 0
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,96 @@
+"""
+Test Loadout Solver
+Tests for the best-purchase solver in loadout_solver
+"""
+
+import pytest
+import sys
+import os
+import random
+from itertools import product
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import game_data
+import inventory_system
+import loadout_solver
+
+
+def random_catalog(seed, count=12):
+    rng = random.Random(seed)
+    items = {}
+    for n in range(count):
+        item_type = rng.choice(["weapon", "armor", "consumable"])
+        stat = rng.choice(inventory_system.EFFECT_STATS[item_type])
+        items[f"item{n}"] = {'item_id': f"item{n}", 'type': item_type,
+                             'cost': rng.randrange(10, 120, 10),
+                             'effect': {stat: rng.randint(1, 30)}}
+    return items
+
+def brute_force(items, gold, slots):
+    """Best value by trying every weapon, armor and consumable multiset"""
+    weights = loadout_solver.DEFAULT_WEIGHTS
+    value = {i: loadout_solver.item_value(item, weights, i) for i, item in items.items()}
+    weapons = [None] + [i for i, item in items.items() if item['type'] == 'weapon']
+    armors = [None] + [i for i, item in items.items() if item['type'] == 'armor']
+    potions = [i for i, item in items.items() if item['type'] == 'consumable']
+
+    best = 0
+    for weapon, armor in product(weapons, armors):
+        gear = [g for g in (weapon, armor) if g]
+        for count in range(slots - len(gear) + 1):
+            for picked in product(potions, repeat=count):
+                chosen = gear + list(picked)
+                if sum(items[i]['cost'] for i in chosen) <= gold:
+                    best = max(best, sum(value[i] for i in chosen))
+    return best
+
+# ============================================================================
+# LOADOUT SOLVER TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("seed", range(6))
+def test_solver_matches_brute_force(seed):
+    """Test optimal value against exhaustive search on small catalogs"""
+    items = random_catalog(seed)
+    solver = loadout_solver.LoadoutSolver(items)
+
+    for gold, slots in [(0, 4), (60, 2), (150, 3), (400, 4)]:
+        result = solver.solve(gold, slots)
+        assert result['value'] == pytest.approx(brute_force(items, gold, slots))
+        assert result['cost'] <= gold and result['slots'] <= slots
+        assert sum(loadout_solver.item_value(items[i]) * n
+                   for i, n in result['order'].items()) == pytest.approx(result['value'])
+
+def test_dominated_items_are_pruned():
+    """Test that an item beaten on cost and value never reaches the DP"""
+    items = {
+        'good': {'type': 'weapon', 'cost': 50, 'effect': {'strength': 10}},
+        'worse': {'type': 'weapon', 'cost': 60, 'effect': {'strength': 8}},
+        'better': {'type': 'weapon', 'cost': 90, 'effect': {'strength': 15}},
+    }
+    solver = loadout_solver.LoadoutSolver(items)
+
+    assert [w[2] for w in solver.weapons] == ['good', 'better']
+    assert solver.unit == 10
+    assert solver.solve(89)['weapon'] == 'good'
+    assert solver.solve(90)['weapon'] == 'better'
+
+def test_solved_order_can_be_purchased():
+    """Test that a character can buy exactly the solver's order"""
+    items = game_data.load_items("data/items.txt", compact=True)
+    char = character_manager.create_character("Shopper", "Warrior")
+    char['gold'] = 900
+    char['inventory'].extend(["health_potion"] * 15)
+
+    result = loadout_solver.solve_loadout(char, items)
+    spent = inventory_system.purchase_items(char, result['order'], items)
+
+    assert spent == result['cost']
+    assert len(char['inventory']) <= inventory_system.MAX_INVENTORY_SIZE
+    assert char['gold'] == 900 - spent
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,41 @@
+"""
+Test Quest Level Index
+Tests that indexed quest queries match the full scans in quest_handler
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import quest_handler
+import game_data
+
+def test_quests_by_level_matches_scan():
+    """Test that the level index returns the same quests as a scan"""
+    quests = game_data.load_quests("data/quests.txt")
+    index = quest_handler.build_quest_level_index(quests)
+
+    for low, high in [(1, 1), (2, 4), (0, 100), (7, 3)]:
+        scanned = quest_handler.get_quests_by_level(quests, low, high)
+        indexed = quest_handler.get_quests_by_level(quests, low, high, index)
+        assert sorted(q['quest_id'] for q in indexed) == sorted(q['quest_id'] for q in scanned)
+
+def test_available_quests_with_index():
+    """Test that available quests are the same with and without the index"""
+    quests = game_data.load_quests("data/quests.txt")
+    index = quest_handler.build_quest_level_index(quests)
+    char = character_manager.create_character("IndexTest", "Mage")
+    char['level'] = 3
+    char['completed_quests'].append('first_steps')
+
+    scanned = quest_handler.get_available_quests(char, quests)
+    indexed = quest_handler.get_available_quests(char, quests, index)
+
+    assert sorted(q['quest_id'] for q in indexed) == sorted(q['quest_id'] for q in scanned)
+    assert 'first_steps' not in [q['quest_id'] for q in indexed]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,137 @@
+"""
+Test Roster
+Tests that batch roster operations match the per-character functions
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import roster
+
+
+def make_roster(count=50):
+    characters = []
+    for n in range(count):
+        char = character_manager.create_character(f"Hero{n}", ["Warrior", "Mage", "Rogue", "Cleric"][n % 4])
+        char['level'] = 1 + n % 7
+        char['experience'] = (n * 37) % (char['level'] * 100)
+        char['gold'] = n * 3
+        characters.append(char)
+    return characters
+
+# ============================================================================
+# VECTORIZED AWARD TESTS
+# ============================================================================
+
+def test_award_roster_matches_per_character_loop():
+    """Test that a vector award equals gain_experience + add_gold per character"""
+    pytest.importorskip("numpy")
+    batch = make_roster()
+    expected = make_roster()
+    xp = [n * 91 for n in range(len(batch))]
+
+    leveled = roster.award_roster(batch, xp=xp, gold=15)
+
+    for char, amount in zip(expected, xp):
+        char['leveled'] = character_manager.gain_experience(char, amount)
+        character_manager.add_gold(char, 15)
+    assert list(leveled) == [char.pop('leveled') for char in expected]
+    assert batch == expected
+
+def test_award_roster_checks_before_applying():
+    """Test that dead characters and negative gold reject the whole batch"""
+    pytest.importorskip("numpy")
+    characters = make_roster(5)
+    before = [dict(c) for c in characters]
+
+    characters[2]['health'] = 0
+    with pytest.raises(CharacterDeadError):
+        roster.award_roster(characters, xp=100)
+
+    characters[2]['health'] = 10
+    with pytest.raises(ValueError):
+        roster.award_roster(characters, xp=100, gold=-5)
+
+    before[2]['health'] = 10
+    assert characters == before
+
+# ============================================================================
+# STRUCT-OF-ARRAYS ROSTER TESTS
+# ============================================================================
+
+def test_roster_views_work_with_game_modules():
+    """Test that a roster view can stand in for a character dict"""
+    import inventory_system
+    import quest_handler
+
+    char = character_manager.create_character("Column", "Mage")
+    resident = roster.Roster([char])
+    view = resident["Column"]
+    quests = {'first': {'quest_id': 'first', 'required_level': 1,
+                        'prerequisite': 'NONE', 'reward_xp': 50, 'reward_gold': 10}}
+
+    inventory_system.add_item_to_inventory(view, "health_potion")
+    inventory_system.add_item_to_inventory(view, "health_potion")
+    quest_handler.accept_quest(view, 'first', quests)
+    quest_handler.complete_quest(view, 'first', quests)
+    view['equipped_weapon'] = "oak_staff"
+
+    assert inventory_system.count_item(view, "health_potion") == 2
+    assert view['inventory'] == ["health_potion", "health_potion"]
+    assert view['active_quests'] == []
+    assert 'first' in view['completed_quests']
+    assert view['gold'] == char['gold'] + 10
+    assert resident.to_dict("Column")['equipped_weapon'] == "oak_staff"
+
+def test_roster_reuses_removed_rows():
+    """Test that removal frees a row without disturbing other views"""
+    characters = make_roster(3)
+    resident = roster.Roster(characters)
+    keep = resident[characters[2]['name']]
+
+    resident.remove(characters[0]['name'])
+    resident.add(character_manager.create_character("Newcomer", "Cleric"))
+
+    assert len(resident) == 3
+    assert characters[0]['name'] not in resident
+    assert keep.to_dict() == characters[2]
+    with pytest.raises(CharacterNotFoundError):
+        resident[characters[0]['name']]
+
+def test_roster_award_matches_award_roster():
+    """Test that awarding in place over the columns matches award_roster"""
+    pytest.importorskip("numpy")
+    characters = make_roster()
+    resident = roster.Roster(characters)
+    resident.remove(characters[1]['name'])
+    del characters[1]
+
+    resident.award(xp=700, gold=3)
+    roster.award_roster(characters, xp=700, gold=3)
+
+    assert [resident.to_dict(c['name']) for c in characters] == characters
+
+def test_roster_grows_after_failed_award():
+    """Test that a rejected award leaves the roster unchanged and growable"""
+    pytest.importorskip("numpy")
+    characters = make_roster(5)
+    characters[3]['health'] = 0
+    resident = roster.Roster(characters)
+
+    try:
+        resident.award(xp=100)
+    except CharacterDeadError as error:
+        kept = error
+        resident.add(character_manager.create_character("Latecomer", "Rogue"))
+
+    assert isinstance(kept, CharacterDeadError)
+    assert len(resident) == 6
+    assert [resident.to_dict(c['name']) for c in characters] == characters
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,113 @@
+"""
+Test Save Archive
+Tests for exporting and importing saves with save_archive
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import save_archive
+
+
+def make_saves(directory, count=40):
+    characters = []
+    for n in range(count):
+        char = character_manager.create_character(f"Archived{n}", ["Warrior", "Mage"][n % 2])
+        char['gold'] = n * 11
+        char['inventory'] = ["health_potion"] * (n % 3)
+        character_manager.save_character(char, directory)
+        characters.append(char)
+    return characters
+
+# ============================================================================
+# EXPORT / IMPORT TESTS
+# ============================================================================
+
+def test_export_import_round_trip_into_sqlite(tmp_path):
+    """Test that an archive restores every character into another backend"""
+    source = str(tmp_path / "source")
+    characters = make_saves(source)
+    archive = str(tmp_path / "saves.qca")
+
+    stats = save_archive.export_saves(archive, source, chunk_characters=16)
+    assert stats['characters'] == len(characters)
+    assert stats['archive_bytes'] == os.path.getsize(archive)
+    assert stats['ratio'] > 1
+
+    target = str(tmp_path / "target")
+    imported = save_archive.import_saves(archive, target, backend="sqlite", batch_size=7)
+    assert imported['characters'] == len(characters)
+
+    loaded = character_manager.load_characters([c['name'] for c in characters],
+                                               target, backend="sqlite")
+    assert [r['character'] for r in loaded] == characters
+    character_manager.close_sqlite_connections()
+
+def test_read_archived_character_uses_index(tmp_path):
+    """Test single-character lookups through the embedded index"""
+    source = str(tmp_path)
+    characters = make_saves(source, 30)
+    archive = str(tmp_path / "saves.qca")
+    save_archive.export_saves(archive, source, codec="lzma", chunk_characters=8)
+
+    index = save_archive.read_archive_index(archive)
+
+    assert sorted(index) == sorted(c['name'] for c in characters)
+    assert save_archive.read_archived_character(archive, "Archived17", index) == characters[17]
+    with pytest.raises(CharacterNotFoundError):
+        save_archive.read_archived_character(archive, "Nobody", index)
+
+def test_damaged_archive_is_rejected(tmp_path):
+    """Test that truncated or foreign files raise InvalidSaveDataError"""
+    source = str(tmp_path)
+    make_saves(source, 5)
+    archive = tmp_path / "saves.qca"
+    save_archive.export_saves(str(archive), source)
+
+    archive.write_bytes(archive.read_bytes()[:-3])
+    with pytest.raises(InvalidSaveDataError):
+        list(save_archive.iter_archive(str(archive)))
+
+    (tmp_path / "Archived0_save.txt").rename(archive)
+    with pytest.raises(InvalidSaveDataError):
+        save_archive.read_archive_index(str(archive))
+
+def test_export_skips_unreadable_saves(tmp_path):
+    """Test that a corrupt save is reported and the rest are exported"""
+    source = str(tmp_path / "source")
+    characters = make_saves(source, 10)
+    with open(os.path.join(source, "Archived3_save.txt"), "w") as f:
+        f.write("NAME: Archived3\nnot a save\n")
+    archive = str(tmp_path / "saves.qca")
+
+    stats = save_archive.export_saves(archive, source, chunk_characters=4)
+
+    assert stats['skipped'] == ["Archived3"]
+    assert stats['characters'] == 9
+    assert sorted(c['name'] for c in save_archive.iter_archive(archive)) == \
+        sorted(c['name'] for c in characters if c['name'] != "Archived3")
+
+def test_failed_export_keeps_previous_archive(tmp_path, monkeypatch):
+    """Test that an export that fails midway leaves the old archive alone"""
+    source = str(tmp_path / "source")
+    make_saves(source, 10)
+    archive = tmp_path / "saves.qca"
+    save_archive.export_saves(str(archive), source)
+    backup = archive.read_bytes()
+
+    def broken_pack(character):
+        raise OSError("disk full")
+    monkeypatch.setattr(character_manager, "pack_character", broken_pack)
+
+    with pytest.raises(SaveFileCorruptedError):
+        save_archive.export_saves(str(archive), source)
+    assert archive.read_bytes() == backup
+    assert sorted(os.listdir(tmp_path)) == ["saves.qca", "source"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,429 @@
+"""
+Test Save System
+Tests for save formats and save storage in character_manager
+"""
+
+import pytest
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+
+
+def make_character(name="SaveTest"):
+    char = character_manager.create_character(name, "Cleric")
+    char['gold'] = 345
+    char['experience'] = 60
+    char['inventory'] = ["health_potion", "health_potion", "iron_sword"]
+    char['completed_quests'] = ["first_steps"]
+    return char
+
+# ============================================================================
+# BINARY SAVE FORMAT TESTS
+# ============================================================================
+
+def test_binary_save_round_trip(tmp_path):
+    """Test that a binary save loads back to the same character"""
+    char = make_character()
+
+    character_manager.save_character(char, str(tmp_path), save_format="binary")
+    loaded = character_manager.load_character("SaveTest", str(tmp_path))
+
+    with open(tmp_path / "SaveTest_save.txt", "rb") as f:
+        assert f.read().startswith(character_manager.BINARY_MAGIC)
+    assert loaded == char
+
+def test_text_saves_still_load(tmp_path):
+    """Test that format detection keeps text saves loading"""
+    char = make_character()
+
+    character_manager.save_character(char, str(tmp_path), save_format="text")
+
+    assert character_manager.load_character("SaveTest", str(tmp_path)) == char
+
+def test_corrupted_binary_save(tmp_path):
+    """Test that a truncated binary save raises InvalidSaveDataError"""
+    data = character_manager.pack_character(make_character())
+
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.unpack_character(data[:-3])
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.unpack_character(data[:6] + bytes([99]) + data[7:])
+
+# ============================================================================
+# SQLITE BACKEND TESTS
+# ============================================================================
+
+def test_sqlite_backend_round_trip(tmp_path):
+    """Test save, load, list and delete through the sqlite backend"""
+    directory = str(tmp_path)
+    char = make_character()
+
+    assert character_manager.save_character(char, directory, backend="sqlite")
+    char['gold'] = 999
+    character_manager.save_character(char, directory, backend="sqlite")
+
+    assert character_manager.load_character("SaveTest", directory, backend="sqlite") == char
+    assert character_manager.list_saved_characters(directory, backend="sqlite") == ["SaveTest"]
+    assert not os.path.exists(tmp_path / "SaveTest_save.txt")
+
+    character_manager.delete_character("SaveTest", directory, backend="sqlite")
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("SaveTest", directory, backend="sqlite")
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.delete_character("SaveTest", directory, backend="sqlite")
+
+def test_sqlite_backend_pages_listing(tmp_path):
+    """Test keyset pagination of saved names"""
+    directory = str(tmp_path)
+    for name in ["delta", "alpha", "charlie", "bravo", "echo"]:
+        character_manager.save_character(make_character(name), directory, backend="sqlite")
+
+    first = character_manager.list_saved_characters(directory, backend="sqlite", limit=2)
+    second = character_manager.list_saved_characters(
+        directory, backend="sqlite", after=first[-1], limit=2)
+
+    assert first == ["alpha", "bravo"]
+    assert second == ["charlie", "delta"]
+
+def test_missing_sqlite_store(tmp_path):
+    """Test that an empty sqlite store behaves like an empty directory"""
+    directory = str(tmp_path / "none")
+
+    assert character_manager.list_saved_characters(directory, backend="sqlite") == []
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Nobody", directory, backend="sqlite")
+    assert not os.path.exists(directory)
+
+# ============================================================================
+# SAVE JOURNAL TESTS
+# ============================================================================
+
+def test_journaled_save_appends_only_changes(tmp_path):
+    """Test that a journaled save writes just the changed fields"""
+    directory = str(tmp_path)
+    char = make_character()
+    character_manager.save_character(char, directory, journal=True)
+    snapshot = (tmp_path / "SaveTest_save.txt").read_bytes()
+
+    char['gold'] += 10
+    character_manager.save_character(char, directory, journal=True)
+    character_manager.save_character(char, directory, journal=True)
+
+    journal = tmp_path / ("SaveTest_save.txt" + character_manager.JOURNAL_SUFFIX)
+    assert (tmp_path / "SaveTest_save.txt").read_bytes() == snapshot
+    assert journal.read_text() == "GOLD: 355\n"
+    assert character_manager.load_character("SaveTest", directory) == char
+
+def test_journal_compacts_after_threshold(tmp_path, monkeypatch):
+    """Test that the journal is folded into a snapshot at the threshold"""
+    monkeypatch.setattr(character_manager, "JOURNAL_COMPACT_THRESHOLD", 3)
+    directory = str(tmp_path)
+    char = make_character()
+    journal = tmp_path / ("SaveTest_save.txt" + character_manager.JOURNAL_SUFFIX)
+
+    for _ in range(6):
+        char['gold'] += 1
+        character_manager.save_character(char, directory, journal=True)
+
+    # snapshot, three journal entries, compacting snapshot, one entry
+    assert journal.read_text() == "GOLD: 351\n"
+    assert character_manager.load_character("SaveTest", directory) == char
+
+def test_full_save_and_delete_clear_journal(tmp_path):
+    """Test that a plain save or a delete removes a stale journal"""
+    directory = str(tmp_path)
+    char = make_character()
+    character_manager.save_character(char, directory, journal=True)
+    char['level'] = 4
+    character_manager.save_character(char, directory, journal=True)
+    journal = tmp_path / ("SaveTest_save.txt" + character_manager.JOURNAL_SUFFIX)
+    assert journal.exists()
+
+    char['level'] = 2
+    character_manager.save_character(char, directory)
+    assert not journal.exists()
+    assert character_manager.load_character("SaveTest", directory)['level'] == 2
+
+    character_manager.save_character(char, directory, journal=True)
+    char['gold'] = 1
+    character_manager.save_character(char, directory, journal=True)
+    character_manager.delete_character("SaveTest", directory)
+    assert not journal.exists()
+
+@pytest.mark.parametrize("failure", ["format", "io"])
+def test_failed_full_save_keeps_journal(tmp_path, monkeypatch, failure):
+    """Test that a full save that fails leaves the journaled progress loadable"""
+    directory = str(tmp_path)
+    char = make_character()
+    char['gold'] = 100
+    character_manager.save_character(char, directory, journal=True)
+    char['gold'] = 500
+    character_manager.save_character(char, directory, journal=True)
+    char['gold'] = 777
+    character_manager.save_character(char, directory, journal=True)
+
+    if failure == "format":
+        with pytest.raises(ValueError):
+            character_manager.save_character(char, directory, save_format="bogus")
+    else:
+        def broken_write(filename, data):
+            raise OSError("disk full")
+        monkeypatch.setattr(character_manager, "_write_save_file", broken_write)
+        with pytest.raises(SaveFileCorruptedError):
+            character_manager.save_character(char, directory)
+        monkeypatch.undo()
+
+    assert character_manager.load_character("SaveTest", directory)['gold'] == 777
+
+# ============================================================================
+# BULK SAVE / LOAD TESTS
+# ============================================================================
+
+def test_bulk_save_and_load_keep_order(tmp_path):
+    """Test that bulk results come back in input order"""
+    directory = str(tmp_path)
+    characters = [make_character(f"Bulk{n}") for n in range(10)]
+
+    saved = character_manager.save_characters(characters, directory, max_workers=4)
+    loaded = character_manager.load_characters([c['name'] for c in characters], directory)
+
+    assert [r['name'] for r in saved] == [c['name'] for c in characters]
+    assert all(r['saved'] and r['error'] is None for r in saved)
+    assert [r['character'] for r in loaded] == characters
+
+def test_bulk_load_reports_errors_per_character(tmp_path):
+    """Test that one bad save does not stop the rest of the batch"""
+    directory = str(tmp_path)
+    character_manager.save_character(make_character("Good"), directory)
+    (tmp_path / "Bad_save.txt").write_text("LEVEL: not a number\n")
+
+    results = character_manager.load_characters(["Good", "Missing", "Bad"], directory)
+
+    assert results[0]['character']['name'] == "Good"
+    assert isinstance(results[1]['error'], CharacterNotFoundError)
+    assert isinstance(results[2]['error'], InvalidSaveDataError)
+    assert results[2]['character'] is None
+
+# ============================================================================
+# SHARDED LAYOUT TESTS
+# ============================================================================
+
+def test_sharded_layout_nests_saves(tmp_path, monkeypatch):
+    """Test that sharded saves live under hash-prefix directories"""
+    monkeypatch.setattr(character_manager, "SAVE_LAYOUT", "sharded")
+    directory = str(tmp_path)
+    char = make_character()
+
+    character_manager.save_character(char, directory)
+
+    assert not (tmp_path / "SaveTest_save.txt").exists()
+    path = character_manager._save_path("SaveTest", directory)
+    assert os.path.exists(path)
+    assert len(os.path.relpath(path, directory).split(os.sep)) == character_manager.SHARD_LEVELS + 1
+    assert character_manager.load_character("SaveTest", directory) == char
+    assert character_manager.list_saved_characters(directory) == ["SaveTest"]
+
+def test_both_layouts_are_found(tmp_path, monkeypatch):
+    """Test that load, list and delete work across a half-migrated directory"""
+    directory = str(tmp_path)
+    character_manager.save_character(make_character("Flat"), directory)
+    monkeypatch.setattr(character_manager, "SAVE_LAYOUT", "sharded")
+    character_manager.save_character(make_character("Nested"), directory)
+
+    assert character_manager.list_saved_characters(directory) == ["Flat", "Nested"]
+    assert character_manager.load_character("Flat", directory)['name'] == "Flat"
+
+    character_manager.save_character(make_character("Flat"), directory)
+    assert not (tmp_path / "Flat_save.txt").exists()
+
+    character_manager.delete_character("Nested", directory)
+    assert character_manager.list_saved_characters(directory) == ["Flat"]
+
+def test_migrate_save_layout_moves_saves_and_journals(tmp_path):
+    """Test that migration moves every save and journal both ways"""
+    directory = str(tmp_path)
+    characters = [make_character(f"Move{n}") for n in range(20)]
+    character_manager.save_characters(characters, directory)
+    character_manager.save_character(characters[0], directory, journal=True)
+    characters[0]['gold'] = 7
+    character_manager.save_character(characters[0], directory, journal=True)
+
+    moved = character_manager.migrate_save_layout(directory, "sharded", max_workers=4)
+
+    assert moved == 20
+    assert not any(name.endswith("_save.txt") for name in os.listdir(directory))
+    loaded = character_manager.load_characters([c['name'] for c in characters], directory)
+    assert [r['character'] for r in loaded] == characters
+
+    assert character_manager.migrate_save_layout(directory, "flat") == 20
+    expected = [f"{c['name']}_save.txt" for c in characters] + [
+        "Move0_save.txt.journal", character_manager.MANIFEST_FILENAME]
+    assert sorted(os.listdir(directory)) == sorted(expected)
+    assert character_manager.load_character("Move0", directory)['gold'] == 7
+
+# ============================================================================
+# SAVE MANIFEST TESTS
+# ============================================================================
+
+def test_manifest_tracks_saves_and_deletes(tmp_path):
+    """Test that summaries follow saves, journaled saves and deletes"""
+    directory = str(tmp_path)
+    for n, char_class in enumerate(["Warrior", "Mage", "Rogue"]):
+        char = character_manager.create_character(f"Hero{n}", char_class)
+        char['level'] = 3 - n
+        character_manager.save_character(char, directory)
+
+    char['gold'] = 999
+    character_manager.save_character(char, directory, journal=True)
+    character_manager.save_character(char, directory, journal=True)
+    character_manager.delete_character("Hero0", directory)
+
+    summaries = character_manager.list_character_summaries(directory)
+    assert [(s['name'], s['class'], s['level'], s['gold']) for s in summaries] == [
+        ("Hero1", "Mage", 2, 100), ("Hero2", "Rogue", 1, 999)]
+    assert character_manager.check_manifest(directory) == []
+
+def test_manifest_sorted_filtered_pages(tmp_path):
+    """Test sorting, filtering and offset/limit paging of summaries"""
+    directory = str(tmp_path)
+    for n in range(12):
+        char = make_character(f"Page{n:02d}")
+        char['level'] = n % 4 + 1
+        character_manager.save_character(char, directory)
+
+    page = character_manager.list_character_summaries(
+        directory, sort_by="level", reverse=True, min_level=2, offset=2, limit=3)
+
+    assert [(s['name'], s['level']) for s in page] == [
+        ("Page11", 4), ("Page02", 3), ("Page06", 3)]
+    with pytest.raises(ValueError):
+        character_manager.list_character_summaries(directory, sort_by="health")
+
+@pytest.mark.parametrize("query", [
+    dict(sort_by="level", reverse=True, min_level=2, offset=2, limit=3),
+    dict(sort_by="gold", character_class="Mage", limit=4),
+    dict(sort_by="name", reverse=True, max_level=3, offset=1),
+    dict(sort_by="mtime", reverse=True, limit=5),
+])
+def test_sqlite_summaries_match_manifest(tmp_path, monkeypatch, query):
+    """Test that sqlite summaries page in SQL and agree with the manifest"""
+    files, db = str(tmp_path / "files"), str(tmp_path / "db")
+    for n in range(12):
+        char = character_manager.create_character(f"Page{n:02d}", ["Mage", "Rogue"][n % 2])
+        char['level'] = n % 4 + 1
+        char['gold'] = (n * 7) % 5
+        character_manager.save_character(char, files)
+        character_manager.save_character(char, db, backend="sqlite")
+
+    expected = character_manager.list_character_summaries(files, **query)
+
+    def no_decode(data):
+        raise AssertionError("listing decoded a save")
+    monkeypatch.setattr(character_manager, "decode_character", no_decode)
+    summaries = character_manager.list_character_summaries(db, backend="sqlite", **query)
+
+    if query["sort_by"] == "mtime":
+        # sqlite keeps no save times, so every row ties and lists by name
+        expected = character_manager.list_character_summaries(files, limit=5)
+    assert summaries == [dict(row, mtime=None) for row in expected]
+
+def test_sqlite_summary_columns_added_to_old_database(tmp_path):
+    """Test that a database without summary columns is filled in on open"""
+    import sqlite3
+    directory = str(tmp_path)
+    char = make_character("Legacy")
+    conn = sqlite3.connect(os.path.join(directory, character_manager.SQLITE_FILENAME))
+    conn.execute("CREATE TABLE characters (name TEXT PRIMARY KEY, data BLOB NOT NULL) WITHOUT ROWID")
+    conn.execute("INSERT INTO characters VALUES (?, ?)",
+                 ("Legacy", character_manager.encode_character(char)))
+    conn.commit()
+    conn.close()
+    character_manager.close_sqlite_connections()
+
+    summaries = character_manager.list_character_summaries(directory, backend="sqlite")
+
+    assert summaries == [{"name": "Legacy", "class": "Cleric", "level": 1,
+                          "gold": 345, "mtime": None}]
+    character_manager.close_sqlite_connections()
+
+def test_check_manifest_rebuilds_when_stale(tmp_path):
+    """Test that saves changed behind the manifest's back are detected"""
+    directory = str(tmp_path)
+    character_manager.save_character(make_character("Known"), directory)
+    character_manager.save_character(make_character("Gone"), directory)
+
+    os.remove(tmp_path / "Gone_save.txt")
+    (tmp_path / "Copied_save.txt").write_bytes((tmp_path / "Known_save.txt").read_bytes()
+                                               .replace(b"Known", b"Copied"))
+
+    assert character_manager.check_manifest(directory) == ["Copied", "Gone"]
+    assert character_manager.check_manifest(directory) == []
+    assert sorted(character_manager.read_manifest(directory)) == ["Copied", "Known"]
+
+def test_manifest_built_for_existing_directory(tmp_path):
+    """Test that a directory saved before the manifest existed is indexed"""
+    directory = str(tmp_path)
+    character_manager.save_character(make_character("Old"), directory)
+    os.remove(tmp_path / character_manager.MANIFEST_FILENAME)
+
+    summaries = character_manager.list_character_summaries(directory)
+
+    assert [s['name'] for s in summaries] == ["Old"]
+    assert (tmp_path / character_manager.MANIFEST_FILENAME).exists()
+
+def test_manifest_compacted_by_saves_alone(tmp_path):
+    """Test that repeated saves keep the manifest bounded without any reads"""
+    directory = str(tmp_path)
+    char = make_character("Busy")
+    for gold in range(200):
+        char['gold'] = gold
+        character_manager.save_character(char, directory)
+
+    with open(tmp_path / character_manager.MANIFEST_FILENAME) as f:
+        lines = f.readlines()
+    assert len(lines) <= character_manager.MANIFEST_COMPACT_FACTOR * 16 + 1
+    assert character_manager.read_manifest(directory)['Busy']['gold'] == 199
+
+def test_manifest_appends_do_not_read_back(tmp_path, monkeypatch):
+    """Test that saves below the compaction threshold only append"""
+    directory = str(tmp_path)
+    char = make_character("Quick")
+    character_manager.save_character(char, directory)
+    character_manager.read_manifest(directory)
+
+    synced = []
+    sync = character_manager._sync_manifest
+    monkeypatch.setattr(character_manager, "_sync_manifest",
+                        lambda d: synced.append(d) or sync(d))
+    for gold in range(20):
+        char['gold'] = gold
+        character_manager.save_character(char, directory)
+        character_manager.save_character(char, directory, journal=True)
+
+    assert synced == []
+    assert character_manager.read_manifest(directory)['Quick']['gold'] == 19
+
+def test_manifest_compaction_keeps_concurrent_saves(tmp_path):
+    """Test that compacting reads never drop lines appended by other threads"""
+    directory = str(tmp_path)
+    character_manager.save_character(make_character("Seed"), directory)
+    names = [f"Thread{n}_{k}" for n in range(4) for k in range(40)]
+
+    def save_some(n):
+        for k in range(40):
+            character_manager.save_character(make_character(f"Thread{n}_{k}"), directory)
+            character_manager.read_manifest(directory)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(save_some, range(4)))
+
+    character_manager._manifest_cache.clear()
+    assert sorted(character_manager.read_manifest(directory)) == sorted(names + ["Seed"])
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])